@@ -1,65 +1,2822 @@
-import cv2
-import mediapipe as mp
-import pyautogui
 import numpy as np
-import tkinter as tk
-from tkinter import ttk, messagebox
 import threading
 import time
 from datetime import datetime
+from collections import defaultdict, deque, namedtuple, Counter
+from multiprocessing import shared_memory
+import argparse
+import bisect
+import copy
+import importlib
+import ipaddress
+import json
 import math
+import multiprocessing
+import os
+import queue
+import socket
+import stat
+import struct
+import subprocess
+import sys
 
-class HandGestureCursorController:
+# Wall-clock time the module started loading (cold-start measurements)
+MODULE_START_TIME = time.time()
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access.
+    
+    Keeps the heavy backends off the import path of tools that never use
+    them, and lets the GUI appear before MediaPipe has loaded. Attributes
+    are cached on the proxy after the first lookup; assignments (module
+    settings such as pyautogui.PAUSE) are forwarded to the real module.
+    """
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+    
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+    
+    def __getattr__(self, attr):
+        value = getattr(self.load(), attr)
+        self.__dict__[attr] = value
+        return value
+    
+    def __setattr__(self, attr, value):
+        if attr.startswith('_'):
+            object.__setattr__(self, attr, value)
+        else:
+            setattr(self.load(), attr, value)
+            self.__dict__[attr] = value
+
+
+cv2 = LazyModule('cv2')
+mp = LazyModule('mediapipe')
+pyautogui = LazyModule('pyautogui')  # Fails to import without a display (headless CI)
+tk = LazyModule('tkinter')
+ttk = LazyModule('tkinter.ttk')
+messagebox = LazyModule('tkinter.messagebox')
+
+# Hand landmark indices (MediaPipe 21-point hand model)
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])  # Thumb, Index, Middle, Ring, Pinky tips
+FINGER_PIPS = np.array([3, 6, 10, 14, 18])  # PIP joints (middle knuckles)
+FINGER_MCPS = np.array([2, 5, 9, 13, 17])   # MCP joints (base knuckles)
+
+# Flattened (landmark * 3 + axis) coordinates compared for each finger state:
+# x for the thumb, y for the other fingers
+TIP_COORDS = FINGER_TIPS * 3 + np.array([0, 1, 1, 1, 1])
+PIP_COORDS = FINGER_PIPS * 3 + np.array([0, 1, 1, 1, 1])
+
+# Finger states packed as a 5-bit mask, thumb is the most significant bit
+FINGER_BITS = np.array([16, 8, 4, 2, 1], dtype=np.uint8)
+PINCH_THRESHOLD = 0.05
+
+# Bone connections of the hand model, for drawing without mediapipe's drawing utils
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),          # Thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),          # Index
+    (5, 9), (9, 10), (10, 11), (11, 12),     # Middle
+    (9, 13), (13, 14), (14, 15), (15, 16),   # Ring
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky and palm
+)
+
+GESTURES = ('none', 'point', 'peace', 'open_hand', 'fist',
+            'thumbs_up', 'thumbs_down', 'pinch', 'unknown')
+GESTURE_CODES = {name: i for i, name in enumerate(GESTURES)}
+
+# What a confirmed gesture does while it is held: None acts on every frame
+# (cursor movement, dragging), 0 acts once on entry and a positive value
+# repeats the action at that interval in seconds
+GESTURE_REPEAT = {
+    'point': None,
+    'fist': None,
+    'pinch': None,
+    'peace': 0,
+    'open_hand': 0,
+    'thumbs_up': 0.3,
+    'thumbs_down': 0.3,
+}
+
+# Keys sent for swipes (pages move with the hand, as on a touch screen)
+SWIPE_HOTKEYS = {
+    'swipe_left': ('ctrl', 'tab'),
+    'swipe_right': ('ctrl', 'shift', 'tab'),
+    'swipe_up': ('pagedown',),
+    'swipe_down': ('pageup',),
+}
+
+
+# One detected hand: (21, 3) landmarks in mirrored full-frame coordinates
+HandDetection = namedtuple('HandDetection', ['points', 'handedness', 'score'])
+
+# Session recordings (.gsr): a 16-byte header (magic, record size) followed by
+# fixed-size records, one per processed hand or hand-less frame. The hands of
+# one frame share its source and frame number
+SESSION_EXTENSION = '.gsr'
+SESSION_MAGIC = b'GSREC\x00\x00\x01'
+SESSION_RECORD = np.dtype([
+    ('timestamp', '<f8'),
+    ('frame', '<u4'),               # Frame sequence number, shared by the hands of a frame
+    ('source', 'u1'),               # Camera source index
+    ('landmarks', '<f4', (21, 3)),  # NaN when no hand was detected
+    ('score', '<f4'),               # Detection confidence
+    ('hands', 'u1'),                # Hands in the frame
+    ('handedness', 'u1'),           # Index into HANDEDNESS
+    ('gesture', 'u1'),              # Frame classification, index into GESTURES
+    ('confirmed', 'u1'),            # Gesture confirmed by the state machine
+    ('action', 'u1'),               # Action issued for the frame, index into SESSION_ACTIONS
+])
+HANDEDNESS = ('Unknown', 'Left', 'Right')
+SESSION_ACTIONS = ('none', 'move_to', 'click', 'right_click', 'scroll',
+                   'mouse_down', 'mouse_up', 'hotkey')
+
+# Event stream (--event-server): the server sends EVENT_MAGIC, then batches of
+# events. A batch is EVENT_BATCH_HEADER (payload bytes, events this subscriber
+# has lost so far, event count, publish time of its oldest event) and its
+# events, each an EVENT_HEADER (type, source, handedness, hand id, frame
+# timestamp) and the fixed payload of its type. A client may first send one
+# byte, a bit mask of the EVENT_TYPES it wants.
+EVENT_MAGIC = b'GSEVT\x00\x00\x01'
+EVENT_TYPES = ('gesture', 'cursor', 'landmarks', 'lost')
+EVENT_GESTURE, EVENT_CURSOR, EVENT_LANDMARKS, EVENT_LOST = range(len(EVENT_TYPES))
+EVENT_HEADER = struct.Struct('<BBBBd')
+EVENT_PAYLOADS = (
+    struct.Struct('<BBf'),  # gesture: frame classification, confirmed gesture (GESTURES indices), score
+    struct.Struct('<ff'),   # cursor: filtered screen position
+    struct.Struct('<63f'),  # landmarks: (21, 3) mirrored, normalized
+    struct.Struct(''),      # lost: the hand left the view (timestamp: last seen)
+)
+EVENT_BATCH_HEADER = struct.Struct('<IIId')
+# Kernel send (and TCP receive) buffer of an event connection: a few frames'
+# batches, so a slow subscriber's backlog waits in its bounded queue, where
+# the oldest batches are dropped, rather than in a socket buffer
+EVENT_SOCKET_BUFFER = 4096
+ALL_EVENTS = (1 << len(EVENT_TYPES)) - 1
+
+# One decoded event (data: gesture (frame, confirmed, score), cursor (x, y),
+# landmarks (21, 3) array, lost None)
+StreamEvent = namedtuple('StreamEvent', ['kind', 'source', 'handedness', 'hand_id', 'timestamp', 'data'])
+
+
+def landmarks_to_array(landmarks):
+    """Convert MediaPipe landmarks to a (21, 3) float32 array (arrays pass through)"""
+    if isinstance(landmarks, np.ndarray):
+        return landmarks.astype(np.float32, copy=False)
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+
+
+def finger_states(points):
+    """Extended (1) / folded (0) state of each finger for (..., 21, 3) landmarks"""
+    # Thumb is extended if tip is to the left of the IP joint,
+    # other fingers if the tip is above the PIP joint (y grows downwards)
+    flat = points.reshape(points.shape[:-2] + (63,))
+    return (flat[..., TIP_COORDS] < flat[..., PIP_COORDS]).astype(np.uint8)
+
+
+def finger_masks(points):
+    """5-bit finger mask (thumb = 0b10000) for (..., 21, 3) landmarks"""
+    return finger_states(points) @ FINGER_BITS
+
+
+def pinch_distances(points):
+    """2D distance between thumb tip and index tip for (..., 21, 3) landmarks"""
+    delta = points[..., 4, :2] - points[..., 8, :2]
+    return np.sqrt(np.einsum('...i,...i->...', delta, delta))
+
+
+def thumbs_pointing_up(points):
+    """True where the thumb tip is above the middle finger MCP"""
+    return points[..., 4, 1] < points[..., 9, 1]
+
+
+def classify_gestures(points):
+    """Classify a whole (N, 21, 3) landmark sequence in one call.
+    
+    Frames containing NaN (no hand detected) are labelled 'none'.
+    Returns an array of gesture names.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    valid = ~np.isnan(points).any(axis=(-2, -1))
+    points = np.nan_to_num(points)
+    
+    masks = finger_masks(points)
+    thumb_only = masks == 0b10000
+    thumb_up = thumbs_pointing_up(points)
+    conditions = [
+        ~valid,
+        masks == 0b01000,               # Only index
+        masks == 0b01100,               # Index and middle (peace)
+        masks == 0b11111,               # All fingers
+        masks == 0b00000,               # Fist
+        thumb_only & thumb_up,
+        thumb_only & ~thumb_up,
+        pinch_distances(points) < PINCH_THRESHOLD,
+    ]
+    return np.select(conditions, list(GESTURES[:-1]), default='unknown')
+
+
+def draw_hand(frame, points, scale=1.0):
+    """Draw landmarks, bones and fingertip markers onto a (mirrored) preview frame"""
+    pixels = (points[:, :2] * (frame.shape[1], frame.shape[0])).astype(int).tolist()
+    thickness = max(1, round(2 * scale))
+    for start, end in HAND_CONNECTIONS:
+        cv2.line(frame, tuple(pixels[start]), tuple(pixels[end]), (224, 224, 224), thickness)
+    for x, y in pixels:
+        cv2.circle(frame, (x, y), max(1, round(3 * scale)), (0, 0, 255), -1)
+    for tip in FINGER_TIPS:
+        cv2.circle(frame, tuple(pixels[tip]), max(2, round(10 * scale)), (0, 255, 255), -1)
+
+
+def mirrored_preview(frame, scale=1.0):
+    """Downscaled, horizontally flipped copy of a raw frame for the preview window"""
+    if scale != 1.0:
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return cv2.flip(small, 1, dst=small)
+    return cv2.flip(frame, 1)
+
+
+class StaticOverlay:
+    """Preview decorations that only change with the tracking state.
+    
+    The status text, peace-sign hint and crosshair are rendered once per
+    (size, tracking state) into small coverage patches, and each frame just
+    blends those patches in instead of rasterizing text and lines again.
+    """
     def __init__(self):
-        # Initialize MediaPipe
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
+        self.cache = {}
+    
+    @staticmethod
+    def _patch(shape, color, draw):
+        """Render one element's coverage and crop it to its bounding box"""
+        coverage = np.zeros(shape[:2], dtype=np.uint8)
+        draw(coverage, 255)
+        x, y, w, h = cv2.boundingRect(coverage)
+        alpha = coverage[y:y + h, x:x + w].astype(np.float32) / 255.0
+        solid = np.empty((h, w, 3), dtype=np.uint8)
+        solid[:] = color
+        return y, y + h, x, x + w, solid, alpha, 1.0 - alpha
+    
+    def render(self, shape, is_tracking, scale):
+        h, w = shape[:2]
+        thick = max(1, round(2 * scale))
+        arm = int(20 * scale)
+        status_text = f"Tracking: {'ON' if is_tracking else 'OFF'}"
+        
+        return [
+            # Status text
+            self._patch(shape, (0, 255, 0) if is_tracking else (0, 0, 255), lambda layer, c: cv2.putText(
+                layer, status_text, (int(10 * scale), int(30 * scale)), cv2.FONT_HERSHEY_SIMPLEX,
+                1 * scale, c, thick)),
+            # Peace sign indicator
+            self._patch(shape, (255, 255, 255), lambda layer, c: cv2.putText(
+                layer, "Make a peace sign (✌️) to left-click",
+                (w - int(400 * scale), int(30 * scale)), cv2.FONT_HERSHEY_SIMPLEX,
+                0.7 * scale, c, thick)),
+            # Crosshair in center
+            self._patch(shape, (255, 0, 255), lambda layer, c: (
+                cv2.line(layer, (w//2 - arm, h//2), (w//2 + arm, h//2), c, thick),
+                cv2.line(layer, (w//2, h//2 - arm), (w//2, h//2 + arm), c, thick))),
+        ]
+    
+    def apply(self, frame, is_tracking, scale=1.0):
+        key = (frame.shape, is_tracking, scale)
+        patches = self.cache.get(key)
+        if patches is None:
+            patches = self.cache[key] = self.render(frame.shape, is_tracking, scale)
+        for y0, y1, x0, x1, solid, alpha, inverse in patches:
+            roi = frame[y0:y1, x0:x1]
+            roi[:] = cv2.blendLinear(roi, solid, inverse, alpha)
+
+
+class GestureClassifier:
+    """Maps (21, 3) landmark arrays to gesture names"""
+    name = 'base'
+    
+    def classify(self, points):
+        raise NotImplementedError
+    
+    def classify_batch(self, points):
+        """Classify an (N, 21, 3) sequence; NaN frames are labelled 'none'"""
+        labels = np.empty(len(points), dtype='<U16')
+        for i, frame in enumerate(np.asarray(points, dtype=np.float32)):
+            labels[i] = 'none' if np.isnan(frame).any() else self.classify(frame)
+        return labels
+
+
+class RuleChainClassifier(GestureClassifier):
+    """Reference if/elif rule chain over the finger mask"""
+    name = 'chain'
+    
+    def classify(self, points):
+        mask = int(finger_masks(points))
+        
+        if mask == 0b01000:  # Only index
+            return 'point'
+        elif mask == 0b01100:  # Index and middle (peace)
+            return 'peace'
+        elif mask == 0b11111:  # All fingers
+            return 'open_hand'
+        elif mask == 0b00000:  # Fist
+            return 'fist'
+        elif mask == 0b10000:  # Only thumb
+            # Check if thumb is up or down (tip compared to middle finger MCP)
+            return 'thumbs_up' if thumbs_pointing_up(points) else 'thumbs_down'
+        elif pinch_distances(points) < PINCH_THRESHOLD:  # Thumb and index close together
+            return 'pinch'
+        
+        return 'unknown'
+    
+    def classify_batch(self, points):
+        return classify_gestures(points)
+
+
+class MaskTableClassifier(GestureClassifier):
+    """O(1) rule gestures from a precomputed 32-entry finger-mask lookup table.
+    
+    Adding a rule gesture means adding a {mask: name} entry to `rules`.
+    Masks mapped to 'thumb' are resolved to thumbs_up/thumbs_down, and masks
+    without a rule fall back to the pinch check.
+    """
+    name = 'table'
+    
+    DEFAULT_RULES = {
+        0b01000: 'point',      # Only index
+        0b01100: 'peace',      # Index and middle
+        0b11111: 'open_hand',  # All fingers
+        0b00000: 'fist',
+        0b10000: 'thumb',      # Only thumb, direction decides up/down
+    }
+    
+    def __init__(self, rules=None):
+        rules = dict(self.DEFAULT_RULES if rules is None else rules)
+        self.labels = sorted(set(rules.values()) | {'unknown'})
+        self.unknown_code = self.labels.index('unknown')
+        self.thumb_code = self.labels.index('thumb') if 'thumb' in self.labels else -1
+        
+        # Table as a numpy array for batches and a list for single lookups
+        self.table = np.full(32, self.unknown_code, dtype=np.int16)
+        for mask, label in rules.items():
+            self.table[mask] = self.labels.index(label)
+        self.table_list = [self.labels[code] for code in self.table.tolist()]
+    
+    def classify(self, points):
+        label = self.table_list[int(finger_masks(points))]
+        if label == 'thumb':
+            return 'thumbs_up' if thumbs_pointing_up(points) else 'thumbs_down'
+        if label == 'unknown' and pinch_distances(points) < PINCH_THRESHOLD:
+            return 'pinch'
+        return label
+    
+    def classify_batch(self, points):
+        points = np.asarray(points, dtype=np.float32)
+        valid = ~np.isnan(points).any(axis=(-2, -1))
+        points = np.nan_to_num(points)
+        
+        codes = self.table[finger_masks(points)]
+        labels = np.array(self.labels + ['thumbs_up', 'thumbs_down', 'pinch', 'none'])[codes]
+        
+        thumb = codes == self.thumb_code
+        labels[thumb] = np.where(thumbs_pointing_up(points[thumb]), 'thumbs_up', 'thumbs_down')
+        labels[(codes == self.unknown_code) & (pinch_distances(points) < PINCH_THRESHOLD)] = 'pinch'
+        labels[~valid] = 'none'
+        return labels
+
+
+def normalize_landmarks(points):
+    """Translation/scale invariant (..., 42) feature vectors for template matching.
+    
+    Landmarks are taken relative to the wrist and scaled by the wrist to
+    middle-finger-MCP distance. Depth is dropped, it is too noisy to match on.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    xy = points[..., :, :2] - points[..., :1, :2]
+    scale = np.linalg.norm(xy[..., 9, :], axis=-1)
+    xy = xy / np.maximum(scale, 1e-6)[..., None, None]
+    return xy.reshape(points.shape[:-2] + (42,))
+
+
+class TemplateClassifier(GestureClassifier):
+    """Nearest-neighbour matcher over normalized landmark templates.
+    
+    The template matrix and its squared norms are built once, so a query is
+    one matrix-vector product. Queries further than `max_distance` from every
+    template are passed to `fallback` (or labelled 'unknown').
+    """
+    name = 'template'
+    
+    def __init__(self, templates, labels, max_distance=0.6, fallback=None):
+        if len(templates) != len(labels) or len(templates) == 0:
+            raise ValueError("templates and labels must be non-empty and of equal length")
+        self.index = normalize_landmarks(templates)
+        self.index_norms = np.einsum('ij,ij->i', self.index, self.index)
+        self.labels = np.asarray(labels).astype(str)
+        self.max_distance_sq = max_distance ** 2
+        self.fallback = fallback
+    
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Load a template index saved by save() or --build-templates"""
+        with np.load(path) as data:
+            return cls(data['templates'], data['labels'], **kwargs)
+    
+    def save(self, path):
+        # Store the raw-shaped templates so normalization changes stay compatible
+        templates = np.zeros((len(self.index), 21, 3), dtype=np.float32)
+        templates[..., :2] = self.index.reshape(-1, 21, 2)
+        np.savez_compressed(path, templates=templates, labels=self.labels)
+    
+    @classmethod
+    def from_recording(cls, landmarks, labels, max_per_label=50, **kwargs):
+        """Build an index from labelled frames, evenly subsampling each gesture"""
+        labels = np.asarray(labels).astype(str)
+        selected = []
+        for label in np.unique(labels):
+            if label in ('none', 'unknown'):
+                continue
+            frames = np.flatnonzero(labels == label)
+            frames = frames[~np.isnan(landmarks[frames]).any(axis=(1, 2))]
+            step = max(1, len(frames) // max_per_label)
+            selected.extend(frames[::step][:max_per_label].tolist())
+        selected = np.sort(np.asarray(selected, dtype=np.int64))
+        return cls(landmarks[selected], labels[selected], **kwargs)
+    
+    def nearest(self, features):
+        """Index and squared distance of the closest template for (N, 42) features"""
+        distances = (np.einsum('ij,ij->i', features, features)[:, None]
+                     - 2.0 * features @ self.index.T
+                     + self.index_norms[None, :])
+        best = distances.argmin(axis=1)
+        return best, distances[np.arange(len(best)), best]
+    
+    def classify(self, points):
+        best, distance = self.nearest(normalize_landmarks(points)[None])
+        if distance[0] <= self.max_distance_sq:
+            return str(self.labels[best[0]])
+        return self.fallback.classify(points) if self.fallback else 'unknown'
+    
+    def classify_batch(self, points):
+        points = np.asarray(points, dtype=np.float32)
+        valid = ~np.isnan(points).any(axis=(-2, -1))
+        labels = np.full(len(points), 'none', dtype='<U16')
+        if not valid.any():
+            return labels
+        
+        best, distance = self.nearest(normalize_landmarks(points[valid]))
+        matched = np.where(distance <= self.max_distance_sq, self.labels[best], 'unknown')
+        if self.fallback is not None and (matched == 'unknown').any():
+            unmatched = matched == 'unknown'
+            matched[unmatched] = self.fallback.classify_batch(points[valid][unmatched])
+        labels[valid] = matched
+        return labels
+
+
+CLASSIFIERS = {
+    'chain': RuleChainClassifier,
+    'table': MaskTableClassifier,
+    'template': TemplateClassifier,
+}
+
+
+def create_classifier(name='table', templates=None):
+    """Build the classifier backend selected at startup"""
+    if name == 'template':
+        if not templates:
+            raise ValueError("the template classifier needs a template file (--templates)")
+        return TemplateClassifier.load(templates, fallback=MaskTableClassifier())
+    return CLASSIFIERS[name]()
+
+
+class GestureStateMachine:
+    """Confirms gestures by a confidence-weighted vote over recent frames.
+    
+    A gesture is entered once it holds `enter_threshold` of the vote with at
+    least `min_votes` frames behind it, and stays active while it holds
+    `exit_threshold`, so a single misclassified frame neither fires nor
+    cancels an action. Vote totals are running sums (O(1) per frame).
+    """
+    def __init__(self, window=0.2, enter_threshold=0.6, exit_threshold=0.35,
+                 min_votes=4, repeat=None):
+        self.window = window                    # Seconds of classifications in the vote
+        self.enter_threshold = enter_threshold  # Vote share needed to enter a gesture
+        self.exit_threshold = exit_threshold    # Vote share below which it is dropped
+        self.min_votes = min_votes              # Frames needed to enter (and kept in the window)
+        self.repeat = dict(GESTURE_REPEAT if repeat is None else repeat)
+        self.votes = deque()
+        self.weights = defaultdict(float)
+        self.counts = Counter()
+        self.total = 0.0
+        self.active = 'none'
+        self.last_fired = None
+        self.changed = False
+        self.delay = 0.0  # Onset-to-confirmation time of the last transition
+    
+    def reset(self):
+        self.votes.clear()
+        self.weights.clear()
+        self.counts.clear()
+        self.total = 0.0
+        self.enter('none')
+    
+    def enter(self, gesture):
+        self.active = gesture
+        self.last_fired = None
+        self.changed = True
+    
+    def update(self, gesture, timestamp, weight=1.0):
+        """Add one frame's classification and return the confirmed gesture"""
+        votes = self.votes
+        votes.append((timestamp, gesture, weight))
+        self.weights[gesture] += weight
+        self.counts[gesture] += 1
+        self.total += weight
+        while len(votes) > self.min_votes and timestamp - votes[0][0] > self.window:
+            _, old, old_weight = votes.popleft()
+            self.weights[old] -= old_weight
+            self.counts[old] -= 1
+            self.total -= old_weight
+        
+        self.changed = False
+        if (gesture != self.active and self.counts[gesture] >= self.min_votes and
+                self.weights[gesture] >= self.enter_threshold * self.total):
+            self.enter(gesture)
+            onset = next(t for t, g, _ in votes if g == gesture)
+            self.delay = timestamp - onset
+        elif self.active != 'none' and self.weights[self.active] < self.exit_threshold * self.total:
+            # Nothing holds the vote any more
+            self.enter('none')
+        return self.active
+    
+    def due(self, timestamp):
+        """Whether the active gesture's action should fire on this frame"""
+        interval = self.repeat.get(self.active)
+        if interval is None:
+            return True
+        if self.last_fired is None or (interval > 0 and timestamp - self.last_fired >= interval):
+            self.last_fired = timestamp
+            return True
+        return False
+
+
+def parse_gesture_repeat(params):
+    """Merge GESTURE=SECONDS|once|every strings into the default repeat table"""
+    repeat = dict(GESTURE_REPEAT)
+    for param in params or []:
+        gesture, _, value = param.partition('=')
+        gesture, value = gesture.strip(), value.strip().lower()
+        if gesture not in GESTURES:
+            raise ValueError(f"unknown gesture '{gesture}' in --gesture-repeat")
+        if value == 'every':
+            repeat[gesture] = None
+        elif value == 'once':
+            repeat[gesture] = 0
+        else:
+            repeat[gesture] = float(value)
+    return repeat
+
+
+class LandmarkHistory:
+    """Preallocated ring buffer of the last `capacity` landmark frames and timestamps.
+    
+    Frames are addressed by their absolute index (0 for the first frame
+    pushed); only the newest `capacity` of them are still available.
+    """
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.points = np.zeros((capacity, 21, 3), dtype=np.float32)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+    
+    def push(self, points, timestamp):
+        """Copy one frame in, overwriting the oldest; returns its absolute index"""
+        slot = self.count % self.capacity
+        self.points[slot] = points
+        self.timestamps[slot] = timestamp
+        self.count += 1
+        return self.count - 1
+    
+    def oldest(self):
+        return max(0, self.count - self.capacity)
+    
+    def clear(self):
+        self.count = 0
+
+
+class TrajectoryRecognizer:
+    """Recognizes swipes and circling from the palm trajectory in a LandmarkHistory.
+    
+    The trajectory is resampled every `min_step` of travel so landmark
+    jitter doesn't add turning. Path length and signed turning angle over
+    the last `window` seconds are running sums: each frame adds its own
+    step and subtracts the steps that fall out of the window, so updates
+    are O(1) amortized and memory is fixed by the history capacity.
+    Positions are in screen orientation (x mirrored, y down), so positive
+    turning is clockwise on screen. After a swipe no other swipe fires until
+    the palm is still again or `window` seconds have passed, so one physical
+    swipe is one swipe however far it travels.
+    """
+    def __init__(self, history=None, window=0.8, landmark=9, swipe_distance=0.25,
+                 swipe_straightness=0.8, circle_angle=1.5 * math.pi, circle_path=0.2,
+                 min_step=0.015, still_speed=0.3):
+        self.history = history or LandmarkHistory()
+        self.window = window                          # Seconds of trajectory considered
+        self.landmark = landmark                      # Middle finger MCP, steady across poses
+        self.swipe_distance = swipe_distance          # Net travel, fraction of the frame
+        self.swipe_straightness = swipe_straightness  # Net travel / path length
+        self.circle_angle = circle_angle              # Turning (radians) that starts circle scrolling
+        self.circle_path = circle_path                # Path length needed for circle scrolling
+        self.min_step = min_step                      # Resampling distance (above jitter)
+        self.still_speed = still_speed                # Palm speed (frames/s) that counts as still
+        
+        capacity = self.history.capacity
+        self.positions = np.zeros((capacity, 2), dtype=np.float64)
+        self.steps = np.zeros(capacity, dtype=np.float64)  # Resampled step taken at each frame
+        self.turns = np.zeros(capacity, dtype=np.float64)  # Turning angle of that step
+        self.reset()
+    
+    def reset(self):
+        self.history.clear()
+        self.first = 0
+        self.path = 0.0
+        self.turning = 0.0
+        self.anchor = None
+        self.last_step = None
+        self.still_since = None
+        self.swiped_at = None  # Time of the last swipe, until the recognizer re-arms
+    
+    def restart(self, index):
+        """Start a new window at frame `index` (after a swipe has fired)"""
+        self.first = index
+        self.path = 0.0
+        self.turning = 0.0
+    
+    def still(self, timestamp, hold=0.25):
+        """Whether the palm has been still for at least `hold` seconds"""
+        return self.still_since is not None and timestamp - self.still_since >= hold
+    
+    def update(self, points, timestamp):
+        """Add one frame; returns ('swipe_*', distance), ('circle', radians) or None"""
+        history = self.history
+        capacity = history.capacity
+        index = history.push(points, timestamp)
+        slot = index % capacity
+        position = self.positions[slot]
+        position[0] = 1.0 - points[self.landmark, 0]
+        position[1] = points[self.landmark, 1]
+        
+        # Palm speed since the previous frame decides stillness
+        if index > self.first:
+            previous = self.positions[(index - 1) % capacity]
+            dt = max(timestamp - history.timestamps[(index - 1) % capacity], 1e-3)
+            if math.hypot(position[0] - previous[0], position[1] - previous[1]) > self.still_speed * dt:
+                self.still_since = None
+            elif self.still_since is None:
+                self.still_since = timestamp
+        elif self.still_since is None:
+            self.still_since = timestamp
+        
+        # Re-arm after a swipe once the palm stopped (or the window passed),
+        # measuring the next swipe from here rather than from mid-swipe
+        if self.swiped_at is not None and (self.still(timestamp) or timestamp - self.swiped_at >= self.window):
+            self.swiped_at = None
+            self.restart(index)
+        
+        # Resampled step (once the palm is min_step from the last anchor) and its turn
+        step = turn = 0.0
+        if self.anchor is None:
+            self.anchor = (position[0], position[1])
+        dx, dy = position[0] - self.anchor[0], position[1] - self.anchor[1]
+        if math.hypot(dx, dy) >= self.min_step:
+            step = math.hypot(dx, dy)
+            if self.last_step is not None:
+                lx, ly = self.last_step
+                turn = math.atan2(lx * dy - ly * dx, lx * dx + ly * dy)
+            self.anchor = (position[0], position[1])
+            self.last_step = (dx, dy)
+        self.steps[slot] = step
+        self.turns[slot] = turn
+        self.path += step
+        self.turning += turn
+        
+        # Drop frames that left the window (or were overwritten in the ring)
+        oldest = max(history.oldest(), index - capacity + 1)
+        timestamps = history.timestamps
+        while self.first < index and (self.first < oldest or
+                                      timestamp - timestamps[self.first % capacity] > self.window):
+            self.first += 1
+            evicted = self.first % capacity
+            self.path -= self.steps[evicted]
+            self.turning -= self.turns[evicted]
+        
+        # Swipe: long, nearly straight travel since the start of the window
+        start = self.positions[self.first % capacity]
+        net_x, net_y = position[0] - start[0], position[1] - start[1]
+        distance = math.hypot(net_x, net_y)
+        if (self.swiped_at is None and distance >= self.swipe_distance
+                and distance >= self.swipe_straightness * self.path):
+            if abs(net_x) >= abs(net_y):
+                name = 'swipe_right' if net_x > 0 else 'swipe_left'
+            else:
+                name = 'swipe_down' if net_y > 0 else 'swipe_up'
+            self.restart(index)
+            self.swiped_at = timestamp
+            return name, distance
+        
+        # Circling: keeps reporting each frame's turn while the window holds enough of it
+        if turn and abs(self.turning) >= self.circle_angle and self.path >= self.circle_path:
+            return 'circle', turn
+        return None
+
+
+class RoiTracker:
+    """Padded hand bounding box used to crop inference after the first detection.
+    
+    The box only moves when the hand nears its edge or changes size
+    noticeably, so MediaPipe's own tracker sees a stable crop between
+    re-centerings. Boxes are in pixels of the raw (unmirrored) frame.
+    """
+    def __init__(self, padding=0.5, min_size=0.25, recenter_margin=0.1, resize_tolerance=0.3):
+        self.padding = padding                    # Padding on each side, fraction of hand size
+        self.min_size = min_size                  # Minimum box side, fraction of frame height
+        self.recenter_margin = recenter_margin    # Inner margin that triggers a re-center
+        self.resize_tolerance = resize_tolerance  # Relative size change that triggers a refit
+        self.box = None
+    
+    def reset(self):
+        self.box = None
+    
+    def region(self, width, height):
+        """Pixel region (x0, y0, x1, y1) to run inference on"""
+        if self.box is None:
+            return 0, 0, width, height
+        return self.box
+    
+    def update(self, points, width, height):
+        """Fit the box around raw-frame normalized landmarks"""
+        pixels = points[:, :2] * (width, height)
+        low, high = pixels.min(axis=0), pixels.max(axis=0)
+        side = max(float((high - low).max()) * (1 + 2 * self.padding), self.min_size * height)
+        
+        if self.box is not None:
+            x0, y0, x1, y1 = self.box
+            margin = (x1 - x0) * self.recenter_margin
+            inside = (low[0] >= x0 + margin and low[1] >= y0 + margin and
+                      high[0] <= x1 - margin and high[1] <= y1 - margin)
+            current = max(x1 - x0, y1 - y0)
+            if inside and abs(side - current) <= self.resize_tolerance * current:
+                return
+        
+        center_x, center_y = (low + high) / 2
+        side = min(side, width, height)
+        x0 = int(min(max(center_x - side / 2, 0), width - side))
+        y0 = int(min(max(center_y - side / 2, 0), height - side))
+        self.box = (x0, y0, int(x0 + side), int(y0 + side))
+
+
+class ActionDispatcher:
+    """Injects actions from a worker thread fed by a bounded queue.
+    
+    Wraps an action sink with the same interface, so OS input calls (and
+    pyautogui's per-call pause) never block the vision loop. Consecutive
+    cursor moves collapse to the newest target; clicks, drags and scrolls
+    keep strict order.
+    """
+    BUTTON_ACTIONS = ('mouse_down', 'mouse_up')  # Never dropped, a lost release leaves the button held
+    
+    def __init__(self, sink, max_queue=64, on_error=None, on_move=None, latency_window=1000):
+        self.sink = sink
+        self.max_queue = max_queue
+        self.on_error = on_error
+        self.on_move = on_move  # Called with the capture time of each injected move
+        
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._busy = False
+        self._closed = False
+        
+        # Statistics
+        self.latencies = deque(maxlen=latency_window)
+        self.max_depth = 0
+        self.injected = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.errors = 0
+        
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    @property
+    def counts(self):
+        return getattr(self.sink, 'counts', {})
+    
+    def size(self):
+        return self.sink.size()
+    
+    def move_to(self, x, y, captured_at=None):
+        self._submit('move_to', (x, y, captured_at))
+    
+    def click(self, x, y):
+        self._submit('click', (x, y))
+    
+    def right_click(self, x, y):
+        self._submit('right_click', (x, y))
+    
+    def scroll(self, amount):
+        self._submit('scroll', (amount,))
+    
+    def hotkey(self, *keys):
+        self._submit('hotkey', keys)
+    
+    def mouse_down(self, x, y):
+        self._submit('mouse_down', (x, y))
+    
+    def mouse_up(self):
+        self._submit('mouse_up', ())
+    
+    def _submit(self, action, args):
+        now = time.perf_counter()
+        with self._cond:
+            if self._closed:
+                return
+            
+            # Newest cursor target wins over a move that hasn't been injected yet
+            if action == 'move_to' and self._queue and self._queue[-1][0] == 'move_to':
+                self._queue[-1] = (action, args, now)
+                self.coalesced += 1
+                return
+            
+            if len(self._queue) >= self.max_queue:
+                # Make room by dropping a stale move, never an ordered action; button
+                # presses and releases are queued even past the limit
+                stale = next((event for event in self._queue if event[0] == 'move_to'), None)
+                if stale is not None:
+                    self._queue.remove(stale)
+                    self.dropped += 1
+                elif action not in self.BUTTON_ACTIONS:
+                    self.dropped += 1
+                    return
+            
+            self._queue.append((action, args, now))
+            self.max_depth = max(self.max_depth, len(self._queue))
+            self._cond.notify_all()
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                action, args, queued_at = self._queue.popleft()
+                self._busy = True
+            
+            try:
+                getattr(self.sink, action)(*args)
+                if action == 'move_to' and args[2] is not None and self.on_move:
+                    self.on_move(args[2])
+            except Exception as e:
+                self.errors += 1
+                if self.on_error:
+                    self.on_error(f"Error performing action: {str(e)}")
+            
+            with self._cond:
+                self.latencies.append(time.perf_counter() - queued_at)
+                self.injected += 1
+                self._busy = False
+                self._cond.notify_all()
+    
+    def flush(self, timeout=1.0):
+        """Wait until every queued action has been injected"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+    
+    def close(self, timeout=1.0):
+        """Inject what is still queued (e.g. a final mouse up) and stop the worker"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+    
+    def stats(self):
+        """Queue depth and injection latency (ms) of recent actions"""
+        with self._cond:
+            depth = len(self._queue)
+            latencies = list(self.latencies)
+        p50, p95 = np.percentile(latencies, [50, 95]) * 1000 if latencies else (0.0, 0.0)
+        return {
+            'queue_depth': depth,
+            'max_queue_depth': self.max_depth,
+            'injected': self.injected,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'latency_p50_ms': float(p50),
+            'latency_p95_ms': float(p95),
+        }
+
+
+class ExponentialFilter:
+    """Exponential cursor smoothing driven by frame timestamps.
+    
+    `smoothing` is the weight kept from the previous position per frame at
+    `reference_fps` (the old fixed 0.7 blend); other frame rates get the
+    equivalent per-second decay.
+    """
+    def __init__(self, smoothing=0.7, reference_fps=30.0):
+        self.smoothing = smoothing
+        self.reference_fps = reference_fps
+        self.reset()
+    
+    def reset(self, x=None, y=None, t=None):
+        self.state = None if x is None else (x, y)
+        self.last_t = t
+    
+    def precision_variant(self):
+        """Heavier smoothing used for pinch precision mode"""
+        return ExponentialFilter(max(self.smoothing, 0.9), self.reference_fps)
+    
+    def __call__(self, x, y, t):
+        if self.state is None:
+            self.reset(x, y, t)
+            return x, y
+        
+        dt = max(t - self.last_t, 1e-4)
+        keep = self.smoothing ** (dt * self.reference_fps)
+        self.state = (self.state[0] * keep + x * (1 - keep),
+                      self.state[1] * keep + y * (1 - keep))
+        self.last_t = t
+        return self.state
+
+
+class OneEuroFilter:
+    """One Euro filter: low-pass whose cutoff rises with cursor speed.
+    
+    min_cutoff (Hz) sets jitter removal when the hand is still, beta sets how
+    quickly the cutoff opens up (less lag) during fast moves, d_cutoff (Hz)
+    smooths the speed estimate. Positions and speed are in screen pixels.
+    """
+    def __init__(self, min_cutoff=1.0, beta=0.007, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+    
+    def reset(self, x=None, y=None, t=None):
+        self.state = None if x is None else (x, y)
+        self.velocity = (0.0, 0.0)
+        self.last_t = t
+    
+    def precision_variant(self):
+        return OneEuroFilter(self.min_cutoff * 0.2, self.beta * 0.2, self.d_cutoff)
+    
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+    
+    def __call__(self, x, y, t):
+        if self.state is None:
+            self.reset(x, y, t)
+            return x, y
+        
+        dt = max(t - self.last_t, 1e-4)
+        prev_x, prev_y = self.state
+        
+        # Smoothed speed estimate drives the position cutoff
+        a_d = self._alpha(self.d_cutoff, dt)
+        vx = a_d * (x - prev_x) / dt + (1 - a_d) * self.velocity[0]
+        vy = a_d * (y - prev_y) / dt + (1 - a_d) * self.velocity[1]
+        cutoff = self.min_cutoff + self.beta * math.hypot(vx, vy)
+        
+        a = self._alpha(cutoff, dt)
+        self.state = (prev_x + a * (x - prev_x), prev_y + a * (y - prev_y))
+        self.velocity = (vx, vy)
+        self.last_t = t
+        return self.state
+
+
+class KalmanFilter:
+    """Constant-velocity Kalman filter, one independent [position, velocity] state per axis.
+    
+    process_noise is the white acceleration variance (px^2/s^4), raise it to
+    follow direction changes faster. measurement_noise is the landmark noise
+    variance (px^2), raise it to smooth more.
+    """
+    def __init__(self, process_noise=2e6, measurement_noise=25.0):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.reset()
+    
+    def reset(self, x=None, y=None, t=None):
+        # Per axis: [position, velocity, P00, P01, P11]
+        self.axes = None if x is None else [self._initial(x), self._initial(y)]
+        self.last_t = t
+    
+    def _initial(self, position):
+        return [position, 0.0, self.measurement_noise, 0.0, self.process_noise]
+    
+    def precision_variant(self):
+        return KalmanFilter(self.process_noise, self.measurement_noise * 10)
+    
+    @property
+    def state(self):
+        return None if self.axes is None else (self.axes[0][0], self.axes[1][0])
+    
+    @property
+    def velocity(self):
+        return (0.0, 0.0) if self.axes is None else (self.axes[0][1], self.axes[1][1])
+    
+    def _step(self, axis, measurement, dt):
+        p, v, p00, p01, p11 = axis
+        q = self.process_noise
+        
+        # Predict with the white-noise acceleration model
+        p += v * dt
+        p00 += dt * (2 * p01 + dt * p11) + q * dt ** 4 / 4
+        p01 += dt * p11 + q * dt ** 3 / 2
+        p11 += q * dt ** 2
+        
+        # Update with the measured position
+        s = p00 + self.measurement_noise
+        k0, k1 = p00 / s, p01 / s
+        innovation = measurement - p
+        axis[:] = [p + k0 * innovation, v + k1 * innovation,
+                   (1 - k0) * p00, (1 - k0) * p01, p11 - k1 * p01]
+    
+    def __call__(self, x, y, t):
+        if self.axes is None:
+            self.reset(x, y, t)
+            return x, y
+        
+        dt = max(t - self.last_t, 1e-4)
+        self._step(self.axes[0], x, dt)
+        self._step(self.axes[1], y, dt)
+        self.last_t = t
+        return self.state
+
+
+CURSOR_FILTERS = {
+    'exponential': ExponentialFilter,
+    'one_euro': OneEuroFilter,
+    'kalman': KalmanFilter,
+}
+
+
+def create_cursor_filter(name='one_euro', params=None):
+    """Build a cursor filter from its name and NAME=VALUE tuning strings"""
+    kwargs = {}
+    for param in params or []:
+        key, _, value = param.partition('=')
+        kwargs[key.strip()] = float(value)
+    return CURSOR_FILTERS[name](**kwargs)
+
+
+class MotionPredictor:
+    """Extrapolates the filtered cursor forward by the measured pipeline latency.
+    
+    Velocity and acceleration come from short exponential averages of the
+    cursor's finite differences. So that the cursor doesn't overshoot when
+    the hand stops, there is no lead below `min_speed` or when the lead would
+    point against the current velocity (hard deceleration), and the lead is
+    capped at `max_lead` pixels and `max_horizon` seconds.
+    """
+    def __init__(self, smoothing=0.5, min_speed=50.0, max_lead=60.0, max_horizon=0.15):
+        self.smoothing = smoothing      # Weight of the newest velocity/acceleration sample
+        self.min_speed = min_speed      # Pixels per second
+        self.max_lead = max_lead        # Pixels
+        self.max_horizon = max_horizon  # Seconds
+        self.reset()
+    
+    def reset(self):
+        self.last = None
+        self.velocity = (0.0, 0.0)
+        self.acceleration = (0.0, 0.0)
+    
+    def __call__(self, x, y, timestamp, latency):
+        if self.last is None:
+            self.last = (x, y, timestamp)
+            return x, y
+        last_x, last_y, last_t = self.last
+        dt = timestamp - last_t
+        if dt <= 0:
+            return x, y
+        self.last = (x, y, timestamp)
+        
+        s = self.smoothing
+        vx, vy = self.velocity
+        new_vx, new_vy = (x - last_x) / dt, (y - last_y) / dt
+        ax, ay = self.acceleration
+        ax += s * ((new_vx - vx) / dt - ax)
+        ay += s * ((new_vy - vy) / dt - ay)
+        vx += s * (new_vx - vx)
+        vy += s * (new_vy - vy)
+        self.velocity, self.acceleration = (vx, vy), (ax, ay)
+        
+        if math.hypot(vx, vy) < self.min_speed:
+            return x, y
+        horizon = min(max(latency, 0.0), self.max_horizon)
+        lead_x = vx * horizon + 0.5 * ax * horizon * horizon
+        lead_y = vy * horizon + 0.5 * ay * horizon * horizon
+        if lead_x * vx + lead_y * vy <= 0:
+            return x, y
+        lead = math.hypot(lead_x, lead_y)
+        if lead > self.max_lead:
+            lead_x, lead_y = lead_x * self.max_lead / lead, lead_y * self.max_lead / lead
+        return x + lead_x, y + lead_y
+
+
+class RollingHistogram:
+    """Latency histogram over the last `window` samples with log-spaced bins.
+    
+    Adding a sample is O(1): the evicted sample's bin is decremented.
+    Percentiles are read from the cumulative bin counts (bin upper edge).
+    """
+    BIN_EDGES_MS = np.geomspace(0.01, 2000.0, 128).tolist()
+    
+    def __init__(self, window=1000):
+        self.window = window
+        self.bins = np.zeros(window, dtype=np.int16)
+        self.values = np.zeros(window, dtype=np.float64)
+        self.counts = np.zeros(len(self.BIN_EDGES_MS) + 1, dtype=np.int64)
+        self.index = 0
+        self.size = 0
+        self.total = 0.0
+    
+    def add(self, ms):
+        slot = self.index
+        if self.size == self.window:
+            self.counts[self.bins[slot]] -= 1
+            self.total -= self.values[slot]
+        else:
+            self.size += 1
+        
+        b = bisect.bisect_left(self.BIN_EDGES_MS, ms)
+        self.bins[slot] = b
+        self.values[slot] = ms
+        self.counts[b] += 1
+        self.total += ms
+        self.index = (slot + 1) % self.window
+    
+    @property
+    def mean(self):
+        return float(self.total / self.size) if self.size else 0.0
+    
+    def percentile(self, q):
+        if not self.size:
+            return 0.0
+        b = int(np.searchsorted(np.cumsum(self.counts), q / 100.0 * self.size))
+        return self.BIN_EDGES_MS[min(b, len(self.BIN_EDGES_MS) - 1)]
+
+
+class MotionLatency:
+    """Capture-to-injection latency of cursor moves.
+    
+    Samples come from whichever thread injects the move. `estimate` is an
+    exponential average (seconds) used to extrapolate the cursor; the
+    rolling histogram gives percentiles for reports.
+    """
+    def __init__(self, smoothing=0.1, window=1000):
+        self.smoothing = smoothing
+        self.histogram = RollingHistogram(window)
+        self.estimate = 0.0
+        self.samples = 0
+        self._lock = threading.Lock()
+    
+    def add(self, captured_at):
+        """Record a move that has just been injected for a frame captured at `captured_at`"""
+        latency = time.time() - captured_at
+        with self._lock:
+            self.histogram.add(latency * 1000.0)
+            self.estimate = latency if not self.samples else \
+                self.estimate + self.smoothing * (latency - self.estimate)
+            self.samples += 1
+    
+    def stats(self):
+        with self._lock:
+            histogram = self.histogram
+            return {
+                'samples': self.samples,
+                'mean_ms': histogram.mean,
+                'p50_ms': histogram.percentile(50),
+                'p95_ms': histogram.percentile(95),
+            }
+
+
+class NullProfiler:
+    """Stand-in used when metrics are off - every hook is a no-op"""
+    enabled = False
+    
+    def begin(self):
+        pass
+    
+    def lap(self, stage):
+        pass
+    
+    def record(self, stage, seconds):
+        pass
+    
+    def end_frame(self):
+        pass
+    
+    def close(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class StageProfiler:
+    """Per-stage frame timings feeding rolling histograms, with periodic export.
+    
+    The video loop calls begin() when it picks up a frame and lap(stage)
+    after each stage; laps of the same stage within a frame add up.
+    Stages timed on other threads (capture) use record(). Snapshots go to a
+    .csv or JSON-lines file (by extension) every `export_interval` seconds.
+    """
+    enabled = True
+    
+    def __init__(self, export_path=None, export_interval=5.0, window=1000):
+        self.window = window
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self._frame = defaultdict(float)
+        self._last = self._frame_start = time.perf_counter()
+        
+        # Frame rate from the interval between completed frames
+        self.fps = 0.0
+        self._last_frame_end = None
+        
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self._last_export = time.time()
+        self._export_file = None
+        if export_path:
+            self._export_file = open(export_path, 'a', newline='')
+            self._csv = export_path.lower().endswith('.csv')
+            if self._csv and self._export_file.tell() == 0:
+                self._export_file.write("time,stage,count,mean_ms,p50_ms,p95_ms,p99_ms,fps\n")
+    
+    def begin(self):
+        self._last = self._frame_start = time.perf_counter()
+    
+    def lap(self, stage):
+        now = time.perf_counter()
+        self._frame[stage] += now - self._last
+        self._last = now
+    
+    def record(self, stage, seconds):
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = RollingHistogram(self.window)
+            histogram.add(seconds * 1000.0)
+    
+    def end_frame(self):
+        now = time.perf_counter()
+        for stage, seconds in self._frame.items():
+            self.record(stage, seconds)
+        self._frame.clear()
+        self.record('frame', now - self._frame_start)
+        
+        if self._last_frame_end is not None:
+            interval = now - self._last_frame_end
+            if interval > 0:
+                self.fps = 0.9 * self.fps + 0.1 / interval if self.fps else 1.0 / interval
+        self._last_frame_end = now
+        
+        if self._export_file and time.time() - self._last_export >= self.export_interval:
+            self.export()
+    
+    def snapshot(self):
+        """{stage: {count, mean_ms, p50_ms, p95_ms, p99_ms}} over the rolling window"""
+        with self.lock:
+            return {stage: {'count': h.size, 'mean_ms': h.mean, 'p50_ms': h.percentile(50),
+                            'p95_ms': h.percentile(95), 'p99_ms': h.percentile(99)}
+                    for stage, h in self.histograms.items()}
+    
+    def export(self):
+        self._last_export = now = time.time()
+        for stage, row in self.snapshot().items():
+            if self._csv:
+                self._export_file.write(f"{now:.3f},{stage},{row['count']},{row['mean_ms']:.4f},"
+                                        f"{row['p50_ms']:.4f},{row['p95_ms']:.4f},"
+                                        f"{row['p99_ms']:.4f},{self.fps:.2f}\n")
+            else:
+                self._export_file.write(json.dumps(dict(time=round(now, 3), stage=stage,
+                                                        fps=round(self.fps, 2), **row)) + "\n")
+        self._export_file.flush()
+    
+    def draw_overlay(self, frame, scale=1.0, stages=('capture', 'convert', 'inference', 'recognize',
+                                                     'action', 'overlay', 'imshow', 'frame')):
+        """Draw FPS and per-stage p50/p95 latency onto the preview frame"""
+        snapshot = self.snapshot()
+        lines = [f"FPS {self.fps:.1f}"]
+        lines += [f"{stage:<9} {snapshot[stage]['p50_ms']:6.2f} / {snapshot[stage]['p95_ms']:6.2f} ms"
+                  for stage in stages if stage in snapshot]
+        for i, line in enumerate(lines):
+            cv2.putText(frame, line, (int(10 * scale), int((100 + 18 * i) * scale)),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.45 * scale, (0, 255, 255), 1)
+    
+    def close(self):
+        if self._export_file:
+            self.export()
+            self._export_file.close()
+            self._export_file = None
+
+
+class HandDetector:
+    """MediaPipe hand detection with optional ROI cropping, downscaling and frame skipping"""
+    def __init__(self, roi_enabled=False, inference_scale=1.0, max_num_hands=1,
+                 min_detection_confidence=0.7, min_tracking_confidence=0.5,
+                 model_complexity=1, infer_every=1):
+        self.hands_options = dict(
             static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
+            max_num_hands=max_num_hands,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
         )
-        self.mp_draw = mp.solutions.drawing_utils
+        self._model_complexity = model_complexity
+        self.hands = self.create_hands()
+        
+        # Inference region: ROI crop around the last hand and optional downscale
+        self.roi_enabled = roi_enabled
+        self.roi_tracker = RoiTracker()
+        self.inference_scale = inference_scale
+        self.frame_size = None
         
-        # Camera setup
+        # Inference on every Nth frame only, landmarks extrapolated in between
+        self.infer_every = infer_every
+        self.skipped = None  # Frames since the last inference (None: infer next frame)
+        self.last_detections = []
+        self.velocities = []  # Per-frame landmark motion of each hand
+        
+        # Stage timing hooks (convert / inference)
+        self.profiler = NULL_PROFILER
+    
+    def create_hands(self):
+        return mp.solutions.hands.Hands(model_complexity=self._model_complexity, **self.hands_options)
+    
+    def warm_up(self, width=640, height=480):
+        """Run the graph once on a blank frame so the first camera frame doesn't pay its setup"""
+        self.hands.process(np.zeros((height, width, 3), dtype=np.uint8))
+    
+    @property
+    def model_complexity(self):
+        return self._model_complexity
+    
+    @model_complexity.setter
+    def model_complexity(self, value):
+        """Switching the landmark model rebuilds the MediaPipe graph"""
+        if value != self._model_complexity:
+            self._model_complexity = value
+            self.hands.close()
+            self.hands = self.create_hands()
+    
+    def run_inference(self, frame, region):
+        """Run MediaPipe on a region of a raw frame.
+        
+        Returns detections with landmarks mapped back to normalized
+        full-frame coordinates and mirrored in x, so they match what a
+        horizontally flipped frame would have produced.
+        """
+        height, width = frame.shape[:2]
+        x0, y0, x1, y1 = region
+        crop = frame if (x1 - x0, y1 - y0) == (width, height) else frame[y0:y1, x0:x1]
+        if self.inference_scale != 1.0:
+            crop = cv2.resize(crop, None, fx=self.inference_scale, fy=self.inference_scale,
+                              interpolation=cv2.INTER_AREA)
+        rgb_crop = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+        self.profiler.lap('convert')
+        results = self.hands.process(rgb_crop)
+        self.profiler.lap('inference')
+        
+        detections = []
+        if not results.multi_hand_landmarks:
+            return detections
+        
+        crop_scale = np.array([(x1 - x0) / width, (y1 - y0) / height, (x1 - x0) / width],
+                              dtype=np.float32)
+        offset = np.array([x0 / width, y0 / height, 0.0], dtype=np.float32)
+        for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
+            points = landmarks_to_array(hand_landmarks.landmark) * crop_scale + offset
+            
+            handedness, score = 'Unknown', 1.0
+            if results.multi_handedness and i < len(results.multi_handedness):
+                classification = results.multi_handedness[i].classification[0]
+                # MediaPipe assumes a mirrored input, the raw frame isn't
+                handedness = {'Left': 'Right', 'Right': 'Left'}.get(classification.label,
+                                                                    classification.label)
+                score = classification.score
+            detections.append(HandDetection(points, handedness, score))
+        return detections
+    
+    def detect_hands(self, frame):
+        """Detect hands in a raw (unmirrored) BGR camera frame.
+        
+        With ROI tracking enabled, inference runs on a padded crop around the
+        previous hand and falls back to the full frame when the hand is lost.
+        Landmarks come back mirrored so the frame itself never needs flipping.
+        """
+        height, width = frame.shape[:2]
+        if (width, height) != self.frame_size:
+            # Camera resolution changed: ROI boxes are in pixels of the old size
+            self.frame_size = (width, height)
+            self.roi_tracker.reset()
+            self.skipped = None
+        
+        # Between inferences, move the last landmarks on by their per-frame motion
+        if self.skipped is not None and self.skipped + 1 < self.infer_every:
+            self.skipped += 1
+            return [HandDetection(detection.points + velocity * self.skipped, detection.handedness,
+                                  detection.score)
+                    for detection, velocity in zip(self.last_detections, self.velocities)]
+        
+        roi = self.roi_tracker if self.roi_enabled else None
+        detections = self.run_inference(frame, roi.region(width, height) if roi else
+                                        (0, 0, width, height))
+        if roi is not None:
+            if not detections and roi.box is not None:
+                # Tracking lost - retry this frame with full-frame detection
+                roi.reset()
+                detections = self.run_inference(frame, (0, 0, width, height))
+            if len(detections) >= self.hands_options['max_num_hands']:
+                roi.update(np.concatenate([detection.points for detection in detections]), width, height)
+            else:
+                # Hands missing - look at the whole frame again so they can be found
+                roi.reset()
+        
+        # Mirror x so landmarks match the flipped preview (ROI boxes stay in raw frame pixels)
+        for detection in detections:
+            detection.points[:, 0] = 1.0 - detection.points[:, 0]
+        
+        # Per-frame motion since the previous inference, for the frames skipped next
+        frames = (self.skipped or 0) + 1
+        if self.skipped is not None and len(detections) == len(self.last_detections):
+            self.velocities = [(detection.points - last.points) / frames
+                               for detection, last in zip(detections, self.last_detections)]
+        else:
+            self.velocities = [np.zeros_like(detection.points) for detection in detections]
+        self.last_detections = detections
+        self.skipped = 0
+        return detections
+    
+    def close(self):
+        self.hands.close()
+
+
+# Quality levels from best to cheapest; the governor steps one level at a time
+QualityLevel = namedtuple('QualityLevel', ['name', 'resolution', 'model_complexity',
+                                           'inference_scale', 'infer_every'])
+QUALITY_LEVELS = (
+    QualityLevel('high', (1280, 720), 1, 0.75, 1),
+    QualityLevel('default', (640, 480), 1, 1.0, 1),
+    QualityLevel('fast', (640, 480), 0, 1.0, 1),
+    QualityLevel('faster', (640, 480), 0, 0.75, 1),
+    QualityLevel('low', (640, 480), 0, 0.5, 2),
+    QualityLevel('minimal', (320, 240), 0, 1.0, 3),
+)
+
+
+class QualityGovernor:
+    """Steps between QUALITY_LEVELS to hold per-frame processing time under a budget.
+    
+    Quality drops when the mean frame time over the last `window` frames
+    exceeds the budget (or the machine is overloaded) and rises only when it
+    is well under it (`headroom`) and the load is low. After any change the
+    window starts over and no further change happens for `hold` seconds.
+    A level that had to be left soon after being entered waits twice as
+    long before it is tried again, so the governor doesn't flap.
+    """
+    def __init__(self, budget_ms=33.3, level=1, levels=QUALITY_LEVELS, window=60, hold=3.0,
+                 upgrade_wait=10.0, headroom=0.6, max_load=0.9, low_load=0.7):
+        self.budget = budget_ms / 1000.0
+        self.levels = levels
+        self.level = level
+        self.window = window
+        self.hold = hold
+        self.headroom = headroom  # Fraction of the budget below which quality may rise
+        self.max_load = max_load  # System load per CPU that forces quality down
+        self.low_load = low_load  # ... and below which quality may rise
+        self.upgrade_wait = [upgrade_wait] * len(levels)  # Seconds before re-entering each level
+        self.times = deque(maxlen=window)
+        self.total = 0.0
+        self.changed_at = None
+        self.last_upgrade = None
+    
+    @staticmethod
+    def system_load():
+        """1-minute load average per CPU, or None where the OS doesn't report it"""
+        if not hasattr(os, 'getloadavg'):
+            return None
+        try:
+            return os.getloadavg()[0] / (os.cpu_count() or 1)
+        except OSError:
+            return None
+    
+    def observe(self, seconds, now):
+        """Add one frame's processing time; returns (new level, reason) or None"""
+        if self.changed_at is None:
+            self.changed_at = now
+        if len(self.times) == self.window:
+            self.total -= self.times[0]
+        self.times.append(seconds)
+        self.total += seconds
+        if len(self.times) < self.window or now - self.changed_at < self.hold:
+            return None
+        
+        mean = self.total / len(self.times)
+        load = self.system_load()
+        load_text = f", load {load:.2f}" if load is not None else ""
+        if self.level + 1 < len(self.levels) and (
+                mean > self.budget or (load is not None and load > self.max_load)):
+            # Leaving a level we only just upgraded into: back off before retrying it
+            if self.last_upgrade == self.level and now - self.changed_at < 2 * self.upgrade_wait[self.level]:
+                self.upgrade_wait[self.level] *= 2
+            return self.change(self.level + 1, now,
+                               f"frame {mean * 1000:.1f} ms over {self.budget * 1000:.1f} ms budget{load_text}")
+        if (self.level > 0 and mean < self.headroom * self.budget and
+                (load is None or load < self.low_load) and
+                now - self.changed_at >= self.upgrade_wait[self.level - 1]):
+            return self.change(self.level - 1, now,
+                               f"frame {mean * 1000:.1f} ms under {self.budget * 1000:.1f} ms budget{load_text}")
+        return None
+    
+    def change(self, level, now, reason):
+        self.last_upgrade = level if level < self.level else None
+        self.level = level
+        self.changed_at = now
+        self.times.clear()
+        self.total = 0.0
+        return level, reason
+
+
+class MotionGate:
+    """Cheap frame-differencing motion detector used while idle.
+    
+    Frames are reduced to a small blurred grayscale thumbnail; motion is a
+    large enough fraction of thumbnail pixels changing by more than
+    `threshold` grey levels since the previous idle frame.
+    """
+    def __init__(self, size=(64, 48), threshold=25, min_fraction=0.01):
+        self.size = size
+        self.threshold = threshold
+        self.min_fraction = min_fraction
+        self.reset()
+    
+    def reset(self):
+        self.previous = None
+        self.shape = None
+    
+    def update(self, frame):
+        """Returns True when the frame differs enough from the previous one"""
+        if frame.shape != self.shape:
+            # New resolution (e.g. the camera just switched) - start over
+            self.reset()
+            self.shape = frame.shape
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        previous, self.previous = self.previous, gray
+        if previous is None:
+            return False
+        changed = cv2.countNonZero(cv2.threshold(cv2.absdiff(gray, previous), self.threshold,
+                                                 255, cv2.THRESH_BINARY)[1])
+        return changed >= self.min_fraction * gray.size
+
+
+class LatestFrameBuffer:
+    """Single-slot frame buffer where the newest frame always wins"""
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None
+        self._timestamp = 0.0
+        self._frame_id = 0
+        self._consumed_id = 0
+        self._closed = False
+        
+        # Frames that were overwritten before the consumer got to them
+        self.captured_frames = 0
+        self.dropped_frames = 0
+    
+    def put(self, frame, timestamp):
+        """Store a new frame, replacing any frame that was never consumed"""
+        with self._cond:
+            if self._frame_id != self._consumed_id:
+                self.dropped_frames += 1
+            self._frame = frame
+            self._timestamp = timestamp
+            self._frame_id += 1
+            self.captured_frames += 1
+            self._cond.notify()
+    
+    def get(self, timeout=1.0):
+        """Wait for a frame newer than the last one returned.
+        
+        Returns (frame, capture_timestamp, frame_id), or None on timeout or
+        once the buffer has been closed.
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._frame_id != self._consumed_id or self._closed, timeout)
+            if self._frame_id == self._consumed_id:
+                return None
+            
+            self._consumed_id = self._frame_id
+            frame, self._frame = self._frame, None
+            return frame, self._timestamp, self._frame_id
+    
+    def close(self):
+        """Wake up any waiting consumer and stop handing out frames"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+    
+    @property
+    def closed(self):
+        return self._closed
+
+
+class SharedFrameRing:
+    """Ring of frame slots in shared memory with a sequence number per slot.
+    
+    The capture process reads camera frames straight into a slot and the
+    inference process (and the preview) read them in place, so frames are
+    never pickled between processes. A slot's sequence number is -1 while it
+    is being written; readers re-check it afterwards to detect overwrites.
+    """
+    def __init__(self, shape, slots=8, name=None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        header_bytes = slots * 16  # int64 sequence + float64 capture time per slot
+        frame_bytes = int(np.prod(self.shape))
+        
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None,
+                                              size=header_bytes + slots * frame_bytes)
+        self.sequences = np.ndarray((slots,), dtype=np.int64, buffer=self.shm.buf)
+        self.timestamps = np.ndarray((slots,), dtype=np.float64, buffer=self.shm.buf,
+                                     offset=slots * 8)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf,
+                                 offset=header_bytes)
+        if name is None:
+            self.sequences[:] = -1
+    
+    @property
+    def name(self):
+        return self.shm.name
+    
+    def close(self):
+        # Views into the buffer must go before the mapping can be closed
+        del self.sequences, self.timestamps, self.frames
+        self.shm.close()
+    
+    def unlink(self):
+        self.shm.unlink()
+
+
+# Compact result sent back from an inference process for one frame
+PipelineResult = namedtuple('PipelineResult', ['source', 'sequence', 'capture_time', 'detections',
+                                               'inference_time'])
+
+# Shared state of one source's capture/inference process pair
+PipelineSource = namedtuple('PipelineSource', ['ring', 'latest', 'dropped', 'frame_ready', 'frame_taken',
+                                               'stop_event'])
+
+
+def parse_source(text):
+    """Camera index ('0') or a video file / stream URL"""
+    return int(text) if str(text).isdigit() else text
+
+
+def capture_process(ring_name, shape, slots, source, latest, frame_ready, frame_taken, stop_event,
+                    status_queue, index=0, replay=False):
+    """Worker process: read camera frames straight into shared-memory slots.
+    
+    With `replay`, a video file stands in for a camera: it starts over at the
+    end, and the next frame is read as soon as inference takes the last one,
+    so throughput is bound by inference rather than by the file's frame rate.
+    """
+    ring = SharedFrameRing(shape, slots, name=ring_name)
+    height, width = shape[:2]
+    cap = None
+    
+    try:
+        cap = cv2.VideoCapture(source)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if not cap.isOpened():
+            status_queue.put((index, f"Could not open camera {source}"))
+            return
+        status_queue.put((index, 'ok'))
+        
+        sequence = 0
+        frame_taken.set()
+        while not stop_event.is_set():
+            if replay:
+                if not frame_taken.wait(timeout=0.5):
+                    continue
+                frame_taken.clear()
+            
+            slot = sequence % slots
+            target = ring.frames[slot]
+            ring.sequences[slot] = -1
+            ret, frame = cap.read(target)
+            if not ret and replay:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, frame = cap.read(target)
+            if not ret:
+                break
+            if not np.shares_memory(frame, target):
+                # Camera ignored the requested size - scale into the slot instead
+                cv2.resize(frame, (width, height), dst=target)
+            
+            ring.timestamps[slot] = time.time()
+            ring.sequences[slot] = sequence
+            latest.value = sequence
+            frame_ready.set()
+            sequence += 1
+    except Exception as e:
+        status_queue.put((index, f"Capture worker for camera {source} failed: {e!r}"))
+        raise
+    finally:
+        if cap is not None:
+            cap.release()
+        ring.close()
+        stop_event.set()
+        frame_ready.set()
+
+
+def inference_process(ring_name, shape, slots, detector_options, latest, frame_ready, frame_taken,
+                      stop_event, status_queue, result_queue, dropped, index=0):
+    """Worker process: run hand detection on the newest shared-memory frame.
+    
+    Reports 'ok' once the model is warm, or why it failed; either way the
+    source's stop_event is set when the worker ends.
+    """
+    ring = SharedFrameRing(shape, slots, name=ring_name)
+    detector = None
+    last_sequence = -1
+    
+    try:
+        detector = HandDetector(**detector_options)
+        detector.warm_up(shape[1], shape[0])
+        status_queue.put((index, 'ok'))
+        
+        while not stop_event.is_set():
+            if not frame_ready.wait(timeout=0.5):
+                continue
+            frame_ready.clear()
+            sequence = latest.value
+            if sequence <= last_sequence:
+                continue
+            if last_sequence >= 0:
+                with dropped.get_lock():
+                    dropped.value += sequence - last_sequence - 1
+            last_sequence = sequence
+            frame_taken.set()
+            
+            slot = sequence % slots
+            start = time.perf_counter()
+            capture_time = float(ring.timestamps[slot])
+            detections = detector.detect_hands(ring.frames[slot])
+            
+            # Drop the result if capture lapped the ring while we were reading
+            if ring.sequences[slot] != sequence:
+                with dropped.get_lock():
+                    dropped.value += 1
+                continue
+            
+            # Plain tuples and one stacked landmark array keep the message small
+            points = np.array([d.points for d in detections], dtype=np.float32).reshape(-1, 21, 3)
+            result_queue.put((index, sequence, capture_time, points,
+                              tuple(d.handedness for d in detections),
+                              tuple(d.score for d in detections),
+                              time.perf_counter() - start))
+    except Exception as e:
+        status_queue.put((index, f"Inference worker for source {index} failed: {e!r}"))
+        raise
+    finally:
+        if detector is not None:
+            detector.close()
+        ring.close()
+        stop_event.set()
+        frame_taken.set()  # Wakes a replaying capture worker so it sees the stop
+
+
+class MultiProcessPipeline:
+    """Capture and inference in separate worker processes, one pair per camera source.
+    
+    Frames travel through a SharedFrameRing per source; only compact landmark
+    arrays come back to the controller, on one queue shared by all sources
+    (older results of a source are skipped). Sources never share a worker,
+    so throughput grows with the number of sources up to the number of cores.
+    """
+    def __init__(self, sources, camera_size, detector_options, slots=8, start_timeout=10.0,
+                 replay=False):
+        width, height = camera_size
+        self.sources = list(sources)
+        self.shape = (height, width, 3)
+        self.slots = slots
+        self.detector_options = dict(detector_options)
+        self.start_timeout = start_timeout
+        
+        context = multiprocessing.get_context('spawn')
+        self.status_queue = context.Queue()
+        self.result_queue = context.Queue()
+        self.workers = []
+        self.processes = []
+        for index, source in enumerate(self.sources):
+            worker = PipelineSource(SharedFrameRing(self.shape, slots), context.Value('q', -1, lock=False),
+                                    context.Value('q', 0), context.Event(), context.Event(), context.Event())
+            self.workers.append(worker)
+            self.processes += [
+                context.Process(target=capture_process, daemon=True,
+                                args=(worker.ring.name, self.shape, slots, source, worker.latest,
+                                      worker.frame_ready, worker.frame_taken, worker.stop_event,
+                                      self.status_queue, index, replay)),
+                context.Process(target=inference_process, daemon=True,
+                                args=(worker.ring.name, self.shape, slots, self.detector_options,
+                                      worker.latest, worker.frame_ready, worker.frame_taken,
+                                      worker.stop_event, self.status_queue, self.result_queue,
+                                      worker.dropped, index)),
+            ]
+        self.skipped_results = 0
+        self.error = None  # First failure a worker reported
+    
+    def start(self):
+        """Start the workers and wait until every one reports ready.
+        
+        Raises RuntimeError with the worker's reason if one fails, exits or
+        is not ready within start_timeout.
+        """
+        for process in self.processes:
+            process.start()
+        
+        waiting = len(self.processes)
+        deadline = time.time() + self.start_timeout
+        while waiting:
+            try:
+                index, status = self.status_queue.get(timeout=0.1)
+            except queue.Empty:
+                # A worker that died without a word (e.g. killed) fails the start too
+                if any(process.exitcode not in (None, 0) for process in self.processes):
+                    raise RuntimeError("A worker process exited during startup")
+                if time.time() >= deadline:
+                    raise RuntimeError(f"Worker processes not ready after {self.start_timeout:.0f} s")
+                continue
+            if status != 'ok':
+                self.error = status
+                raise RuntimeError(status)
+            waiting -= 1
+    
+    def source_stopped(self, index):
+        """Whether a source has stopped, or one of its worker processes has died"""
+        capture, inference = self.processes[2 * index:2 * index + 2]
+        return (self.workers[index].stop_event.is_set()
+                or not (capture.is_alive() and inference.is_alive()))
+    
+    @property
+    def stopped(self):
+        """All sources have stopped (a camera that fails alone leaves the others running)"""
+        return all(self.source_stopped(index) for index in range(len(self.workers)))
+    
+    @property
+    def failed_sources(self):
+        return [index for index in range(len(self.workers)) if self.source_stopped(index)]
+    
+    def failure(self):
+        """The first error a worker reported, if any"""
+        while self.error is None:
+            try:
+                index, status = self.status_queue.get_nowait()
+            except queue.Empty:
+                break
+            if status != 'ok':
+                self.error = status
+        return self.error
+    
+    @property
+    def captured_frames(self):
+        return sum(worker.latest.value + 1 for worker in self.workers)
+    
+    @property
+    def dropped_frames(self):
+        return sum(worker.dropped.value for worker in self.workers) + self.skipped_results
+    
+    def get_results(self, timeout=1.0):
+        """Newest inference result of each source that produced one, oldest capture first.
+        
+        Returns an empty list on timeout.
+        """
+        try:
+            results = [self.result_queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        
+        # Latest result per source wins if the controller fell behind
+        while True:
+            try:
+                results.append(self.result_queue.get_nowait())
+            except queue.Empty:
+                break
+        newest = {result[0]: result for result in results}
+        self.skipped_results += len(results) - len(newest)
+        
+        merged = []
+        for source, sequence, capture_time, points, handedness, scores, inference_time in newest.values():
+            detections = [HandDetection(*hand) for hand in zip(points, handedness, scores)]
+            merged.append(PipelineResult(source, sequence, capture_time, detections, inference_time))
+        return sorted(merged, key=lambda result: result.capture_time)
+    
+    def read_preview(self, result, scale=1.0):
+        """Mirrored copy of a result's frame, or None if its slot was overwritten"""
+        ring = self.workers[result.source].ring
+        slot = result.sequence % self.slots
+        preview = mirrored_preview(ring.frames[slot], scale)
+        if ring.sequences[slot] != result.sequence:
+            return None
+        return preview
+    
+    def stop(self):
+        for worker in self.workers:
+            worker.stop_event.set()
+            worker.frame_ready.set()
+            worker.frame_taken.set()
+        for process in self.processes:
+            if process.pid is not None:
+                process.join(timeout=2.0)
+                if process.is_alive():
+                    process.terminate()
+        for worker in self.workers:
+            worker.ring.close()
+            worker.ring.unlink()
+
+
+class PyAutoGUIActionSink:
+    """Performs gesture actions as real OS mouse events.
+    
+    pyautogui is imported by load(), which the app calls off the UI thread
+    once the window is up; pass `screen_size` to answer size() without it.
+    """
+    def __init__(self, screen_size=None):
+        self.screen_size = screen_size
+    
+    def load(self):
+        try:
+            pyautogui.load()
+        except Exception as e:
+            raise RuntimeError(f"pyautogui is not available (no display?): {e}")
+        pyautogui.FAILSAFE = True  # Move mouse to corner to stop
+        pyautogui.PAUSE = 0.01     # Small pause between actions
+    
+    def size(self):
+        if self.screen_size is None:
+            self.load()
+            self.screen_size = tuple(pyautogui.size())
+        return self.screen_size
+    
+    def move_to(self, x, y, captured_at=None):
+        pyautogui.moveTo(x, y)
+    
+    def click(self, x, y):
+        pyautogui.click(x, y)
+    
+    def right_click(self, x, y):
+        pyautogui.rightClick(x, y)
+    
+    def scroll(self, amount):
+        pyautogui.scroll(amount)
+    
+    def hotkey(self, *keys):
+        pyautogui.hotkey(*keys)
+    
+    def mouse_down(self, x, y):
+        pyautogui.mouseDown(x, y)
+    
+    def mouse_up(self):
+        pyautogui.mouseUp()
+
+
+class RecordingActionSink:
+    """Stub action sink that counts actions instead of injecting them.
+    
+    `delay` (seconds) emulates the blocking cost of real input injection,
+    e.g. pyautogui.PAUSE.
+    """
+    def __init__(self, screen_size=(1920, 1080), history=1000, delay=0.0):
+        self.screen_size = screen_size
+        self.delay = delay
+        self.counts = Counter()
+        self.history = deque(maxlen=history)
+    
+    def _record(self, action, *args):
+        if self.delay:
+            time.sleep(self.delay)
+        self.counts[action] += 1
+        self.history.append((action,) + args)
+    
+    def size(self):
+        return self.screen_size
+    
+    def move_to(self, x, y, captured_at=None):
+        self._record('move_to', x, y)
+    
+    def click(self, x, y):
+        self._record('click', x, y)
+    
+    def right_click(self, x, y):
+        self._record('right_click', x, y)
+    
+    def scroll(self, amount):
+        self._record('scroll', amount)
+    
+    def hotkey(self, *keys):
+        self._record('hotkey', *keys)
+    
+    def mouse_down(self, x, y):
+        self._record('mouse_down', x, y)
+    
+    def mouse_up(self):
+        self._record('mouse_up')
+
+
+class ActionTap:
+    """Forwards actions to a sink and reports each action's name to a callback.
+    
+    Everything else (size, counts, dispatcher statistics) is read from the
+    wrapped sink.
+    """
+    def __init__(self, sink, on_action):
+        self.sink = sink
+        self.on_action = on_action
+    
+    def __getattr__(self, name):
+        return getattr(self.sink, name)
+    
+    def move_to(self, x, y, captured_at=None):
+        self.on_action('move_to')
+        self.sink.move_to(x, y, captured_at)
+    
+    def click(self, x, y):
+        self.on_action('click')
+        self.sink.click(x, y)
+    
+    def right_click(self, x, y):
+        self.on_action('right_click')
+        self.sink.right_click(x, y)
+    
+    def scroll(self, amount):
+        self.on_action('scroll')
+        self.sink.scroll(amount)
+    
+    def hotkey(self, *keys):
+        self.on_action('hotkey')
+        self.sink.hotkey(*keys)
+    
+    def mouse_down(self, x, y):
+        self.on_action('mouse_down')
+        self.sink.mouse_down(x, y)
+    
+    def mouse_up(self):
+        self.on_action('mouse_up')
+        self.sink.mouse_up()
+
+
+class SessionRecorder:
+    """Writes a .gsr session recording in batches from a background thread.
+    
+    Records are filled into a preallocated batch on the video thread; full
+    batches are handed to the writer thread, so disk I/O never stalls the
+    loop. About 275 bytes per hand and frame (~30 MB per hour at 30 FPS).
+    """
+    def __init__(self, path, batch_size=512):
+        self.path = path
+        self.batch_size = batch_size
+        self.batch = np.zeros(batch_size, dtype=SESSION_RECORD)
+        self.size = 0
+        self.records = 0
+        self.pending_action = 0
+        self.gesture_codes = {name: i for i, name in enumerate(GESTURES)}
+        self.action_codes = {name: i for i, name in enumerate(SESSION_ACTIONS)}
+        
+        self.file = open(path, 'wb')
+        self.file.write(SESSION_MAGIC + np.uint64(SESSION_RECORD.itemsize).tobytes())
+        self.batches = queue.Queue()
+        self.thread = threading.Thread(target=self._write, daemon=True)
+        self.thread.start()
+    
+    def note_action(self, action):
+        """Remember the frame's action (a click, scroll, ... wins over a cursor move)"""
+        if self.pending_action <= 1:
+            self.pending_action = self.action_codes[action]
+    
+    def add(self, timestamp, points=None, handedness='Unknown', score=0.0,
+            gesture='none', confirmed='none', hands=0, source=0, frame=0):
+        record = self.batch[self.size]
+        record['timestamp'] = timestamp
+        record['frame'] = frame
+        record['source'] = source
+        record['landmarks'] = np.nan if points is None else points
+        record['score'] = score
+        record['hands'] = hands
+        record['handedness'] = HANDEDNESS.index(handedness) if handedness in HANDEDNESS else 0
+        record['gesture'] = self.gesture_codes.get(gesture, 0)
+        record['confirmed'] = self.gesture_codes.get(confirmed, 0)
+        record['action'] = self.pending_action
+        self.pending_action = 0
+        self.records += 1
+        
+        self.size += 1
+        if self.size == self.batch_size:
+            self.batches.put(self.batch)
+            self.batch = np.zeros(self.batch_size, dtype=SESSION_RECORD)
+            self.size = 0
+    
+    def _write(self):
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                return
+            batch.tofile(self.file)
+            self.file.flush()
+    
+    def close(self):
+        """Write the partial batch and wait for the writer thread"""
+        if self.size:
+            self.batches.put(self.batch[:self.size])
+            self.size = 0
+        self.batches.put(None)
+        self.thread.join()
+        self.file.close()
+
+
+def load_session(path):
+    """Memory-map a .gsr session recording as a SESSION_RECORD array.
+    
+    A trailing partial record (e.g. after a crash) is ignored.
+    """
+    header = len(SESSION_MAGIC) + 8
+    with open(path, 'rb') as f:
+        magic, record_size = f.read(len(SESSION_MAGIC)), np.frombuffer(f.read(8), dtype=np.uint64)
+    if magic != SESSION_MAGIC or len(record_size) != 1 or record_size[0] != SESSION_RECORD.itemsize:
+        raise ValueError(f"{path}: not a session recording in this format")
+    count = (os.path.getsize(path) - header) // SESSION_RECORD.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=SESSION_RECORD)
+    return np.memmap(path, dtype=SESSION_RECORD, mode='r', offset=header, shape=(count,))
+
+
+def parse_event_address(address):
+    """'unix:PATH' (or a path) -> UNIX domain socket, 'HOST:PORT' or 'PORT' -> TCP (default localhost)"""
+    if not address.startswith('unix:'):
+        host, _, port = address.rpartition(':')
+        if port.isdigit():
+            return socket.AF_INET, (host or '127.0.0.1', int(port))
+    if not hasattr(socket, 'AF_UNIX'):
+        raise ValueError("UNIX domain sockets are not available here, use HOST:PORT")
+    return socket.AF_UNIX, address[5:] if address.startswith('unix:') else address
+
+
+def is_loopback_host(host):
+    """Whether a host name or address only reaches this machine"""
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+class EventSubscriber:
+    """One connected client: a bounded queue of batches drained by its own sender thread.
+    
+    When the client reads too slowly the sender blocks in the socket write
+    (its kernel buffer is kept to EVENT_SOCKET_BUFFER) and the queue fills;
+    the oldest batches are then dropped (and counted) so the publishing
+    thread never waits and the client gets recent events when it catches up.
+    """
+    def __init__(self, conn, mask, max_batches=256):
+        self.conn = conn
+        self.mask = mask
+        self.batches = deque(maxlen=max_batches)  # (payload, event count, publish time)
+        self.cond = threading.Condition()
+        self.dropped = 0  # Events lost to the queue limit
+        self.sent = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def put(self, payload, count, published):
+        with self.cond:
+            if len(self.batches) == self.batches.maxlen:
+                self.dropped += self.batches[0][1]
+            self.batches.append((payload, count, published))
+            self.cond.notify()
+    
+    def _run(self):
+        count = 0  # Events of the batch being written
+        try:
+            while True:
+                with self.cond:
+                    self.cond.wait_for(lambda: self.batches or self.closed)
+                    if not self.batches:
+                        return
+                    pending = list(self.batches)
+                    self.batches.clear()
+                    dropped = self.dropped
+                
+                # Everything queued since the last write goes out as one batch
+                count = sum(batch[1] for batch in pending)
+                payload = b''.join(batch[0] for batch in pending)
+                self.conn.sendall(EVENT_BATCH_HEADER.pack(len(payload), dropped, count, pending[0][2])
+                                  + payload)
+                self.sent += count
+                count = 0
+        except OSError:
+            pass
+        finally:
+            # Whatever the client never got counts as dropped, so sent + dropped
+            # covers every event handed to this subscriber
+            with self.cond:
+                self.closed = True
+                self.dropped += count + sum(batch[1] for batch in self.batches)
+                self.batches.clear()
+            self.conn.close()
+    
+    def close(self, timeout=1.0):
+        """Send what is still queued (for up to `timeout` seconds) and disconnect"""
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            try:
+                self.conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # The sender closed it meanwhile
+
+
+class EventServer:
+    """Publishes gesture, cursor and landmark events to local applications.
+    
+    Listens on a UNIX domain socket or localhost TCP (see
+    parse_event_address); other TCP hosts need `allow_remote`, as the stream
+    carries everything the user's hands do. Events are packed once as they
+    are published and each subscriber gets the frame's events as one batch
+    on flush(); slow subscribers lose their oldest batches instead of
+    stalling the vision loop. With no subscribers publishing costs nothing
+    but a check.
+    """
+    def __init__(self, address, max_batches=256, log=None, allow_remote=False):
+        self.address = address
+        self.max_batches = max_batches
+        self.log = log or (lambda message: None)
+        self.family, self.target = parse_event_address(address)
+        if self.family == socket.AF_UNIX:
+            self.remove_stale_socket(self.target)
+        elif not allow_remote and not is_loopback_host(self.target[0]):
+            raise ValueError(f"Event server address {address} is not a loopback address "
+                             f"(use --event-allow-remote to listen on it)")
+        self.sock = socket.socket(self.family, socket.SOCK_STREAM)
+        if self.family != socket.AF_UNIX:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(self.target)
+        self.sock.listen()
+        # The socket file this server owns (close() leaves a newer one alone)
+        self.inode = os.stat(self.target).st_ino if self.family == socket.AF_UNIX else None
+        
+        self.lock = threading.Lock()
+        self.subscribers = []
+        self.wanted = 0      # Event types any subscriber asked for
+        self.pending = []    # (type, packed event) published since the last flush
+        self.published = 0
+        self.thread = threading.Thread(target=self._accept, daemon=True)
+        self.thread.start()
+    
+    @staticmethod
+    def remove_stale_socket(path):
+        """Remove the socket an earlier run left at `path`.
+        
+        A socket that still accepts connections belongs to a running
+        instance, and anything else at `path` is not ours: both are errors.
+        """
+        try:
+            mode = os.stat(path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise ValueError(f"Event server path {path} exists and is not a socket")
+        
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            pass  # Nobody listening: left behind by a run that ended
+        else:
+            raise ValueError(f"Event server path {path} is in use by another running instance")
+        finally:
+            probe.close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+    
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return  # Closed
+            try:
+                conn.settimeout(1.0)
+                try:
+                    mask = conn.recv(1)
+                except socket.timeout:
+                    mask = b''
+                conn.settimeout(None)
+                conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, EVENT_SOCKET_BUFFER)
+                if self.family != socket.AF_UNIX:
+                    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                conn.sendall(EVENT_MAGIC)
+            except OSError:
+                conn.close()
+                continue
+            
+            subscriber = EventSubscriber(conn, mask[0] if mask else ALL_EVENTS, self.max_batches)
+            with self.lock:
+                self.subscribers.append(subscriber)
+                self.wanted |= subscriber.mask
+            self.log(f"Event subscriber connected ({len(self.subscribers)} total)")
+    
+    def publish(self, kind, hand, timestamp, payload=b''):
+        """Queue one event of a HandState for the next flush"""
+        if self.wanted >> kind & 1:
+            source, hand_id = hand.key
+            handedness = HANDEDNESS.index(hand.handedness) if hand.handedness in HANDEDNESS else 0
+            self.pending.append((kind, EVENT_HEADER.pack(kind, source, handedness, hand_id & 0xFF, timestamp)
+                                 + payload))
+    
+    def publish_hand(self, hand, timestamp, points, frame_gesture, gesture, score, x, y):
+        """The landmarks, gesture and filtered cursor of one hand in one frame"""
+        if not self.wanted:
+            return
+        self.publish(EVENT_LANDMARKS, hand, timestamp, np.ascontiguousarray(points, dtype='<f4').tobytes())
+        self.publish(EVENT_GESTURE, hand, timestamp,
+                     EVENT_PAYLOADS[EVENT_GESTURE].pack(GESTURE_CODES.get(frame_gesture, 0),
+                                                        GESTURE_CODES.get(gesture, 0), score))
+        self.publish(EVENT_CURSOR, hand, timestamp, EVENT_PAYLOADS[EVENT_CURSOR].pack(x, y))
+    
+    def flush(self):
+        """Hand the events published since the last flush to every subscriber as one batch"""
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        self.published += len(pending)
+        now = time.time()
+        
+        batches = {}  # Subscribers wanting the same event types share one batch
+        for subscriber in list(self.subscribers):
+            if subscriber.closed:
+                self.remove(subscriber)
+                continue
+            batch = batches.get(subscriber.mask)
+            if batch is None:
+                events = [event for kind, event in pending if subscriber.mask >> kind & 1]
+                batch = batches[subscriber.mask] = (b''.join(events), len(events))
+            if batch[1]:
+                subscriber.put(batch[0], batch[1], now)
+    
+    def remove(self, subscriber):
+        with self.lock:
+            self.subscribers.remove(subscriber)
+            self.wanted = 0
+            for other in self.subscribers:
+                self.wanted |= other.mask
+        self.log(f"Event subscriber disconnected ({subscriber.sent} events sent, "
+                 f"{subscriber.dropped} dropped)")
+    
+    def stats(self):
+        subscribers = list(self.subscribers)
+        return {
+            'published': self.published,
+            'subscribers': len(subscribers),
+            'sent': sum(subscriber.sent for subscriber in subscribers),
+            'dropped': sum(subscriber.dropped for subscriber in subscribers),
+        }
+    
+    def close(self, timeout=1.0):
+        """Stop accepting, send what subscribers still have queued and disconnect them"""
+        self.flush()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        self.thread.join(timeout)
+        for subscriber in list(self.subscribers):
+            subscriber.close(timeout)
+        if self.family == socket.AF_UNIX:
+            try:
+                if os.stat(self.target).st_ino == self.inode:
+                    os.unlink(self.target)
+            except FileNotFoundError:
+                pass
+
+
+class EventClient:
+    """Reads the event stream of an EventServer (`--events ADDRESS` prints it)"""
+    def __init__(self, address, types=EVENT_TYPES):
+        family, target = parse_event_address(address)
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        if family != getattr(socket, 'AF_UNIX', None):
+            # Set before connecting, so the TCP window stays small too
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, EVENT_SOCKET_BUFFER)
+        self.sock.connect(target)
+        self.sock.sendall(bytes([sum(1 << EVENT_TYPES.index(kind) for kind in types)]))
+        self.file = self.sock.makefile('rb')
+        if self.file.read(len(EVENT_MAGIC)) != EVENT_MAGIC:
+            self.close()
+            raise ValueError(f"{address}: not a gesture event stream")
+        self.dropped = 0
+    
+    def read_batch(self):
+        """Next batch as (publish time, [StreamEvent]), or None once the server closes"""
+        header = self.file.read(EVENT_BATCH_HEADER.size)
+        if len(header) < EVENT_BATCH_HEADER.size:
+            return None
+        size, self.dropped, count, published = EVENT_BATCH_HEADER.unpack(header)
+        payload = self.file.read(size)
+        if len(payload) < size:
+            return None  # Cut off by the server closing
+        
+        events = []
+        offset = 0
+        for _ in range(count):
+            kind, source, handedness, hand_id, timestamp = EVENT_HEADER.unpack_from(payload, offset)
+            offset += EVENT_HEADER.size
+            layout = EVENT_PAYLOADS[kind]
+            if kind == EVENT_LANDMARKS:
+                data = np.frombuffer(payload, dtype='<f4', count=63, offset=offset).reshape(21, 3)
+            elif kind == EVENT_GESTURE:
+                frame_gesture, gesture, score = layout.unpack_from(payload, offset)
+                data = (GESTURES[frame_gesture], GESTURES[gesture], score)
+            elif kind == EVENT_CURSOR:
+                data = layout.unpack_from(payload, offset)
+            else:
+                data = None
+            offset += layout.size
+            events.append(StreamEvent(EVENT_TYPES[kind], source, HANDEDNESS[handedness], hand_id,
+                                      timestamp, data))
+        return published, events
+    
+    def __iter__(self):
+        while True:
+            batch = self.read_batch()
+            if batch is None:
+                return
+            yield from batch[1]
+    
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+class HandState:
+    """Gesture, motion, cursor and drag state of one tracked hand.
+    
+    Hands are keyed by (camera source, hand id) and followed from frame to
+    frame by palm position, so no hand votes on, filters or drags with
+    another hand's landmarks and a flickering Left/Right label keeps its state.
+    """
+    def __init__(self, key, gesture_state, cursor_filter, predictor=None, handedness='Unknown'):
+        self.key = key
+        self.handedness = handedness  # Latest label MediaPipe gave the hand
+        self.palm = None              # Palm center in the last frame it was seen
+        self.missed = 0               # Frames of its source since then
+        self.gesture_state = gesture_state
+        self.trajectory = TrajectoryRecognizer()
+        self.predictor = predictor
+        self.set_cursor_filter(cursor_filter)
+        self.last_x = self.last_y = None
+        self.scroll_remainder = 0.0
+        self.is_dragging = False
+        self.drag_start_pos = None
+        self.last_seen = 0.0
+    
+    def set_cursor_filter(self, cursor_filter):
+        """Use a new cursor filter (and its precision variant for pinch mode)"""
+        self.cursor_filter = cursor_filter
+        self.precision_filter = cursor_filter.precision_variant()
+        self.active_filter = cursor_filter
+    
+    def filter_cursor(self, screen_x, screen_y, timestamp, precision=False):
+        """Smooth a raw cursor target, switching filters without a jump"""
+        cursor_filter = self.precision_filter if precision else self.cursor_filter
+        if cursor_filter is not self.active_filter:
+            cursor_filter.reset(self.last_x, self.last_y, timestamp)
+            self.active_filter = cursor_filter
+        
+        smooth_x, smooth_y = cursor_filter(screen_x, screen_y, timestamp)
+        self.last_x, self.last_y = int(smooth_x), int(smooth_y)
+        return self.last_x, self.last_y
+
+
+class ActionArbiter:
+    """Decides which hand drives each output when several hands (or cameras) are tracked.
+    
+    There is one cursor and one keyboard, so each channel ('cursor', 'click',
+    'scroll', 'hotkey') belongs to one hand at a time: the hand that last
+    used it keeps it until it has left it alone for `handoff` seconds or is
+    lost. A hand holding the mouse button keeps the cursor until it lets go.
+    The same hand seen by two cameras therefore acts once, and one hand can
+    steer the cursor while the other clicks, scrolls or swipes.
+    """
+    def __init__(self, handoff=0.5):
+        self.handoff = handoff
+        self.owners = {}    # channel -> [hand key, last used, held]
+        self.cursor = None  # Last cursor position, where other hands' clicks land
+        self.conflicts = Counter()  # Requests refused, per channel
+    
+    def owned_by_other(self, channel, key, timestamp):
+        owner = self.owners.get(channel)
+        return (owner is not None and owner[0] != key and
+                (owner[2] or timestamp - owner[1] < self.handoff))
+    
+    def request(self, key, channel, timestamp, hold=False):
+        """Whether hand `key` may act on `channel` now; `hold` keeps it until released"""
+        if self.owned_by_other(channel, key, timestamp):
+            self.conflicts[channel] += 1
+            return False
+        
+        owner = self.owners.get(channel)
+        if owner is None or owner[0] != key:
+            owner = self.owners[channel] = [key, timestamp, False]
+        owner[1] = timestamp
+        owner[2] = owner[2] or hold
+        return True
+    
+    def target(self, key, position, timestamp):
+        """Where a click by hand `key` lands: at the cursor while another hand steers it"""
+        if self.cursor is not None and self.owned_by_other('cursor', key, timestamp):
+            return self.cursor
+        return position
+    
+    def release(self, key, channel=None):
+        """Give up one channel, or every channel of a hand that was lost"""
+        for name, owner in list(self.owners.items()):
+            if owner[0] == key and channel in (None, name):
+                del self.owners[name]
+
+
+class HandGestureCursorController:
+    def __init__(self, headless=False, action_sink=None, classifier=None, async_actions=True):
+        # Headless mode runs without Tk window, camera preview or real mouse events
+        self.headless = headless
+        
+        # GUI update channel: worker threads publish a state snapshot and queue
+        # log lines, the Tk thread draws both at a fixed rate (headless never draws)
+        self.gui_lock = threading.Lock()
+        self.gui_state = {'hands': 0, 'gesture': 'NONE', 'fingers': [0, 0, 0, 0, 0],
+                          'camera': 'off', 'model': 'loading', 'camera_error': None}
+        self.drawn_state = {}
+        self.log_buffer = deque(maxlen=200)
+        self.max_log_lines = 100
+        self.gui_refresh_ms = 100
+        
+        # MediaPipe detector, created when the camera starts (headless replays
+        # of landmark data never need it)
+        self.detector = None
+        self.detector_options = {'roi_enabled': False, 'inference_scale': 1.0}
+        
+        # Camera setup (opened in the background, once the hand model is warm);
+        # more than one source runs each in its own worker processes
+        self.camera_sources = [0]
         self.cap = None
+        self.camera_starting = False
+        self.model_ready = threading.Event()
+        self.model_error = None
         self.is_tracking = False
         self.is_camera_on = False
         
-        # Cursor control variables
-        self.screen_width, self.screen_height = pyautogui.size()
+        # Capture stage (camera reads run on their own thread), or with
+        # use_processes capture and inference run in worker processes
+        self.frame_buffer = None
+        self.capture_thread = None
+        self.video_thread = None
+        self.use_processes = False
+        self.pipeline = None
+        self.frame_source = None  # Whichever of the two counts captured/dropped frames
+        self.drop_report_interval = 5.0  # Seconds between dropped-frame reports
+        
+        # Action sink (real mouse events unless a stub is supplied), injected
+        # from a dispatcher thread so slow input calls don't stall the video loop;
+        # the real one loads pyautogui in the background (load_actions)
+        if action_sink is None:
+            action_sink = RecordingActionSink() if headless else PyAutoGUIActionSink()
+        self.action_sink = action_sink
+        self.motion_latency = MotionLatency()
+        self.dispatcher = None
+        if async_actions:
+            action_sink = self.dispatcher = ActionDispatcher(action_sink, on_error=self.log_action,
+                                                             on_move=self.motion_latency.add)
+        self.actions = action_sink
+        self.last_injected = 0
+        
+        # Session recording (--record), taps the actions issued for each frame
+        self.recorder = None
+        self.frame_count = 0  # Frames handled, of all sources (numbers the recorded frames)
+        
+        # Local event stream for other applications (--event-server)
+        self.event_server = None
+        
+        # Cursor control variables (the GUI takes the screen size from Tk instead,
+        # so the window does not wait for the input backend)
+        if headless:
+            self.screen_width, self.screen_height = self.actions.size()
         self.camera_width, self.camera_height = 640, 480
+        self.requested_resolution = None  # Applied by the capture thread
         
-        # Gesture recognition variables
-        self.last_gesture = 'none'
-        self.gesture_start_time = 0
-        self.gesture_hold_time = 0.3  # Hold gesture for 300ms before action
+        # Low-power idle mode: after idle_after seconds without a hand, sample
+        # frames at idle_fps and low resolution until the motion gate fires
+        self.idle_after = 10.0  # Seconds, 0 disables
+        self.idle_fps = 5.0
+        self.idle_resolution = (320, 240)
+        self.idle = False
+        self.idle_since = 0.0
+        self.idle_cpu_start = 0.0
+        self.last_hand_time = 0.0
+        self.motion_gate = MotionGate()
+        self.wake_capture_time = None
+        self.wake_latency = RollingHistogram(100)
         
-        # Smoothing variables
-        self.smoothing_factor = 0.7
-        self.last_x, self.last_y = self.screen_width // 2, self.screen_height // 2
+        # Quality level (--quality), optionally adjusted by a governor (--adaptive-quality)
+        self.quality_level = 1
+        self.governor = None
         
-        # Dragging state
-        self.is_dragging = False
-        self.drag_start_pos = None
+        # Gesture recognition variables; every tracked hand gets its own vote,
+        # trajectory, cursor filters and drag state (HandState), and one
+        # arbitration step decides which hand's actions reach the sink
+        self.classifier = classifier or MaskTableClassifier()
+        self.gesture_options = {}  # GestureStateMachine settings for new hands
+        self.hand_states = {}      # (source, hand id) -> HandState
+        self.next_hand_id = 0
+        self.hand_match_distance = 0.3  # Palm travel between frames still matched (frame widths)
+        self.hand_label_cost = 0.1      # Added to the distance when the Left/Right label differs
+        self.hand_grace = 3             # Frames a hand may go undetected before it is dropped
+        self.hands_in_view = {}    # Source -> hands in its last frame
+        self.arbiter = ActionArbiter()
+        
+        # Motion gestures made with these poses: swipes switch pages, circling scrolls
+        self.motion_poses = ('open_hand',)
+        self.scroll_per_radian = 2.0  # Scroll clicks per radian of circling
+        
+        # Smoothing (pinch precision mode uses a heavier variant); each hand
+        # filters with its own copy
+        self.set_cursor_filter(OneEuroFilter())
+        
+        # Optional extrapolation by the measured motion-to-cursor latency (--predict)
+        self.predictor = None
         
         # Click prevention (avoid rapid clicking)
         self.last_click_time = 0
         self.click_cooldown = 0.5
         
+        # Preview window: own rate and resolution, or off entirely in production
+        self.preview_enabled = True
+        self.preview_fps = 15.0
+        self.preview_scale = 1.0
+        self.last_preview_time = {}  # Per source
+        self.static_overlay = StaticOverlay()
+        
+        # Per-stage timing (no-op unless metrics are enabled)
+        self.profiler = NULL_PROFILER
+        self.metrics_overlay = False
+        
         # Debug mode for gesture recognition
         self.debug_mode = False
         
-        # PyAutoGUI settings
-        pyautogui.FAILSAFE = True  # Move mouse to corner to stop
-        pyautogui.PAUSE = 0.01     # Small pause between actions
-        
         # Setup GUI
-        self.setup_gui()
+        if not headless:
+            self.setup_gui()
+    
+    def set_cursor_filter(self, cursor_filter):
+        """Use a new cursor filter (a copy per hand, plus its precision variant for pinch mode)"""
+        self.cursor_filter = cursor_filter
+        for hand in self.hand_states.values():
+            hand.set_cursor_filter(copy.deepcopy(cursor_filter))
+    
+    def hand_state(self, key, handedness='Unknown'):
+        """State of the hand with this key, created on first sight"""
+        hand = self.hand_states.get(key)
+        if hand is None:
+            hand = self.hand_states[key] = HandState(
+                key, GestureStateMachine(**self.gesture_options), copy.deepcopy(self.cursor_filter),
+                copy.deepcopy(self.predictor), handedness)
+        return hand
+    
+    def track_hands(self, source, detections):
+        """HandState of each detection from one source, matched to its hands by palm position.
+        
+        With more than one hand per camera the label breaks near ties, with
+        one it is ignored (MediaPipe flips it now and then). Hands unmatched
+        for more than `hand_grace` frames of their source are dropped.
+        """
+        hands = [hand for key, hand in self.hand_states.items() if key[0] == source]
+        use_label = self.detector_options.get('max_num_hands', 1) > 1
+        pairs = []
+        for i, detection in enumerate(detections):
+            palm = detection.points[9, :2]
+            for j, hand in enumerate(hands):
+                distance = 0.0 if hand.palm is None else float(np.hypot(*(palm - hand.palm)))
+                if use_label and hand.handedness != detection.handedness:
+                    distance += self.hand_label_cost
+                pairs.append((distance, i, j))
+        
+        # Closest pairs first; a detection too far from every hand is a new hand
+        matched = [None] * len(detections)
+        taken = set()
+        for distance, i, j in sorted(pairs):
+            if matched[i] is None and j not in taken and (not use_label or distance < self.hand_match_distance):
+                matched[i] = hands[j]
+                taken.add(j)
+        
+        for i, detection in enumerate(detections):
+            hand = matched[i]
+            if hand is None:
+                hand = matched[i] = self.hand_state((source, self.next_hand_id), detection.handedness)
+                self.next_hand_id += 1
+            hand.handedness = detection.handedness
+            hand.palm = detection.points[9, :2].copy()
+            hand.missed = 0
+        
+        for j, hand in enumerate(hands):
+            if j not in taken:
+                hand.missed += 1
+                if hand.missed > self.hand_grace:
+                    self.drop_hand(self.hand_states.pop(hand.key))
+        return matched
+    
+    def drop_hand(self, hand):
+        """Release a lost hand's mouse button and the output channels it held"""
+        if hand.is_dragging:
+            self.actions.mouse_up()
+            hand.is_dragging = False
+            self.log_action("Stopped dragging (hand lost)")
+        self.arbiter.release(hand.key)
+        if self.event_server is not None:
+            self.event_server.publish(EVENT_LOST, hand, hand.last_seen)
+    
+    def predict_cursor(self, hand, x, y, timestamp):
+        """Extrapolate the filtered cursor by the current latency estimate, kept on screen"""
+        x, y = hand.predictor(x, y, timestamp, self.motion_latency.estimate)
+        return (int(min(max(x, 0), self.screen_width - 1)),
+                int(min(max(y, 0), self.screen_height - 1)))
+    
+    def move_cursor(self, x, y, captured_at):
+        """Move the cursor, measuring latency from the frame's capture time"""
+        self.arbiter.cursor = (x, y)
+        self.actions.move_to(x, y, captured_at)
+        if self.dispatcher is None:
+            # Injected synchronously; the dispatcher measures its own moves
+            self.motion_latency.add(captured_at)
+    
+    def init_hands(self):
+        """Create the MediaPipe hand tracking graph"""
+        self.detector = HandDetector(**self.detector_options)
+        self.detector.profiler = self.profiler
+    
+    def apply_quality(self, level, reason=None):
+        """Switch resolution, landmark model, inference scale and frame skipping"""
+        self.quality_level = level
+        quality = QUALITY_LEVELS[level]
+        self.configure_detector(model_complexity=quality.model_complexity,
+                                inference_scale=quality.inference_scale,
+                                infer_every=quality.infer_every)
+        if (self.camera_width, self.camera_height) != quality.resolution:
+            self.camera_width, self.camera_height = quality.resolution
+            if self.cap is not None:
+                self.requested_resolution = quality.resolution
         
+        width, height = quality.resolution
+        self.log_action(f"Quality: {quality.name} ({width}x{height}, model {quality.model_complexity}, "
+                        f"scale {quality.inference_scale:g}, every {quality.infer_every} frame(s))"
+                        + (f" - {reason}" if reason else ""))
+    
+    def configure_detector(self, **options):
+        """Update detector options (applied to a running detector too)"""
+        self.detector_options.update(options)
+        if self.detector is not None:
+            for name, value in options.items():
+                setattr(self.detector, name, value)
+    
     def setup_gui(self):
         """Create the control GUI"""
         self.root = tk.Tk()
+        self.screen_width, self.screen_height = self.root.winfo_screenwidth(), self.root.winfo_screenheight()
+        if getattr(self.action_sink, 'screen_size', ()) is None:
+            self.action_sink.screen_size = (self.screen_width, self.screen_height)
         self.root.title("Hand Gesture Cursor Controller")
         self.root.geometry("500x700")
         self.root.resizable(False, False)
@@ -178,18 +2935,74 @@ class HandGestureCursorController:
         
         # Close protocol
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        
+        # Start the fixed-rate GUI refresh
+        self.root.after(self.gui_refresh_ms, self.refresh_gui)
+    
+    def draw_camera_state(self, state):
+        """Camera label and buttons for the camera / hand model startup state"""
+        camera, model = state['camera'], state['model']
+        model_text = {'loading': "loading hand model...", 'warming': "warming up hand model...",
+                      'failed': "hand model failed"}.get(model)
+        
+        if camera == 'on':
+            self.camera_status_label.config(text="📹 Camera: ON", foreground='#00ff00')
+            self.camera_button.config(text="Stop Camera", bg='#ff4040', state='normal')
+            self.tracking_button.config(state='normal')
+        elif camera == 'starting':
+            self.camera_status_label.config(text="📹 Camera: starting" + (f" ({model_text})" if model_text else "..."),
+                                            foreground='#ffc040')
+            self.camera_button.config(text="Starting...", state='disabled')
+        else:
+            self.camera_status_label.config(text="📹 Camera: OFF" + (f" - {model_text}" if model_text else ""),
+                                            foreground='#ff4040')
+            self.camera_button.config(text="Start Camera", bg='#ff4080', state='normal')
+            self.tracking_button.config(text="Start Tracking", bg='#4080ff', state='disabled')
+            if camera == 'error':
+                self.publish_state(camera='off')
+                messagebox.showerror("Camera Error", f"Failed to start camera: {state['camera_error']}")
+    
+    def publish_state(self, **fields):
+        """Update the GUI state snapshot (safe to call from any thread)"""
+        with self.gui_lock:
+            self.gui_state.update(fields)
+    
+    def refresh_gui(self):
+        """Draw the latest state snapshot and pending log lines (Tk thread only)"""
+        with self.gui_lock:
+            state = dict(self.gui_state)
+            lines = list(self.log_buffer)
+            self.log_buffer.clear()
+        
+        # Only touch widgets whose value changed
+        if state['hands'] != self.drawn_state.get('hands'):
+            self.hand_status_label.config(text=f"✋ Hands: {state['hands']}")
+        if state['gesture'] != self.drawn_state.get('gesture'):
+            self.current_gesture_label.config(text=state['gesture'])
+        if self.debug_mode and state['fingers'] != self.drawn_state.get('fingers'):
+            self.finger_status_label.config(text=str(state['fingers']))
+        if (state['camera'], state['model']) != (self.drawn_state.get('camera'), self.drawn_state.get('model')):
+            self.draw_camera_state(state)
+        self.drawn_state = state
+        
+        if lines:
+            self.log_text.insert('end', ''.join(lines))
+            self.log_text.see('end')
+            
+            # Keep log reasonable size
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > self.max_log_lines:
+                self.log_text.delete('1.0', f'{line_count - self.max_log_lines + 1}.0')
+        
+        self.root.after(self.gui_refresh_ms, self.refresh_gui)
     
     def log_action(self, message):
-        """Add message to action log"""
+        """Add message to action log (flushed to the GUI in batches)"""
         timestamp = datetime.now().strftime("%H:%M:%S")
         log_entry = f"[{timestamp}] {message}\n"
         
-        self.log_text.insert('end', log_entry)
-        self.log_text.see('end')
-        
-        # Keep log reasonable size
-        if self.log_text.index('end-1c').split('.')[0] > '100':
-            self.log_text.delete('1.0', '20.0')
+        with self.gui_lock:
+            self.log_buffer.append(log_entry)
     
     def toggle_camera(self):
         """Start or stop the camera"""
@@ -198,48 +3011,167 @@ class HandGestureCursorController:
         else:
             self.stop_camera()
     
+    def load_actions(self):
+        """Import the input backend (pyautogui), in the background at startup"""
+        load = getattr(self.action_sink, 'load', None)
+        if load is None:
+            return
+        try:
+            start = time.perf_counter()
+            load()
+            self.log_action(f"Mouse control ready ({1000 * (time.perf_counter() - start):.0f} ms)")
+        except RuntimeError as e:
+            self.log_action(f"Mouse control error: {str(e)}")
+    
+    def warm_up(self):
+        """Load MediaPipe and run its graph once, in the background at startup"""
+        try:
+            start = time.perf_counter()
+            mp.load()
+            self.publish_state(model='warming')
+            if self.detector is None:
+                self.init_hands()
+            loaded = time.perf_counter()
+            self.detector.warm_up(self.camera_width, self.camera_height)
+            self.publish_state(model='ready')
+            self.log_action(f"Hand model ready (load {1000 * (loaded - start):.0f} ms, "
+                            f"warm-up {1000 * (time.perf_counter() - loaded):.0f} ms)")
+        except Exception as e:
+            self.model_error = e
+            self.publish_state(model='failed')
+            self.log_action(f"Hand model error: {str(e)}")
+        finally:
+            self.model_ready.set()
+    
     def start_camera(self):
-        """Start the camera and video processing"""
+        """Start the camera and video processing without blocking the UI"""
+        if self.camera_starting:
+            return
+        self.camera_starting = True
+        self.publish_state(camera='starting')
+        target = self.start_pipeline if self.use_processes else self.open_camera
+        threading.Thread(target=target, daemon=True).start()
+    
+    def camera_failed(self, error):
+        self.camera_starting = False
+        self.publish_state(camera='error', camera_error=str(error))
+        self.log_action(f"Camera error: {str(error)}")
+    
+    def open_camera(self):
+        """Open the camera (while the model warms up) and start the capture and video threads"""
         try:
-            self.cap = cv2.VideoCapture(0)
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.camera_width)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.camera_height)
+            cap = cv2.VideoCapture(self.camera_sources[0])
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.camera_width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.camera_height)
+            # Keep the driver queue short, the capture thread drains it anyway
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
-            if not self.cap.isOpened():
+            if not cap.isOpened():
                 raise Exception("Could not open camera")
             
-            self.is_camera_on = True
-            self.camera_button.config(text="Stop Camera", bg='#ff4040')
-            self.tracking_button.config(state='normal')
-            self.camera_status_label.config(text="📹 Camera: ON", foreground='#00ff00')
-            
-            # Start video processing thread
-            self.video_thread = threading.Thread(target=self.process_video, daemon=True)
-            self.video_thread.start()
-            
-            self.log_action("Camera started successfully")
-            
+            self.model_ready.wait()
+            if self.model_error is not None:
+                cap.release()
+                raise Exception(f"hand model unavailable: {self.model_error}")
+        except Exception as e:
+            self.camera_failed(e)
+            return
+        
+        if not self.camera_starting:
+            # Stopped (or closing) while the camera was opening
+            cap.release()
+            return
+        
+        self.cap = cap
+        self.is_camera_on = True
+        self.idle = False
+        self.last_hand_time = time.time()
+        self.frame_buffer = LatestFrameBuffer()
+        self.frame_source = self.frame_buffer
+        self.camera_starting = False
+        self.publish_state(camera='on')
+        
+        # Start capture and video processing threads
+        self.capture_thread = threading.Thread(target=self.capture_frames, daemon=True)
+        self.capture_thread.start()
+        self.video_thread = threading.Thread(target=self.process_video, daemon=True)
+        self.video_thread.start()
+        
+        self.log_action("Camera started successfully")
+    
+    def start_pipeline(self):
+        """Start capture and inference worker processes"""
+        try:
+            self.pipeline = MultiProcessPipeline(self.camera_sources, (self.camera_width, self.camera_height),
+                                                 self.detector_options)
+            self.pipeline.start()
         except Exception as e:
-            messagebox.showerror("Camera Error", f"Failed to start camera: {str(e)}")
-            self.log_action(f"Camera error: {str(e)}")
+            if self.pipeline:
+                self.pipeline.stop()
+                self.pipeline = None
+            self.camera_failed(e)
+            return
+        
+        self.is_camera_on = True
+        self.frame_source = self.pipeline
+        self.camera_starting = False
+        self.publish_state(camera='on')
+        
+        self.video_thread = threading.Thread(target=self.process_pipeline_results, daemon=True)
+        self.video_thread.start()
+        
+        if len(self.camera_sources) > 1:
+            self.log_action(f"{len(self.camera_sources)} cameras started (capture and inference in "
+                            f"worker processes per camera)")
+        else:
+            self.log_action("Camera started (capture and inference in worker processes)")
+        if self.governor is not None:
+            self.log_action("Adaptive quality only runs with in-process capture; keeping the current level")
+        if self.idle_after:
+            self.log_action("Idle mode only runs with in-process capture")
     
     def stop_camera(self):
         """Stop the camera"""
         self.is_camera_on = False
         self.is_tracking = False
+        self.camera_starting = False
+        
+        # Let the capture thread finish its current read before releasing
+        if self.capture_thread and self.capture_thread.is_alive():
+            self.capture_thread.join(timeout=1.0)
+        self.capture_thread = None
+        
+        # The video thread owns the hands, arbiter and preview slots: wait for it
+        # to leave its loop before they are released or the pipeline unlinks its rings
+        if self.frame_buffer:
+            self.frame_buffer.close()
+        if (self.video_thread and self.video_thread.is_alive()
+                and self.video_thread is not threading.current_thread()):
+            self.video_thread.join(timeout=2.0)
+            if self.video_thread.is_alive():
+                self.log_action("Video thread did not stop in time")
+        self.video_thread = None
         
         if self.cap:
             self.cap.release()
+            self.cap = None
+        
+        if self.pipeline:
+            self.pipeline.stop()
+            self.pipeline = None
         
         cv2.destroyAllWindows()
         
-        self.camera_button.config(text="Start Camera", bg='#ff4080')
-        self.tracking_button.config(text="Start Tracking", bg='#4080ff', state='disabled')
-        self.camera_status_label.config(text="📹 Camera: OFF", foreground='#ff4040')
-        self.hand_status_label.config(text="✋ Hands: 0")
-        self.current_gesture_label.config(text="NONE")
+        self.handle_no_hands()
+        self.hands_in_view.clear()
+        self.publish_state(camera='off', hands=0, gesture="NONE")
         
-        self.log_action("Camera stopped")
+        if self.frame_source:
+            self.log_action(f"Camera stopped ({self.frame_source.dropped_frames} of "
+                            f"{self.frame_source.captured_frames} frames dropped)")
+            self.frame_source = None
+        else:
+            self.log_action("Camera stopped")
     
     def toggle_tracking(self):
         """Start or stop gesture tracking"""
@@ -250,265 +3182,1438 @@ class HandGestureCursorController:
             self.log_action("Gesture tracking started")
         else:
             self.tracking_button.config(text="Start Tracking", bg='#4080ff')
-            self.current_gesture_label.config(text="NONE")
+            self.publish_state(gesture="NONE")
             self.log_action("Gesture tracking stopped")
     
     def get_finger_states(self, landmarks):
         """Determine which fingers are extended"""
-        # Get landmark positions
-        tips = [4, 8, 12, 16, 20]  # Thumb, Index, Middle, Ring, Pinky tips
-        pips = [3, 6, 10, 14, 18]  # PIP joints (middle knuckles)
-        mcps = [2, 5, 9, 13, 17]   # MCP joints (base knuckles)
-        
-        # Array to store finger states (1 = extended, 0 = folded)
-        fingers_up = [0, 0, 0, 0, 0]
-        
-        # Special case for thumb (check horizontal position)
-        # Thumb is extended if tip is to the right/left of the IP joint (depending on hand)
-        if landmarks[tips[0]].x < landmarks[pips[0]].x:
-            fingers_up[0] = 1
-        
-        # For other fingers, check if fingertip is above PIP joint
-        for i in range(1, 5):
-            # Check vertical position (y-coordinate decreases going up)
-            if landmarks[tips[i]].y < landmarks[pips[i]].y:
-                fingers_up[i] = 1
-        
-        return fingers_up
+        return finger_states(landmarks_to_array(landmarks)).tolist()
     
     def recognize_gesture(self, landmarks):
-        """Recognize hand gesture from landmarks"""
-        # Get finger states (extended or not)
-        fingers_up = self.get_finger_states(landmarks)
+        """Recognize hand gesture from a (21, 3) landmark array"""
+        points = landmarks_to_array(landmarks)
         
         # Update finger status display if in debug mode
         if self.debug_mode:
-            self.finger_status_label.config(text=str(fingers_up))
-        
-        # Count extended fingers
-        total_fingers = sum(fingers_up)
-        
-        # Calculate distance between index and thumb tips for pinch detection
-        thumb_tip = landmarks[4]
-        index_tip = landmarks[8]
-        pinch_distance = math.sqrt(
-            (thumb_tip.x - index_tip.x)**2 + 
-            (thumb_tip.y - index_tip.y)**2
-        )
-        
-        # Gesture recognition logic
-        if fingers_up == [0, 1, 0, 0, 0]:  # Only index
-            return 'point'
-        elif fingers_up == [0, 1, 1, 0, 0]:  # Index and middle (peace)
-            return 'peace'
-        elif fingers_up == [1, 1, 1, 1, 1]:  # All fingers
-            return 'open_hand'
-        elif fingers_up == [0, 0, 0, 0, 0]:  # Fist
-            return 'fist'
-        elif fingers_up == [1, 0, 0, 0, 0]:  # Only thumb
-            # Check if thumb is up or down
-            if landmarks[4].y < landmarks[9].y:  # Compare thumb tip to middle finger MCP
-                return 'thumbs_up'
-            else:
-                return 'thumbs_down'
-        elif pinch_distance < 0.05:  # Pinch gesture (thumb and index close together)
-            return 'pinch'
+            self.publish_state(fingers=finger_states(points).tolist())
         
-        return 'unknown'
+        return self.classifier.classify(points)
     
-    def handle_gesture(self, gesture, landmarks):
+    def handle_gesture(self, gesture, landmarks, timestamp=None, confidence=1.0, captured_at=None,
+                       hand=None):
         """Handle recognized gesture and perform corresponding action"""
-        current_time = time.time()
-        
-        # Update gesture display
-        gesture_display = gesture.replace('_', ' ').upper()
-        self.current_gesture_label.config(text=gesture_display)
+        # Replays pass the recorded frame time so vote timing matches the recording,
+        # and the wall-clock time the frame entered the pipeline as `captured_at`
+        current_time = time.time() if timestamp is None else timestamp
+        if captured_at is None:
+            captured_at = current_time
+        if hand is None:
+            hand = self.hand_state((0, 0))
         
-        # Check if gesture changed
-        if gesture != self.last_gesture:
-            self.last_gesture = gesture
-            self.gesture_start_time = current_time
-            return
+        # Confirm the gesture over the recent window, weighted by detection confidence
+        gesture_state = hand.gesture_state
+        frame_gesture, gesture = gesture, gesture_state.update(gesture, current_time, confidence)
         
-        # Check if gesture has been held long enough
-        if current_time - self.gesture_start_time < self.gesture_hold_time:
-            return
+        # Update gesture display
+        if gesture_state.changed:
+            self.publish_state(gesture=gesture.replace('_', ' ').upper())
         
         # Get index finger tip for cursor positioning
-        index_tip = landmarks[8]
+        index_x, index_y = float(landmarks[8, 0]), float(landmarks[8, 1])
         
         # Convert hand coordinates to screen coordinates (mirror X for natural movement)
-        screen_x = int((1 - index_tip.x) * self.screen_width)
-        screen_y = int(index_tip.y * self.screen_height)
+        screen_x = (1 - index_x) * self.screen_width
+        screen_y = index_y * self.screen_height
+        
+        # Filter every frame so the filter sees an evenly sampled trajectory,
+        # pinch switches to the heavier precision filter
+        smooth_x, smooth_y = hand.filter_cursor(screen_x, screen_y, current_time,
+                                                precision=gesture == 'pinch')
+        if hand.predictor is not None:
+            smooth_x, smooth_y = self.predict_cursor(hand, smooth_x, smooth_y, current_time)
+        hand.last_seen = current_time
         
-        # Apply smoothing
-        smooth_x = int(self.last_x * self.smoothing_factor + screen_x * (1 - self.smoothing_factor))
-        smooth_y = int(self.last_y * self.smoothing_factor + screen_y * (1 - self.smoothing_factor))
+        # Stream this hand's landmarks, gesture and filtered cursor to subscribers
+        if self.event_server is not None:
+            self.event_server.publish_hand(hand, current_time, landmarks, frame_gesture, gesture,
+                                           confidence, smooth_x, smooth_y)
         
-        self.last_x, self.last_y = smooth_x, smooth_y
+        # Motion gestures replace the pose's own action; that action (e.g. the
+        # open hand's right click) waits for the palm to hold still so that
+        # starting a swipe doesn't trigger it. Frames already showing another
+        # pose are left out of the trajectory.
+        if gesture in self.motion_poses:
+            if frame_gesture == gesture and self.handle_motion(hand, landmarks, current_time):
+                gesture_state.last_fired = current_time
+                return
+            if not hand.trajectory.still(current_time):
+                return
+        elif gesture_state.changed:
+            hand.trajectory.reset()
         
-        # Handle different gestures
+        # Every-frame, once-on-entry or repeating, per GestureStateMachine.repeat
+        if not gesture_state.due(current_time):
+            return
+        
+        # Handle different gestures; the arbiter lets one hand at a time use each output
+        arbiter = self.arbiter
         try:
             if gesture == 'point':
-                pyautogui.moveTo(smooth_x, smooth_y)
-                if self.is_dragging:
-                    # Continue dragging
-                    pass
+                if arbiter.request(hand.key, 'cursor', current_time):
+                    self.move_cursor(smooth_x, smooth_y, captured_at)
                     
             elif gesture == 'peace':
-                # Left click with cooldown
-                if current_time - self.last_click_time > self.click_cooldown:
-                    self.log_action(f"Left click attempt at ({smooth_x}, {smooth_y})")
-                    pyautogui.click(smooth_x, smooth_y)
+                # Left click with cooldown (at the cursor if another hand is steering it)
+                if (current_time - self.last_click_time > self.click_cooldown and
+                        arbiter.request(hand.key, 'click', current_time)):
+                    x, y = arbiter.target(hand.key, (smooth_x, smooth_y), current_time)
+                    self.log_action(f"Left click attempt at ({x}, {y})")
+                    self.actions.click(x, y)
                     self.last_click_time = current_time
                     
             elif gesture == 'open_hand':
                 # Right click with cooldown
-                if current_time - self.last_click_time > self.click_cooldown:
-                    self.log_action(f"Right click attempt at ({smooth_x}, {smooth_y})")
-                    pyautogui.rightClick(smooth_x, smooth_y)
+                if (current_time - self.last_click_time > self.click_cooldown and
+                        arbiter.request(hand.key, 'click', current_time)):
+                    x, y = arbiter.target(hand.key, (smooth_x, smooth_y), current_time)
+                    self.log_action(f"Right click attempt at ({x}, {y})")
+                    self.actions.right_click(x, y)
                     self.last_click_time = current_time
                     
             elif gesture == 'thumbs_up':
                 # Scroll up
-                pyautogui.scroll(3)
-                self.log_action("Scrolled up")
-                self.gesture_start_time = current_time  # Reset to prevent rapid scrolling
+                if arbiter.request(hand.key, 'scroll', current_time):
+                    self.actions.scroll(3)
+                    self.log_action("Scrolled up")
                 
             elif gesture == 'thumbs_down':
                 # Scroll down
-                pyautogui.scroll(-3)
-                self.log_action("Scrolled down")
-                self.gesture_start_time = current_time  # Reset to prevent rapid scrolling
+                if arbiter.request(hand.key, 'scroll', current_time):
+                    self.actions.scroll(-3)
+                    self.log_action("Scrolled down")
                 
             elif gesture == 'fist':
-                # Start/continue dragging
-                if not self.is_dragging:
-                    pyautogui.mouseDown(smooth_x, smooth_y)
-                    self.is_dragging = True
-                    self.drag_start_pos = (smooth_x, smooth_y)
-                    self.log_action(f"Started dragging from ({smooth_x}, {smooth_y})")
-                else:
-                    pyautogui.moveTo(smooth_x, smooth_y)
+                # Start/continue dragging; the cursor stays with this hand until it lets go
+                if not hand.is_dragging:
+                    if arbiter.request(hand.key, 'cursor', current_time, hold=True):
+                        self.actions.mouse_down(smooth_x, smooth_y)
+                        hand.is_dragging = True
+                        hand.drag_start_pos = (smooth_x, smooth_y)
+                        self.log_action(f"Started dragging from ({smooth_x}, {smooth_y})")
+                elif arbiter.request(hand.key, 'cursor', current_time):
+                    self.move_cursor(smooth_x, smooth_y, captured_at)
                     
             elif gesture == 'pinch':
-                # Precision mode - slower movement
-                precision_x = int(self.last_x * 0.9 + screen_x * 0.1)
-                precision_y = int(self.last_y * 0.9 + screen_y * 0.1)
-                pyautogui.moveTo(precision_x, precision_y)
-                self.last_x, self.last_y = precision_x, precision_y
+                # Precision mode - heavier filtering, slower movement
+                if arbiter.request(hand.key, 'cursor', current_time):
+                    self.move_cursor(smooth_x, smooth_y, captured_at)
                 
             else:
                 # Stop dragging for unknown gestures
-                if self.is_dragging:
-                    pyautogui.mouseUp()
-                    self.is_dragging = False
+                if hand.is_dragging:
+                    self.actions.mouse_up()
+                    hand.is_dragging = False
+                    arbiter.release(hand.key, 'cursor')
                     self.log_action("Stopped dragging")
                     
         except Exception as e:
             self.log_action(f"Error performing action: {str(e)}")
     
-    def process_video(self):
-        """Main video processing loop"""
+    def handle_motion(self, hand, landmarks, timestamp):
+        """Track the palm trajectory; returns True if it made a swipe or scroll step"""
+        event = hand.trajectory.update(landmarks, timestamp)
+        if event is None:
+            return False
+        
+        name, amount = event
+        try:
+            if name in SWIPE_HOTKEYS:
+                if self.arbiter.request(hand.key, 'hotkey', timestamp):
+                    self.actions.hotkey(*SWIPE_HOTKEYS[name])
+                    self.log_action(f"{name.replace('_', ' ').capitalize()} "
+                                    f"({'+'.join(SWIPE_HOTKEYS[name])})")
+            elif self.arbiter.request(hand.key, 'scroll', timestamp):
+                # Clockwise scrolls down; fractions carry over for smooth scrolling
+                hand.scroll_remainder -= amount * self.scroll_per_radian
+                clicks = int(hand.scroll_remainder)
+                if clicks:
+                    self.actions.scroll(clicks)
+                    hand.scroll_remainder -= clicks
+        except Exception as e:
+            self.log_action(f"Error performing action: {str(e)}")
+        return True
+    
+    def handle_no_hands(self, source=None):
+        """Drop every hand (of one source, or all) now, releasing any held mouse button"""
+        # Hands start filtering and voting afresh when they come back
+        for key in [key for key in self.hand_states if source is None or key[0] == source]:
+            self.drop_hand(self.hand_states.pop(key))
+    
+    def detect_hands(self, frame):
+        """Detect hands in a raw camera frame (landmarks come back mirrored)"""
+        return self.detector.detect_hands(frame)
+    
+    def capture_frames(self):
+        """Capture loop - keeps only the newest camera frame in the buffer"""
+        profiler = self.profiler
+        next_idle_frame = 0.0
         while self.is_camera_on:
+            # Idle: keep the driver buffer fresh with grab() (no decode) and
+            # only decode a frame at the idle rate
+            if self.idle:
+                now = time.perf_counter()
+                if now < next_idle_frame:
+                    if not self.cap.grab():
+                        break
+                    continue
+                next_idle_frame = now + 1.0 / self.idle_fps
+            
+            if self.requested_resolution is not None:
+                width, height = self.requested_resolution
+                self.requested_resolution = None
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+                self.log_action(f"Camera resolution {int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x"
+                                f"{int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))}")
+            
+            start = time.perf_counter()
             ret, frame = self.cap.read()
+            capture_time = time.time()
             if not ret:
                 break
+            profiler.record('capture', time.perf_counter() - start)
+            self.frame_buffer.put(frame, capture_time)
+        
+        self.frame_buffer.close()
+    
+    def enter_idle(self, capture_time):
+        """Drop to the idle frame rate and resolution until motion appears"""
+        self.idle = True
+        self.idle_since = capture_time
+        self.idle_cpu_start = time.process_time()
+        self.motion_gate.reset()
+        self.handle_no_hands()
+        if self.idle_resolution and self.idle_resolution != (self.camera_width, self.camera_height):
+            self.requested_resolution = self.idle_resolution
+        self.publish_state(gesture="IDLE")
+        self.log_action(f"Idle: no hands for {self.idle_after:g} s, watching for motion "
+                        f"at {self.idle_fps:g} FPS")
+    
+    def wake(self, capture_time):
+        """Resume full-rate tracking; latency is measured on the next processed frame"""
+        self.idle = False
+        self.last_hand_time = capture_time
+        self.wake_capture_time = capture_time
+        if self.idle_resolution and self.idle_resolution != (self.camera_width, self.camera_height):
+            self.requested_resolution = (self.camera_width, self.camera_height)
+        
+        idle_time = max(capture_time - self.idle_since, 1e-6)
+        cpu = (time.process_time() - self.idle_cpu_start) / idle_time
+        self.log_action(f"Motion detected after {idle_time:.0f} s idle ({100.0 * cpu:.1f}% CPU while idle)")
+    
+    def report_wake_latency(self):
+        """Log how long after the motion frame full tracking resumed"""
+        latency_ms = (time.time() - self.wake_capture_time) * 1000.0
+        self.wake_capture_time = None
+        self.wake_latency.add(latency_ms)
+        self.log_action(f"Tracking resumed {latency_ms:.0f} ms after motion "
+                        f"(p50 {self.wake_latency.percentile(50):.0f} ms / "
+                        f"p95 {self.wake_latency.percentile(95):.0f} ms, "
+                        f"+ up to {1000.0 / self.idle_fps:.0f} ms idle sampling)")
+    
+    def report_dropped_frames(self, last_dropped):
+        """Log how many frames the pipeline skipped since the last report"""
+        dropped = self.frame_source.dropped_frames
+        if dropped > last_dropped:
+            captured = max(self.frame_source.captured_frames, 1)
+            self.log_action(f"Pipeline behind: dropped {dropped - last_dropped} frames "
+                            f"({100.0 * dropped / captured:.1f}% total)")
+        return dropped
+    
+    def report_action_stats(self):
+        """Log dispatcher queue depth, injection latency and arbitration refusals when actions were injected"""
+        if self.dispatcher is None or self.dispatcher.injected == self.last_injected:
+            return
+        self.last_injected = self.dispatcher.injected
+        stats = self.dispatcher.stats()
+        self.log_action(f"Actions: queue {stats['queue_depth']} (max {stats['max_queue_depth']}), "
+                        f"injection p50 {stats['latency_p50_ms']:.1f} ms / "
+                        f"p95 {stats['latency_p95_ms']:.1f} ms, {stats['coalesced']} moves coalesced")
+        motion = self.motion_latency.stats()
+        if motion['samples']:
+            self.log_action(f"Motion-to-cursor latency p50 {motion['p50_ms']:.0f} ms / "
+                            f"p95 {motion['p95_ms']:.0f} ms")
+        if self.arbiter.conflicts:
+            self.log_action("Refused by arbitration: " + ", ".join(
+                f"{channel}={count}" for channel, count in sorted(self.arbiter.conflicts.items())))
+    
+    def process_video(self):
+        """Main video processing loop"""
+        last_dropped = 0
+        last_drop_report = time.time()
+        
+        while self.is_camera_on:
+            item = self.frame_buffer.get(timeout=1.0)
+            if item is None:
+                if self.frame_buffer.closed:
+                    break
+                continue
+            frame, capture_time, frame_id = item
+            frame_start = time.perf_counter()
             
-            # Flip frame horizontally for mirror effect
-            frame = cv2.flip(frame, 1)
-            
-            # Convert BGR to RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Process hand detection
-            results = self.hands.process(rgb_frame)
-            
-            # Update hand count
-            hand_count = 0
-            if results.multi_hand_landmarks:
-                hand_count = len(results.multi_hand_landmarks)
-                
-            self.hand_status_label.config(text=f"✋ Hands: {hand_count}")
+            # Idle: only the motion gate runs, and the preview keeps its window alive
+            if self.idle:
+                if self.motion_gate.update(frame):
+                    self.wake(capture_time)
+                elif self.preview_due() and not self.show_idle_preview(frame):
+                    break
+                continue
+            self.profiler.begin()
             
-            # Draw hand landmarks and handle gestures
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    # Draw landmarks
-                    self.mp_draw.draw_landmarks(
-                        frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
-                    
-                    # Draw finger tip markers
-                    tips = [4, 8, 12, 16, 20]  # Thumb, Index, Middle, Ring, Pinky tips
-                    for tip in tips:
-                        tip_x = int(hand_landmarks.landmark[tip].x * frame.shape[1])
-                        tip_y = int(hand_landmarks.landmark[tip].y * frame.shape[0])
-                        cv2.circle(frame, (tip_x, tip_y), 10, (0, 255, 255), -1)
-                    
-                    # Handle gestures if tracking is enabled
-                    if self.is_tracking:
-                        gesture = self.recognize_gesture(hand_landmarks.landmark)
-                        self.handle_gesture(gesture, hand_landmarks.landmark)
-                        
-                        # Display recognized gesture on frame
-                        cv2.putText(frame, f"Gesture: {gesture.upper()}", 
-                                   (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, 
-                                   (255, 255, 0), 2)
-            else:
-                # No hands detected
-                self.current_gesture_label.config(text="NO HANDS")
-                if self.is_dragging:
-                    pyautogui.mouseUp()
-                    self.is_dragging = False
-                    self.log_action("Stopped dragging (no hands)")
+            # Report dropped frames periodically
+            if time.time() - last_drop_report > self.drop_report_interval:
+                last_dropped = self.report_dropped_frames(last_dropped)
+                self.report_action_stats()
+                last_drop_report = time.time()
             
-            # Add status overlay to video
-            status_text = f"Tracking: {'ON' if self.is_tracking else 'OFF'}"
-            cv2.putText(frame, status_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, 
-                       (0, 255, 0) if self.is_tracking else (0, 0, 255), 2)
+            # Process hand detection on the raw frame (landmarks come back mirrored)
+            detections = self.detect_hands(frame)
+            if self.wake_capture_time is not None:
+                self.report_wake_latency()
+            if detections:
+                self.last_hand_time = capture_time
+            elif self.idle_after and capture_time - self.last_hand_time > self.idle_after:
+                self.enter_idle(capture_time)
             
-            # Add peace sign indicator
-            cv2.putText(frame, "Make a peace sign (✌️) to left-click", 
-                       (frame.shape[1] - 400, 30), cv2.FONT_HERSHEY_SIMPLEX, 
-                       0.7, (255, 255, 255), 2)
+            # Mirrored, downscaled preview only when one is due
+            preview = mirrored_preview(frame, self.preview_scale) if self.preview_due() else None
+            self.profiler.lap('flip')
+            if not self.handle_frame(preview, detections, capture_time):
+                break
             
-            # Add crosshair in center
-            h, w = frame.shape[:2]
-            cv2.line(frame, (w//2-20, h//2), (w//2+20, h//2), (255, 0, 255), 2)
-            cv2.line(frame, (w//2, h//2-20), (w//2, h//2+20), (255, 0, 255), 2)
+            # Step quality up or down to hold the frame time budget
+            if self.governor is not None:
+                now = time.perf_counter()
+                change = self.governor.observe(now - frame_start, now)
+                if change is not None:
+                    self.apply_quality(*change)
+    
+    def process_pipeline_results(self):
+        """Main loop when capture and inference run in worker processes"""
+        last_dropped = 0
+        last_drop_report = time.time()
+        
+        while self.is_camera_on:
+            results = self.pipeline.get_results(timeout=1.0)
+            if not results:
+                if self.pipeline.stopped:
+                    # Every worker ended on its own: release the camera and say why
+                    error = self.pipeline.failure() or "worker processes stopped"
+                    self.stop_camera()
+                    self.camera_failed(error)
+                    return
+                continue
             
-            # Show video feed
-            cv2.imshow('Hand Gesture Control - Position hand in center', frame)
+            if time.time() - last_drop_report > self.drop_report_interval:
+                last_dropped = self.report_dropped_frames(last_dropped)
+                self.report_action_stats()
+                last_drop_report = time.time()
             
-            # Break on 'q' key press
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+            # Results of all sources go through the one set of hands and arbiter
+            for result in results:
+                self.profiler.begin()
+                self.profiler.record('inference', result.inference_time)
+                
+                # Preview is read straight from the shared frame slot, if not yet overwritten
+                preview = None
+                if self.preview_due(result.source):
+                    preview = self.pipeline.read_preview(result, self.preview_scale)
+                self.profiler.lap('flip')
+                if not self.handle_frame(preview, result.detections, result.capture_time, result.source):
+                    return
+    
+    def show_idle_preview(self, frame):
+        """Preview while idle; returns False when the user asked to quit"""
+        preview = mirrored_preview(frame, self.preview_scale)
+        cv2.putText(preview, "IDLE - move to wake", (int(10 * self.preview_scale), int(30 * self.preview_scale)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8 * self.preview_scale, (0, 200, 255),
+                    max(1, round(2 * self.preview_scale)))
+        cv2.imshow(self.preview_title(), preview)
+        return cv2.waitKey(1) & 0xFF != ord('q')
+    
+    def preview_due(self, source=0):
+        """Whether this frame should be shown, given the preview frame rate"""
+        if not self.preview_enabled:
+            return False
+        now = time.perf_counter()
+        if now - self.last_preview_time.get(source, 0.0) < 1.0 / self.preview_fps:
+            return False
+        self.last_preview_time[source] = now
+        return True
+    
+    @staticmethod
+    def preview_title(source=0):
+        title = 'Hand Gesture Control - Position hand in center'
+        return title if source == 0 else f"{title} (camera {source})"
+    
+    def handle_frame(self, frame, detections, capture_time, source=0):
+        """Act on one frame's detections and draw the mirrored preview.
+        
+        `frame` may be None when no preview is due, in which case nothing is
+        drawn. Returns False when the user asked to quit from the preview window.
+        """
+        profiler = self.profiler
+        scale = self.preview_scale
+        self.frame_count += 1
+        self.hands_in_view[source] = len(detections)
+        self.publish_state(hands=sum(self.hands_in_view.values()))
+        
+        # Draw hand landmarks and handle gestures
+        if detections:
+            hands = self.track_hands(source, detections) if self.is_tracking else [None] * len(detections)
+            for i, (detection, hand) in enumerate(zip(detections, hands)):
+                points = detection.points
+                if frame is not None:
+                    draw_hand(frame, points, scale)
+                    profiler.lap('overlay')
+                
+                # Handle gestures if tracking is enabled
+                if self.is_tracking:
+                    gesture = self.recognize_gesture(points)
+                    profiler.lap('recognize')
+                    self.handle_gesture(gesture, points, capture_time, detection.score, hand=hand)
+                    if self.recorder is not None:
+                        self.record_frame(capture_time, detection, gesture, len(detections), hand, source)
+                    profiler.lap('action')
+                    
+                    # Display recognized gesture on frame
+                    if frame is not None:
+                        cv2.putText(frame, f"Gesture: {gesture.upper()}", 
+                                   (int(10 * scale), int((70 + 30 * i) * scale)), cv2.FONT_HERSHEY_SIMPLEX,
+                                   0.7 * scale, (255, 255, 0), max(1, round(2 * scale)))
+        else:
+            # No hands detected (by any camera)
+            if not any(self.hands_in_view.values()):
+                self.publish_state(gesture="NO HANDS")
+            self.track_hands(source, [])
+            if self.recorder is not None and self.is_tracking:
+                self.record_frame(capture_time, source=source)
+            profiler.lap('action')
+        
+        # The frame's events go to stream subscribers as one batch
+        if self.event_server is not None:
+            self.event_server.flush()
+            profiler.lap('publish')
+        
+        if frame is None:
+            profiler.end_frame()
+            return True
+        
+        # Status text, peace sign hint and crosshair come from the cached layer
+        self.static_overlay.apply(frame, self.is_tracking, scale)
+        
+        # Add frame age / dropped frame counter
+        frame_age_ms = (time.time() - capture_time) * 1000
+        cv2.putText(frame, f"Age: {frame_age_ms:.0f} ms  Dropped: {self.frame_source.dropped_frames}",
+                   (int(10 * scale), frame.shape[0] - int(15 * scale)), cv2.FONT_HERSHEY_SIMPLEX,
+                   0.5 * scale, (200, 200, 200), 1)
+        
+        # FPS / per-stage latency overlay
+        if self.metrics_overlay and profiler.enabled:
+            profiler.draw_overlay(frame, scale)
+        profiler.lap('overlay')
+        
+        # Show video feed
+        cv2.imshow(self.preview_title(source), frame)
+        
+        # Break on 'q' key press
+        keep_running = cv2.waitKey(1) & 0xFF != ord('q')
+        profiler.lap('imshow')
+        profiler.end_frame()
+        return keep_running
+    
+    def start_recording(self, path):
+        """Log every processed frame to a .gsr session recording"""
+        self.recorder = SessionRecorder(path)
+        self.actions = ActionTap(self.actions, self.recorder.note_action)
+        self.log_action(f"Recording session to {path}")
+    
+    def stop_recording(self):
+        if self.recorder is None:
+            return
+        self.actions = self.actions.sink
+        self.recorder.close()
+        self.log_action(f"Recorded {self.recorder.records} frames to {self.recorder.path}")
+        self.recorder = None
+    
+    def record_frame(self, timestamp, detection=None, gesture='none', hands=0, hand=None, source=0):
+        """Add one processed hand (or a hand-less frame) to the session recording"""
+        if detection is None:
+            self.recorder.add(timestamp, hands=hands, source=source, frame=self.frame_count)
+        else:
+            self.recorder.add(timestamp, detection.points, detection.handedness, detection.score,
+                              gesture, hand.gesture_state.active if hand else 'none', hands,
+                              source, self.frame_count)
+    
+    def start_event_server(self, address, allow_remote=False):
+        """Publish gesture, cursor and landmark events on a local socket"""
+        self.event_server = EventServer(address, log=self.log_action, allow_remote=allow_remote)
+        self.log_action(f"Event stream on {address}")
+    
+    def stop_event_server(self):
+        if self.event_server is None:
+            return
+        self.event_server.close()
+        stats = self.event_server.stats()
+        self.log_action(f"Event stream closed ({stats['published']} events published)")
+        self.event_server = None
+    
+    def enable_metrics(self, export_path=None, export_interval=5.0, overlay=False):
+        """Turn on per-stage timing, optional CSV/JSON-lines export and preview overlay"""
+        self.profiler = StageProfiler(export_path, export_interval)
+        self.metrics_overlay = overlay
+        if self.detector is not None:
+            self.detector.profiler = self.profiler
     
     def on_closing(self):
         """Handle application closing"""
         self.stop_camera()
+        self.profiler.close()
+        self.stop_recording()
+        self.stop_event_server()
+        if self.dispatcher is not None:
+            self.dispatcher.close()
         self.root.destroy()
     
     def run(self):
         """Run the application"""
         try:
             self.log_action("Application started. Click 'Start Camera' to begin.")
+            threading.Thread(target=self.load_actions, daemon=True).start()
+            if not self.use_processes:
+                # The worker process loads its own model; here it warms up behind the window
+                threading.Thread(target=self.warm_up, daemon=True).start()
+            else:
+                self.publish_state(model='ready')
             self.root.mainloop()
         except KeyboardInterrupt:
             self.log_action("Application interrupted by user")
         finally:
             self.stop_camera()
 
+class LatencyStats:
+    """Collects per-stage timings and summarises them as percentiles"""
+    def __init__(self):
+        self.samples = defaultdict(list)
+    
+    def add(self, stage, seconds):
+        self.samples[stage].append(seconds)
+    
+    def summary(self):
+        """Return {stage: {count, mean_ms, p50_ms, p95_ms, p99_ms, fps}}"""
+        report = {}
+        for stage, values in self.samples.items():
+            ms = np.asarray(values, dtype=np.float64) * 1000.0
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            mean = float(ms.mean())
+            report[stage] = {
+                'count': len(values),
+                'mean_ms': mean,
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+                'fps': 1000.0 / mean if mean > 0 else float('inf'),
+            }
+        return report
+
+
+class PipelineBenchmark:
+    """Replays recorded video or landmark files through the gesture pipeline headlessly"""
+    LANDMARK_EXTENSIONS = ('.npy', '.npz', SESSION_EXTENSION)
+    CHUNK_FRAMES = 4096  # Frames read at a time from (memory-mapped) recordings
+    
+    def __init__(self, controller=None, default_fps=30.0, save_landmarks=False):
+        self.controller = controller or HandGestureCursorController(headless=True)
+        self.controller.is_tracking = True
+        self.default_fps = default_fps
+        self.stats = LatencyStats()
+        self.frames = 0
+        self.wall_time = 0.0
+        # Added to a recording's timestamps, so time keeps running forward
+        # when files are replayed one after another (or repeated)
+        self.time_offset = 0.0
+        self.end_time = 0.0  # Frame timestamp just past the last frame replayed
+        
+        # Landmarks detected in video replays, kept for --save-landmarks
+        self.saved_landmarks = [] if save_landmarks else None
+        self.saved_timestamps = []
+    
+    @staticmethod
+    def load_landmarks(path, default_fps=30.0):
+        """Load an (N, 21, 3) landmark sequence and its timestamps.
+        
+        .npy files hold the landmark array only (frames without a hand are
+        NaN) and are assumed to be sampled at default_fps. .npz files hold a
+        'landmarks' array and optionally a matching 'timestamps' array.
+        Session recordings (.gsr) are memory-mapped rather than loaded, one
+        row per recorded hand.
+        """
+        if path.lower().endswith(SESSION_EXTENSION):
+            records = load_session(path)
+            return records['landmarks'], records['timestamp']
+        if path.lower().endswith('.npz'):
+            with np.load(path) as data:
+                landmarks = data['landmarks']
+                timestamps = data['timestamps'] if 'timestamps' in data else None
+        else:
+            landmarks = np.load(path)
+            timestamps = None
+        
+        if landmarks.ndim != 3 or landmarks.shape[1:] != (21, 3):
+            raise ValueError(f"{path}: expected landmarks of shape (N, 21, 3), got {landmarks.shape}")
+        if timestamps is None:
+            timestamps = np.arange(len(landmarks)) / default_fps
+        return landmarks, timestamps
+    
+    def run(self, path):
+        """Replay one recording and accumulate its timings"""
+        # Each recording starts with no hands in view, after the previous one ends
+        self.controller.handle_no_hands()
+        start = time.perf_counter()
+        if path.lower().endswith(self.LANDMARK_EXTENSIONS):
+            frames = self.replay_landmarks(path)
+        else:
+            frames = self.replay_video(path)
+        self.wall_time += time.perf_counter() - start
+        self.frames += frames
+    
+    def process_frame(self, detections, timestamp, frame_start, source=0):
+        """Run gesture recognition and action handling for the hands of one frame"""
+        controller = self.controller
+        clock = time.perf_counter
+        controller.frame_count += 1
+        self.end_time = max(self.end_time, timestamp + 1.0 / self.default_fps)
+        
+        hands = controller.track_hands(source, detections)
+        if not detections and controller.recorder is not None:
+            controller.record_frame(timestamp, source=source)
+        for detection, hand in zip(detections, hands):
+            # Wall-clock time the frame entered the pipeline, for motion-to-cursor latency
+            t0 = clock()
+            captured_at = time.time() - (t0 - frame_start)
+            gesture = controller.recognize_gesture(detection.points)
+            t1 = clock()
+            controller.handle_gesture(gesture, detection.points, timestamp, detection.score, captured_at, hand)
+            if controller.recorder is not None:
+                controller.record_frame(timestamp, detection, gesture, len(detections), hand, source)
+            t2 = clock()
+            self.stats.add('recognize', t1 - t0)
+            self.stats.add('action', t2 - t1)
+            if hand.gesture_state.changed and hand.gesture_state.active != 'none':
+                self.stats.add('confirm', hand.gesture_state.delay)
+        
+        if controller.event_server is not None:
+            t0 = clock()
+            controller.event_server.flush()
+            self.stats.add('publish', clock() - t0)
+        
+        self.stats.add('frame', clock() - frame_start)
+    
+    def replay_landmarks(self, path):
+        """Feed a recorded landmark sequence or session recording through the pipeline"""
+        landmarks, timestamps = self.load_landmarks(path, self.default_fps)
+        session = load_session(path) if path.lower().endswith(SESSION_EXTENSION) else None
+        # Records of one (source, frame) are replayed together; landmark files hold one frame per row
+        # Start where the previous replay ended (recordings need not start at 0)
+        self.time_offset = max(0.0, self.end_time - float(timestamps[0])) if len(timestamps) else 0.0
+        clock = time.perf_counter
+        frames = 0
+        frame = frame_key = None  # (timestamp, detections, start, source) being gathered
+        
+        # Read a chunk at a time, so a memory-mapped session only pages in what is replayed
+        for start in range(0, len(landmarks), self.CHUNK_FRAMES):
+            stop = start + self.CHUNK_FRAMES
+            chunk = np.asarray(landmarks[start:stop])
+            chunk_times = (np.asarray(timestamps[start:stop]) + self.time_offset).tolist()
+            records = np.asarray(session[start:stop]) if session is not None else None
+            keys = list(zip(records['source'].tolist(), records['frame'].tolist())) if records is not None else None
+            
+            for i, points in enumerate(chunk):
+                key = keys[i] if keys is not None else None
+                if frame is not None and (key is None or key != frame_key):
+                    self.process_frame(frame[1], frame[0], frame[2], frame[3])
+                    frames += 1
+                    frame = None
+                
+                t0 = clock()
+                if frame is None:
+                    frame, frame_key = (chunk_times[i], [], t0, key[0] if key is not None else 0), key
+                if not np.isnan(points).any():
+                    if records is None:
+                        frame[1].append(HandDetection(points, 'Unknown', 1.0))
+                    else:
+                        record = records[i]
+                        frame[1].append(HandDetection(points, HANDEDNESS[record['handedness']],
+                                                      float(record['score'])))
+                self.stats.add('decode', clock() - t0)
+        
+        if frame is not None:
+            self.process_frame(frame[1], frame[0], frame[2], frame[3])
+            frames += 1
+        return frames
+    
+    def replay_video(self, path):
+        """Feed a recorded video through MediaPipe and the gesture pipeline"""
+        controller = self.controller
+        if controller.detector is None:
+            controller.init_hands()
+        
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            raise IOError(f"Could not open video {path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or self.default_fps
+        self.time_offset = self.end_time  # Start where the previous replay ended
+        clock = time.perf_counter
+        frames = 0
+        
+        try:
+            while True:
+                t0 = clock()
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                t1 = clock()
+                detections = controller.detect_hands(frame)
+                t2 = clock()
+                
+                self.stats.add('decode', t1 - t0)
+                self.stats.add('inference', t2 - t1)
+                
+                # --save-landmarks keeps the first hand of each frame
+                hand_landmarks = detections[0].points if detections else None
+                
+                timestamp = self.time_offset + frames / fps
+                if self.saved_landmarks is not None:
+                    if hand_landmarks is None:
+                        self.saved_landmarks.append(np.full((21, 3), np.nan, dtype=np.float32))
+                    else:
+                        self.saved_landmarks.append(hand_landmarks)
+                    self.saved_timestamps.append(timestamp)
+                
+                self.process_frame(detections, timestamp, t0)
+                frames += 1
+        finally:
+            cap.release()
+        
+        return frames
+    
+    def save_landmarks(self, path):
+        """Write landmarks detected during video replays to an .npz file"""
+        np.savez_compressed(path,
+                            landmarks=np.asarray(self.saved_landmarks, dtype=np.float32).reshape(-1, 21, 3),
+                            timestamps=np.asarray(self.saved_timestamps, dtype=np.float64))
+    
+    def report(self):
+        """Summarise throughput, per-stage latency and issued actions"""
+        actions = self.controller.actions
+        dispatcher = self.controller.dispatcher
+        report = {
+            'frames': self.frames,
+            'wall_time_s': self.wall_time,
+            'fps': self.frames / self.wall_time if self.wall_time > 0 else 0.0,
+            'stages': self.stats.summary(),
+        }
+        if dispatcher is not None:
+            dispatcher.flush()
+            report['dispatcher'] = dispatcher.stats()
+        report['motion_to_cursor'] = self.controller.motion_latency.stats()
+        report['actions'] = dict(getattr(actions, 'counts', {}))
+        report['arbitration_conflicts'] = dict(self.controller.arbiter.conflicts)
+        return report
+    
+    @staticmethod
+    def print_report(report):
+        print(f"Frames: {report['frames']}  Wall time: {report['wall_time_s']:.3f} s  "
+              f"Throughput: {report['fps']:.1f} frames/s")
+        print(f"{'stage':<12}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'fps':>12}")
+        for stage, row in report['stages'].items():
+            print(f"{stage:<12}{row['count']:>8}{row['mean_ms']:>10.3f}{row['p50_ms']:>10.3f}"
+                  f"{row['p95_ms']:>10.3f}{row['p99_ms']:>10.3f}{row['fps']:>12.1f}")
+        if 'dispatcher' in report:
+            d = report['dispatcher']
+            print(f"Dispatcher: injected={d['injected']} coalesced={d['coalesced']} dropped={d['dropped']} "
+                  f"max queue={d['max_queue_depth']} latency p50={d['latency_p50_ms']:.3f} ms "
+                  f"p95={d['latency_p95_ms']:.3f} ms")
+        motion = report.get('motion_to_cursor')
+        if motion and motion['samples']:
+            print(f"Motion-to-cursor: {motion['samples']} moves, mean={motion['mean_ms']:.3f} ms "
+                  f"p50={motion['p50_ms']:.3f} ms p95={motion['p95_ms']:.3f} ms")
+        if report['actions']:
+            print("Actions: " + ", ".join(f"{name}={count}" for name, count in sorted(report['actions'].items())))
+        if report.get('arbitration_conflicts'):
+            print("Refused by arbitration (channel held by another hand): " +
+                  ", ".join(f"{name}={count}" for name, count in sorted(report['arbitration_conflicts'].items())))
+
+
+def run_benchmark(args):
+    """Headless benchmark entry point - returns a process exit code"""
+    controller = HandGestureCursorController(
+        headless=True, action_sink=RecordingActionSink(delay=args.action_delay_ms / 1000.0),
+        classifier=create_classifier(args.classifier, args.templates),
+        async_actions=not args.sync_actions)
+    try:
+        apply_options(controller, args)
+    except ValueError as e:
+        controller.stop_recording()
+        print(f"FAIL: {e}")
+        return 1
+    benchmark = PipelineBenchmark(controller, default_fps=args.fps,
+                                  save_landmarks=bool(args.save_landmarks))
+    if controller.event_server is not None:
+        try:
+            clients = start_event_clients(controller.event_server, args.event_clients, args.slow_client_ms)
+        except RuntimeError as e:
+            controller.stop_event_server()
+            print(f"FAIL: {e}")
+            return 1
+    for _ in range(args.repeat):
+        for path in args.benchmark or []:
+            benchmark.run(path)
+    
+    report = benchmark.report()
+    controller.stop_recording()
+    if controller.event_server is not None:
+        try:
+            report['event_stream'] = finish_event_clients(controller, *clients)
+        except RuntimeError as e:
+            print(f"FAIL: {e}")
+            return 1
+    if args.benchmark:
+        PipelineBenchmark.print_report(report)
+    if 'event_stream' in report:
+        print_event_stream(report['event_stream'])
+    if args.cold_start:
+        report['cold_start'] = measure_cold_start(args.cold_start, args.repeat)
+        print_cold_start(report['cold_start'])
+    if args.source_scaling:
+        try:
+            report['source_scaling'] = measure_source_scaling(args.source_scaling, controller.detector_options,
+                                                              args.max_sources)
+        except RuntimeError as e:
+            print(f"FAIL: {e}")
+            return 1
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_landmarks:
+        benchmark.save_landmarks(args.save_landmarks)
+    
+    # Fail CI runs that regress past the latency budget
+    if args.max_p95_ms is not None:
+        frame_p95 = report['stages'].get('frame', {}).get('p95_ms', 0.0)
+        if frame_p95 > args.max_p95_ms:
+            print(f"FAIL: p95 frame latency {frame_p95:.3f} ms exceeds {args.max_p95_ms:.3f} ms")
+            return 1
+    return 0
+
+
+def event_client_process(index, address, delay, results):
+    """Benchmark subscriber process: read the stream to its end (`delay` s per batch) and report"""
+    client = EventClient(address)
+    latencies = []
+    events = 0
+    first = last = None
+    while True:
+        batch = client.read_batch()
+        if batch is None:
+            break
+        last = time.time()
+        first = first or last
+        published, batch_events = batch
+        latencies.append((last - published) * 1000.0)
+        events += len(batch_events)
+        if delay:
+            time.sleep(delay)
+    client.close()
+    
+    elapsed = (last - first) if events else 0.0
+    results.put({
+        'index': index,
+        'delay_ms': delay * 1000.0,
+        'events': events,
+        'batches': len(latencies),
+        'events_per_s': events / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': float(np.percentile(latencies, 50)) if latencies else 0.0,
+        'p95_ms': float(np.percentile(latencies, 95)) if latencies else 0.0,
+        'max_ms': max(latencies, default=0.0),
+    })
+
+
+def start_event_clients(server, count=1, slow_ms=0.0, timeout=10.0):
+    """Spawn subscriber processes (the last one reading slowly), one connected at a time.
+    
+    Returns the processes, their results queue and the server's subscriber
+    for each, in the same order. Raises RuntimeError if a client exits or
+    they are not all connected in time.
+    """
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    processes = []
+    deadline = time.time() + timeout
+    for i in range(count):
+        process = context.Process(target=event_client_process, daemon=True,
+                                  args=(i, server.address, slow_ms / 1000.0 if i == count - 1 else 0.0, results))
+        process.start()
+        processes.append(process)
+        
+        # Started one by one, so the i-th subscriber is the i-th client
+        while len(server.subscribers) <= i:
+            if process.exitcode is not None or time.time() >= deadline:
+                for started in processes:
+                    started.terminate()
+                reason = "it exited" if process.exitcode is not None else f"timed out after {timeout:.0f} s"
+                raise RuntimeError(f"Only {len(server.subscribers)} of {count} event clients connected to "
+                                   f"{server.address} ({reason})")
+            time.sleep(0.01)
+    return processes, results, list(server.subscribers)
+
+
+def finish_event_clients(controller, processes, results, subscribers, timeout=30.0):
+    """Close the stream (subscribers get what is still queued) and collect the clients' reports.
+    
+    Events sent and dropped per client are counted by its subscriber on the
+    server: the last batch header a client read can miss the final drops.
+    """
+    server = controller.event_server
+    controller.stop_event_server()
+    clients = []
+    try:
+        for _ in processes:
+            clients.append(results.get(timeout=timeout))
+    except queue.Empty:
+        raise RuntimeError(f"Only {len(clients)} of {len(processes)} event clients reported "
+                           f"within {timeout:.0f} s of the stream closing") from None
+    finally:
+        for process in processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+    for subscriber in subscribers:
+        subscriber.thread.join(timeout)  # Its final drops are counted as it exits
+    for client in clients:
+        subscriber = subscribers[client.pop('index')]
+        client.update(sent=subscriber.sent, dropped=subscriber.dropped)
+    stats = server.stats()
+    stats.update(sent=sum(subscriber.sent for subscriber in subscribers),
+                 dropped=sum(subscriber.dropped for subscriber in subscribers))
+    return dict(stats, clients=sorted(clients, key=lambda client: client['delay_ms']))
+
+
+def print_event_stream(report):
+    print(f"Event stream: {report['published']} events published, {report['dropped']} dropped "
+          f"for slow subscribers")
+    print(f"{'client':<8}{'delay ms':>10}{'sent':>10}{'received':>10}{'dropped':>10}{'events/s':>12}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+    for i, client in enumerate(report['clients']):
+        print(f"{i:<8}{client['delay_ms']:>10.1f}{client['sent']:>10}{client['events']:>10}{client['dropped']:>10}"
+              f"{client['events_per_s']:>12.0f}{client['p50_ms']:>9.2f}{client['p95_ms']:>9.2f}"
+              f"{client['max_ms']:>9.2f}")
+
+
+def print_events(address, types=EVENT_TYPES):
+    """Bundled client: print the event stream of a running instance until it closes"""
+    client = EventClient(address, types)
+    dropped = 0
+    try:
+        for event in client:
+            if client.dropped != dropped:
+                print(f"... {client.dropped - dropped} events dropped (reading too slowly)")
+                dropped = client.dropped
+            data = event.data
+            if event.kind == 'landmarks':
+                data = f"wrist ({data[0, 0]:.3f}, {data[0, 1]:.3f}) index tip ({data[8, 0]:.3f}, {data[8, 1]:.3f})"
+            elif event.kind == 'gesture':
+                data = f"{data[0]} -> {data[1]} ({data[2]:.2f})"
+            elif event.kind == 'cursor':
+                data = f"({data[0]:.0f}, {data[1]:.0f})"
+            print(f"{event.timestamp:.3f} {event.kind:<9} camera {event.source} "
+                  f"{event.handedness} #{event.hand_id}: {data}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+
+
+# Startup phases, in the order they complete in the app
+COLD_START_PHASES = ('module', 'backends', 'actions', 'camera', 'model', 'first_frame')
+
+
+def cold_start_probe(source, launched_at):
+    """Run in a fresh interpreter by measure_cold_start: time startup up to the first tracked frame.
+    
+    Mirrors the app: the model loads and warms up, and the real action sink
+    loads pyautogui, in background threads while the camera (or video file)
+    opens. The frame's actions go to a stub sink, so the probe never moves
+    the mouse; without a display there is no 'actions' phase. Prints
+    milliseconds since launch for each phase as JSON.
+    """
+    phases = {'module': MODULE_START_TIME}
+    
+    def load_model():
+        controller.init_hands()
+        controller.detector.warm_up(controller.camera_width, controller.camera_height)
+        phases['model'] = time.time()
+    
+    def load_actions():
+        try:
+            PyAutoGUIActionSink().load()
+        except RuntimeError:
+            return
+        phases['actions'] = time.time()
+    
+    mp.load()
+    cv2.load()
+    phases['backends'] = time.time()
+    controller = HandGestureCursorController(headless=True, async_actions=False)
+    controller.is_tracking = True
+    loaders = [threading.Thread(target=load_model), threading.Thread(target=load_actions)]
+    for loader in loaders:
+        loader.start()
+    
+    cap = cv2.VideoCapture(parse_source(source))
+    if not cap.isOpened():
+        raise IOError(f"Could not open {source}")
+    phases['camera'] = time.time()
+    loaders[0].join()
+    
+    ret, frame = cap.read()
+    cap.release()
+    if not ret:
+        raise IOError(f"No frames from {source}")
+    detections = controller.detect_hands(frame)
+    controller.handle_frame(None, detections, time.time())
+    phases['first_frame'] = time.time()
+    loaders[1].join()
+    
+    print(json.dumps({phase: (t - launched_at) * 1000.0 for phase, t in phases.items()}))
+
+
+def measure_cold_start(source, repeat=3):
+    """Median and worst time (ms since launch) of each startup phase over fresh interpreters"""
+    runs = []
+    for _ in range(repeat):
+        launched_at = time.time()
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), '--cold-start-probe', str(source),
+                                 '--launched-at', repr(launched_at)],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"cold-start probe failed: {result.stderr.strip().splitlines()[-1:]}")
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    
+    return {phase: {'median_ms': float(np.median([run[phase] for run in runs])),
+                    'max_ms': float(max(run[phase] for run in runs))}
+            for phase in COLD_START_PHASES if all(phase in run for run in runs)}
+
+
+def print_cold_start(report):
+    print(f"{'cold start':<12}{'median ms':>12}{'max ms':>12}")
+    for phase, row in report.items():
+        print(f"{phase:<12}{row['median_ms']:>12.1f}{row['max_ms']:>12.1f}")
+
+
+def measure_source_scaling(source, detector_options, max_sources=None, duration=5.0,
+                           camera_size=(640, 480)):
+    """Inference throughput with 1..max_sources copies of a source, each in its own worker processes.
+    
+    A video file is replayed as fast as inference takes its frames, so every
+    worker pair is CPU-bound: total results/s grows with the source count
+    only while there are idle cores, after which the per-source rate and the
+    efficiency (speedup / sources) fall. Defaults to twice the core count.
+    """
+    cores = os.cpu_count() or 1
+    max_sources = max_sources or 2 * cores
+    print(f"{cores} cores")
+    print(f"{'sources':<10}{'results/s':>12}{'per source':>12}{'infer ms':>10}{'speedup':>10}{'efficiency':>12}")
+    report = {}
+    for count in range(1, max_sources + 1):
+        pipeline = MultiProcessPipeline([parse_source(source)] * count, camera_size, detector_options,
+                                        replay=True)
+        try:
+            pipeline.start()
+            
+            # Workers load and warm up their models first; time from the first result of every source
+            started = set()
+            deadline = time.time() + pipeline.start_timeout
+            while len(started) < count:
+                if pipeline.failed_sources or time.time() >= deadline:
+                    reason = pipeline.failure() or (f"sources {pipeline.failed_sources} stopped"
+                                                    if pipeline.failed_sources else
+                                                    f"no results after {pipeline.start_timeout:.0f} s")
+                    raise RuntimeError(f"Source scaling with {count} sources failed: {reason}")
+                started.update(result.source for result in pipeline.get_results(timeout=0.5))
+            
+            results, skipped, inference = 0, pipeline.skipped_results, []
+            start = time.perf_counter()
+            while time.perf_counter() - start < duration:
+                if pipeline.failed_sources:
+                    raise RuntimeError(f"Source scaling with {count} sources failed: "
+                                       f"{pipeline.failure() or f'sources {pipeline.failed_sources} stopped'}")
+                received = pipeline.get_results(timeout=0.5)
+                results += len(received)
+                inference += [result.inference_time for result in received]
+            elapsed = time.perf_counter() - start
+            results += pipeline.skipped_results - skipped
+        finally:
+            pipeline.stop()
+        
+        rate = results / elapsed
+        speedup = rate / report[1]['results_per_s'] if count > 1 else 1.0
+        report[count] = {'results_per_s': rate, 'per_source': rate / count,
+                         'inference_ms': 1000 * float(np.mean(inference)) if inference else 0.0,
+                         'speedup': speedup, 'efficiency': speedup / count}
+        row = report[count]
+        print(f"{count:<10}{rate:>12.1f}{row['per_source']:>12.1f}{row['inference_ms']:>10.2f}"
+              f"{speedup:>10.2f}{100 * row['efficiency']:>11.1f}%")
+    return report
+
+
+def compare_classifiers(paths, classifiers, default_fps=30.0, repeat=3):
+    """Accuracy and per-frame cost of each classifier backend on recordings.
+    
+    Accuracy is measured against the recording's 'labels' array when it has
+    one, otherwise against the reference rule chain.
+    """
+    reference = RuleChainClassifier()
+    results = {}
+    for path in paths:
+        landmarks, _ = PipelineBenchmark.load_landmarks(path, default_fps)
+        expected = None
+        if path.lower().endswith('.npz'):
+            with np.load(path) as data:
+                if 'labels' in data:
+                    expected = data['labels'].astype(str)
+        if expected is None:
+            expected = reference.classify_batch(landmarks)
+        
+        valid = ~np.isnan(landmarks).any(axis=(1, 2))
+        frames = landmarks[valid]
+        for classifier in classifiers:
+            row = results.setdefault(classifier.name, {'frames': 0, 'correct': 0,
+                                                       'frame_s': 0.0, 'batch_s': 0.0})
+            start = time.perf_counter()
+            for _ in range(repeat):
+                labels = [classifier.classify(points) for points in frames]
+            row['frame_s'] += (time.perf_counter() - start) / repeat
+            
+            start = time.perf_counter()
+            for _ in range(repeat):
+                classifier.classify_batch(landmarks)
+            row['batch_s'] += (time.perf_counter() - start) / repeat
+            
+            row['frames'] += len(frames)
+            row['correct'] += int((np.asarray(labels) == expected[valid]).sum())
+    
+    print(f"{'classifier':<12}{'frames':>8}{'accuracy':>10}{'us/frame':>10}{'batch us/frame':>16}")
+    for name, row in results.items():
+        frames = max(row['frames'], 1)
+        row['accuracy'] = row['correct'] / frames
+        row['frame_us'] = row['frame_s'] / frames * 1e6
+        row['batch_us'] = row['batch_s'] / frames * 1e6
+        print(f"{name:<12}{row['frames']:>8}{row['accuracy']:>10.3%}{row['frame_us']:>10.2f}{row['batch_us']:>16.3f}")
+    return results
+
+
+def evaluate_cursor_filters(paths, filters, default_fps=30.0, screen_size=(1920, 1080),
+                            reference_window=5, still_speed=150.0, max_lag_frames=15):
+    """Offline lag vs jitter of cursor filters on recorded index-tip trajectories.
+    
+    The reference trajectory is a centered (zero-lag) moving average of the raw
+    positions. Jitter is the RMS deviation from it while the hand is nearly
+    still; lag is the time shift that best aligns the filter output with it
+    while the hand moves.
+    """
+    kernel = np.ones(reference_window) / reference_window
+    half = reference_window // 2
+    results = {name: {'still': [], 'moving': [], 'lag_errors': np.zeros(max_lag_frames + 1),
+                      'lag_counts': 0, 'dt': [], 'updates': 0, 'seconds': 0.0}
+               for name in filters}
+    
+    for path in paths:
+        landmarks, timestamps = PipelineBenchmark.load_landmarks(path, default_fps)
+        valid = ~np.isnan(landmarks).any(axis=(1, 2))
+        
+        # Contiguous runs of frames with a hand are filtered independently
+        edges = np.flatnonzero(np.diff(np.concatenate([[0], valid.astype(np.int8), [0]])))
+        for start, end in zip(edges[::2], edges[1::2]):
+            if end - start < reference_window + max_lag_frames + 2:
+                continue
+            raw = np.column_stack([(1 - landmarks[start:end, 8, 0]) * screen_size[0],
+                                   landmarks[start:end, 8, 1] * screen_size[1]])
+            times = timestamps[start:end]
+            reference = np.column_stack([np.convolve(raw[:, i], kernel, mode='same') for i in range(2)])
+            speed = np.linalg.norm(np.gradient(reference, times, axis=0), axis=1)
+            core = slice(half, len(raw) - half)
+            
+            for name, cursor_filter in filters.items():
+                row = results[name]
+                cursor_filter.reset()
+                begin = time.perf_counter()
+                output = np.array([cursor_filter(x, y, t) for (x, y), t in zip(raw.tolist(), times.tolist())])
+                row['seconds'] += time.perf_counter() - begin
+                row['updates'] += len(raw)
+                
+                error = np.linalg.norm(output - reference, axis=1)[core]
+                still = speed[core] < still_speed
+                row['still'].append(error[still])
+                row['moving'].append(error[~still])
+                
+                # Align output[k:] with reference[:-k] to find the lag in frames
+                moving = ~still
+                for lag in range(max_lag_frames + 1):
+                    shifted = np.linalg.norm(output[half + lag:len(raw) - half]
+                                             - reference[half:len(raw) - half - lag], axis=1)
+                    mask = moving[:len(shifted)]
+                    row['lag_errors'][lag] += float((shifted[mask] ** 2).sum()) / max(mask.sum(), 1)
+                row['lag_counts'] += 1
+                row['dt'].append(np.diff(times))
+    
+    print(f"{'filter':<14}{'jitter px':>10}{'moving px':>11}{'lag ms':>9}{'us/update':>11}")
+    summary = {}
+    for name, row in results.items():
+        if not row['lag_counts']:
+            continue
+        still = np.concatenate(row['still'])
+        moving = np.concatenate(row['moving'])
+        frame_dt = float(np.median(np.concatenate(row['dt'])))
+        summary[name] = {
+            'jitter_px': float(np.sqrt(np.mean(still ** 2))) if len(still) else 0.0,
+            'moving_error_px': float(np.sqrt(np.mean(moving ** 2))) if len(moving) else 0.0,
+            'lag_ms': float(np.argmin(row['lag_errors'])) * frame_dt * 1000,
+            'update_us': row['seconds'] / row['updates'] * 1e6,
+        }
+        r = summary[name]
+        print(f"{name:<14}{r['jitter_px']:>10.2f}{r['moving_error_px']:>11.2f}"
+              f"{r['lag_ms']:>9.1f}{r['update_us']:>11.2f}")
+    return summary
+
+
+def build_templates(input_path, output_path, max_per_label=50):
+    """Build a template index from a labelled landmark recording"""
+    with np.load(input_path) as data:
+        landmarks, labels = data['landmarks'], data['labels']
+    classifier = TemplateClassifier.from_recording(landmarks, labels, max_per_label)
+    classifier.save(output_path)
+    counts = Counter(classifier.labels.tolist())
+    print(f"Saved {len(classifier.labels)} templates -> {output_path}")
+    print("Templates: " + ", ".join(f"{name}={count}" for name, count in sorted(counts.items())))
+
+
+def relabel_recording(input_path, output_path, default_fps=30.0, classifier=None):
+    """Classify a recorded landmark sequence offline and save it with labels"""
+    classifier = classifier or MaskTableClassifier()
+    landmarks, timestamps = PipelineBenchmark.load_landmarks(input_path, default_fps)
+    start = time.perf_counter()
+    labels = classifier.classify_batch(landmarks)
+    elapsed = time.perf_counter() - start
+    
+    np.savez_compressed(output_path, landmarks=landmarks, timestamps=timestamps, labels=labels)
+    
+    counts = Counter(labels.tolist())
+    print(f"Relabelled {len(labels)} frames in {elapsed * 1000:.2f} ms -> {output_path}")
+    print("Gestures: " + ", ".join(f"{name}={counts[name]}" for name in GESTURES if counts[name]))
+
+
+def apply_options(controller, args):
+    """Apply pipeline tuning options from the command line to a controller"""
+    controller.set_cursor_filter(create_cursor_filter(args.filter, args.filter_param))
+    controller.configure_detector(roi_enabled=args.roi, inference_scale=args.inference_scale,
+                                  max_num_hands=args.max_hands)
+    controller.camera_sources = args.camera or [0]
+    controller.use_processes = args.multiprocess or len(controller.camera_sources) > 1
+    controller.preview_enabled = not args.no_preview
+    controller.preview_fps = args.preview_fps
+    controller.preview_scale = args.preview_scale
+    controller.predictor = MotionPredictor() if args.predict else None
+    level = [quality.name for quality in QUALITY_LEVELS].index(args.quality)
+    if args.quality != 'default' or args.adaptive_quality:
+        controller.apply_quality(level)
+    if args.adaptive_quality:
+        controller.governor = QualityGovernor(args.frame_budget_ms, level)
+    controller.idle_after = args.idle_after
+    controller.idle_fps = args.idle_fps
+    controller.gesture_options = dict(window=args.vote_window, enter_threshold=args.enter_threshold,
+                                      exit_threshold=args.exit_threshold,
+                                      repeat=parse_gesture_repeat(args.gesture_repeat))
+    if args.metrics or args.metrics_file or args.metrics_overlay:
+        controller.enable_metrics(args.metrics_file, args.metrics_interval, args.metrics_overlay)
+    if args.record:
+        controller.start_recording(args.record)
+    if args.event_server:
+        try:
+            controller.start_event_server(args.event_server, args.event_allow_remote)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"--event-server: {e}") from None
+    return controller
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hand Gesture Cursor Controller")
+    parser.add_argument('--benchmark', nargs='+', metavar='FILE',
+                        help="replay recorded videos or landmark files (.npy/.npz) headlessly "
+                             "and report per-stage latency")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="number of passes over the benchmark files (and cold-start runs)")
+    parser.add_argument('--cold-start', metavar='SOURCE',
+                        help="time startup to the first tracked frame in fresh processes, "
+                             "from a camera index or video file")
+    parser.add_argument('--source-scaling', metavar='SOURCE',
+                        help="measure inference throughput with 1..--max-sources copies of a "
+                             "camera or video (replayed as fast as inference keeps up), each in its own "
+                             "worker processes")
+    parser.add_argument('--max-sources', type=int,
+                        help="largest source count for --source-scaling (default: twice the number of cores)")
+    parser.add_argument('--cold-start-probe', metavar='SOURCE', help=argparse.SUPPRESS)
+    parser.add_argument('--launched-at', type=float, default=0.0, help=argparse.SUPPRESS)
+    parser.add_argument('--fps', type=float, default=30.0,
+                        help="frame rate assumed for recordings without timestamps")
+    parser.add_argument('--json', metavar='FILE',
+                        help="write the benchmark report as JSON")
+    parser.add_argument('--save-landmarks', metavar='FILE',
+                        help="save landmarks detected in benchmark videos to an .npz file")
+    parser.add_argument('--max-p95-ms', type=float,
+                        help="exit with status 1 if p95 frame latency exceeds this budget")
+    parser.add_argument('--relabel', nargs=2, metavar=('INPUT', 'OUTPUT'),
+                        help="classify a recorded landmark file offline and save it with labels")
+    parser.add_argument('--classifier', choices=sorted(CLASSIFIERS), default='table',
+                        help="gesture classifier backend (default: table)")
+    parser.add_argument('--templates', metavar='FILE',
+                        help="template index for the template classifier")
+    parser.add_argument('--build-templates', nargs=2, metavar=('INPUT', 'OUTPUT'),
+                        help="build a template index from a labelled landmark recording")
+    parser.add_argument('--multiprocess', action='store_true',
+                        help="run capture and inference in worker processes (shared-memory frames)")
+    parser.add_argument('--camera', action='append', type=parse_source, metavar='SOURCE',
+                        help="camera index or video stream (repeatable; several cameras run in "
+                             "worker processes each, default: 0)")
+    parser.add_argument('--max-hands', type=int, default=1,
+                        help="hands tracked per camera, e.g. 2 for two-handed use (default: 1)")
+    parser.add_argument('--roi', action='store_true',
+                        help="run inference on a padded crop around the last detected hand")
+    parser.add_argument('--inference-scale', type=float, default=1.0,
+                        help="downscale factor applied to the inference region (e.g. 0.5)")
+    parser.add_argument('--action-delay-ms', type=float, default=0.0,
+                        help="emulated cost of each injected action in benchmarks (pyautogui pauses 10 ms)")
+    parser.add_argument('--sync-actions', action='store_true',
+                        help="inject mouse actions on the video thread instead of a dispatcher thread")
+    parser.add_argument('--filter', choices=sorted(CURSOR_FILTERS), default='one_euro',
+                        help="cursor smoothing filter (default: one_euro)")
+    parser.add_argument('--filter-param', action='append', metavar='NAME=VALUE',
+                        help="cursor filter tuning, e.g. min_cutoff=0.8 beta=0.01 (repeatable)")
+    parser.add_argument('--evaluate-filters', nargs='+', metavar='FILE',
+                        help="compare lag and jitter of the cursor filters on recorded trajectories")
+    parser.add_argument('--vote-window', type=float, default=0.2,
+                        help="seconds of recent classifications voting on the gesture (default: 0.2)")
+    parser.add_argument('--enter-threshold', type=float, default=0.6,
+                        help="vote share needed to confirm a new gesture (default: 0.6)")
+    parser.add_argument('--exit-threshold', type=float, default=0.35,
+                        help="vote share below which the active gesture is dropped (default: 0.35)")
+    parser.add_argument('--gesture-repeat', action='append', metavar='GESTURE=SECONDS',
+                        help="repeat interval of a held gesture, or 'once'/'every' frame (repeatable)")
+    parser.add_argument('--quality', choices=[quality.name for quality in QUALITY_LEVELS],
+                        default='default',
+                        help="resolution / model / inference scale / frame skipping level (default: default)")
+    parser.add_argument('--adaptive-quality', action='store_true',
+                        help="step the quality level at runtime to hold the frame time budget")
+    parser.add_argument('--frame-budget-ms', type=float, default=33.3,
+                        help="per-frame processing budget for --adaptive-quality (default: 33.3)")
+    parser.add_argument('--idle-after', type=float, default=10.0,
+                        help="seconds without a hand before dropping to low-power idle (0 disables, default: 10)")
+    parser.add_argument('--idle-fps', type=float, default=5.0,
+                        help="frames checked for motion per second while idle (default: 5)")
+    parser.add_argument('--predict', action='store_true',
+                        help="extrapolate the cursor by the measured motion-to-cursor latency")
+    parser.add_argument('--no-preview', action='store_true',
+                        help="production mode: no preview window and no drawing work")
+    parser.add_argument('--preview-fps', type=float, default=15.0,
+                        help="preview window frame rate, independent of inference (default: 15)")
+    parser.add_argument('--preview-scale', type=float, default=1.0,
+                        help="preview window resolution relative to the camera (e.g. 0.5)")
+    parser.add_argument('--metrics', action='store_true',
+                        help="time each stage of the video loop")
+    parser.add_argument('--metrics-file', metavar='FILE',
+                        help="periodically export stage latency to a .csv or .jsonl file")
+    parser.add_argument('--metrics-interval', type=float, default=5.0,
+                        help="seconds between metric exports (default: 5)")
+    parser.add_argument('--metrics-overlay', action='store_true',
+                        help="draw FPS and per-stage latency on the preview window")
+    parser.add_argument('--record', metavar='FILE',
+                        help="log landmarks, gestures and actions of every frame to a .gsr session file "
+                             "(replay it with --benchmark)")
+    parser.add_argument('--event-server', metavar='ADDRESS',
+                        help="publish gesture, cursor and landmark events on a UNIX socket "
+                             "('unix:PATH' or a path) or localhost TCP ('PORT' or 'HOST:PORT')")
+    parser.add_argument('--event-allow-remote', action='store_true',
+                        help="let --event-server listen on a TCP address other than loopback")
+    parser.add_argument('--events', metavar='ADDRESS',
+                        help="print the event stream of a running instance")
+    parser.add_argument('--event-types', nargs='+', choices=EVENT_TYPES, default=list(EVENT_TYPES),
+                        help="event types --events subscribes to (default: all)")
+    parser.add_argument('--event-clients', type=int, default=1,
+                        help="subscriber processes reading the event stream in benchmarks (default: 1)")
+    parser.add_argument('--slow-client-ms', type=float, default=0.0,
+                        help="make the last benchmark subscriber sleep this long per batch")
+    parser.add_argument('--compare-classifiers', nargs='+', metavar='FILE',
+                        help="compare accuracy and per-frame cost of the classifier backends")
+    return parser.parse_args(argv)
+
+
 # Run the application
 if __name__ == "__main__":
+    args = parse_args()
+    if args.cold_start_probe:
+        cold_start_probe(args.cold_start_probe, args.launched_at)
+        sys.exit(0)
+    if args.benchmark or args.cold_start or args.source_scaling:
+        sys.exit(run_benchmark(args))
+    if args.events:
+        print_events(args.events, args.event_types)
+        sys.exit(0)
+    if args.relabel:
+        relabel_recording(*args.relabel, default_fps=args.fps,
+                          classifier=create_classifier(args.classifier, args.templates))
+        sys.exit(0)
+    if args.build_templates:
+        build_templates(*args.build_templates)
+        sys.exit(0)
+    if args.evaluate_filters:
+        filters = {name: cls() for name, cls in CURSOR_FILTERS.items()}
+        filters[args.filter] = create_cursor_filter(args.filter, args.filter_param)
+        evaluate_cursor_filters(args.evaluate_filters, filters, default_fps=args.fps)
+        sys.exit(0)
+    if args.compare_classifiers:
+        backends = [RuleChainClassifier(), MaskTableClassifier()]
+        if args.templates:
+            backends.append(create_classifier('template', args.templates))
+        compare_classifiers(args.compare_classifiers, backends, default_fps=args.fps)
+        sys.exit(0)
+    
     print("Starting Hand Gesture Cursor Controller...")
     print("Make sure you have installed the required packages:")
     print("pip install opencv-python mediapipe pyautogui")
     print()
     
     try:
-        app = HandGestureCursorController()
+        app = HandGestureCursorController(classifier=create_classifier(args.classifier, args.templates),
+                                          async_actions=not args.sync_actions)
+        try:
+            apply_options(app, args)
+        except ValueError as e:
+            app.stop_recording()
+            app.root.destroy()
+            print(f"Invalid option: {e}")
+            sys.exit(2)
         app.run()
     except Exception as e:
         print(f"Error starting application: {e}")
-        input("Press Enter to exit...")
\ No newline at end of file
+        input("Press Enter to exit...")
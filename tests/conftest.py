@@ -0,0 +1,36 @@
+import importlib.util
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+
+# gesture-control.py is a script rather than an importable module, load it by path
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+spec = importlib.util.spec_from_file_location('gesture_control', ROOT / 'gesture-control.py')
+gesture_control = importlib.util.module_from_spec(spec)
+sys.modules['gesture_control'] = gesture_control
+spec.loader.exec_module(gesture_control)
+
+
+def hand_landmarks(fingers=(0, 0, 0, 0, 0), thumb_up=True, center=(0.5, 0.5)):
+    """Synthetic (21, 3) landmarks with the given fingers (thumb first) extended.
+    
+    Only the joints the classifiers compare are placed: each tip is moved
+    past its PIP joint when the finger is extended and short of it when
+    folded, landmark 9 (the palm) sits at `center` and the wrist below it.
+    """
+    cx, cy = center
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[:, 0], points[:, 1] = cx, cy
+    points[0, 1] = cy + 0.2
+    points[4, 0] = cx - 0.1 if fingers[0] else cx + 0.05
+    points[4, 1] = cy - 0.1 if thumb_up else cy + 0.1
+    for extended, tip in zip(fingers[1:], (8, 12, 16, 20)):
+        points[tip, 1] = cy - 0.1 if extended else cy + 0.05
+    return points
+
+
+@pytest.fixture
+def make_hand():
+    return hand_landmarks
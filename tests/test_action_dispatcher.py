@@ -0,0 +1,65 @@
+import threading
+
+from gesture_control import ActionDispatcher, RecordingActionSink
+
+
+class BlockingSink(RecordingActionSink):
+    """Records actions, holding the dispatcher in its first action until released"""
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+    
+    def _record(self, action, *args):
+        self.entered.set()
+        self.release.wait(5.0)
+        super()._record(action, *args)
+
+
+def blocked_dispatcher(max_queue=64):
+    """Dispatcher whose worker is stuck injecting a first click"""
+    sink = BlockingSink()
+    dispatcher = ActionDispatcher(sink, max_queue=max_queue)
+    dispatcher.click(0, 0)
+    assert sink.entered.wait(5.0)
+    return dispatcher, sink
+
+
+def test_consecutive_moves_coalesce_to_the_newest_target():
+    dispatcher, sink = blocked_dispatcher()
+    for x in range(10):
+        dispatcher.move_to(x, 0)
+    dispatcher.click(5, 5)
+    dispatcher.move_to(20, 0)
+    sink.release.set()
+    assert dispatcher.flush(5.0)
+    dispatcher.close()
+    
+    assert list(sink.history) == [('click', 0, 0), ('move_to', 9, 0), ('click', 5, 5), ('move_to', 20, 0)]
+    assert dispatcher.stats()['coalesced'] == 9
+
+
+def test_full_queue_drops_stale_moves_but_never_button_actions():
+    dispatcher, sink = blocked_dispatcher(max_queue=2)
+    dispatcher.move_to(1, 1)
+    dispatcher.scroll(3)
+    dispatcher.scroll(-3)  # Full: the stale move makes room
+    dispatcher.scroll(1)   # Full, nothing stale: dropped
+    dispatcher.mouse_down(2, 2)
+    dispatcher.mouse_up()  # Queued past the limit, a lost release would leave the button held
+    sink.release.set()
+    assert dispatcher.flush(5.0)
+    dispatcher.close()
+    
+    assert [entry[0] for entry in sink.history] == ['click', 'scroll', 'scroll', 'mouse_down', 'mouse_up']
+    assert dispatcher.stats()['dropped'] == 2
+
+
+def test_close_injects_what_is_still_queued():
+    dispatcher, sink = blocked_dispatcher()
+    dispatcher.mouse_up()
+    sink.release.set()
+    dispatcher.close(5.0)
+    assert sink.counts['mouse_up'] == 1
+    dispatcher.mouse_down(0, 0)  # Ignored once closed
+    assert sink.counts['mouse_down'] == 0
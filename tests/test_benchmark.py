@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from gesture_control import HandGestureCursorController, PipelineBenchmark, RecordingActionSink
+from conftest import hand_landmarks
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Two thirds of a second each at 30 FPS: point, peace (click), open hand (right click), no hand"""
+    frames = [hand_landmarks((0, 1, 0, 0, 0))] * 20 + [hand_landmarks((0, 1, 1, 0, 0))] * 20 + \
+             [hand_landmarks((1, 1, 1, 1, 1))] * 20 + [np.full((21, 3), np.nan, dtype=np.float32)] * 20
+    path = tmp_path / 'sequence.npy'
+    np.save(path, np.stack(frames))
+    return str(path)
+
+
+def benchmark():
+    controller = HandGestureCursorController(headless=True, action_sink=RecordingActionSink(),
+                                             async_actions=False)
+    return PipelineBenchmark(controller)
+
+
+def test_replay_runs_the_gesture_pipeline(recording):
+    bench = benchmark()
+    bench.run(recording)
+    report = bench.report()
+    assert report['frames'] == 80
+    assert report['actions']['click'] == 1
+    assert report['actions']['right_click'] == 1
+    assert report['stages']['frame']['count'] == 80
+
+
+def test_repeated_passes_each_act_like_the_first(recording):
+    bench = benchmark()
+    for _ in range(3):
+        bench.run(recording)
+    report = bench.report()
+    assert report['frames'] == 240
+    assert report['actions']['click'] == 3
+    assert report['actions']['right_click'] == 3
+    assert report['stages']['confirm']['count'] == 3 * 3  # point, peace, open hand per pass
+
+
+def test_load_landmarks_checks_the_shape(tmp_path):
+    path = tmp_path / 'bad.npy'
+    np.save(path, np.zeros((10, 20, 3), dtype=np.float32))
+    with pytest.raises(ValueError):
+        PipelineBenchmark.load_landmarks(str(path))
@@ -0,0 +1,33 @@
+import numpy as np
+
+from gesture_control import classify_gestures, finger_masks, finger_states
+
+
+def test_finger_states_of_a_single_hand_and_a_batch(make_hand):
+    peace = make_hand((0, 1, 1, 0, 0))
+    assert finger_states(peace).tolist() == [0, 1, 1, 0, 0]
+    
+    batch = np.stack([peace, make_hand((1, 1, 1, 1, 1))])
+    assert finger_states(batch).tolist() == [[0, 1, 1, 0, 0], [1, 1, 1, 1, 1]]
+    assert finger_masks(batch).tolist() == [0b01100, 0b11111]
+
+
+def test_classify_gestures_labels_every_frame(make_hand):
+    frames = np.stack([
+        make_hand((0, 1, 0, 0, 0)),
+        make_hand((0, 1, 1, 0, 0)),
+        make_hand((1, 1, 1, 1, 1)),
+        make_hand((0, 0, 0, 0, 0)),
+        make_hand((1, 0, 0, 0, 0), thumb_up=True),
+        make_hand((1, 0, 0, 0, 0), thumb_up=False),
+        np.full((21, 3), np.nan, dtype=np.float32),  # No hand in the frame
+    ])
+    assert classify_gestures(frames).tolist() == [
+        'point', 'peace', 'open_hand', 'fist', 'thumbs_up', 'thumbs_down', 'none']
+
+
+def test_pinch_is_thumb_and_index_tips_together(make_hand):
+    points = make_hand((1, 1, 0, 0, 0))
+    assert classify_gestures(points[None])[0] == 'unknown'
+    points[8, :2] = points[4, :2] + 0.01
+    assert classify_gestures(points[None])[0] == 'pinch'
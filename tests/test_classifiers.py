@@ -0,0 +1,49 @@
+import itertools
+
+import numpy as np
+
+from gesture_control import (MaskTableClassifier, RuleChainClassifier, TemplateClassifier,
+                             create_classifier)
+from conftest import hand_landmarks
+
+
+def every_mask():
+    """One synthetic hand per finger mask, with the thumb up and down"""
+    return np.stack([hand_landmarks(fingers, thumb_up)
+                     for fingers in itertools.product((0, 1), repeat=5) for thumb_up in (True, False)])
+
+
+def test_mask_table_matches_the_rule_chain():
+    frames = every_mask()
+    chain, table = RuleChainClassifier(), MaskTableClassifier()
+    expected = [chain.classify(points) for points in frames]
+    assert [table.classify(points) for points in frames] == expected
+    assert table.classify_batch(frames).tolist() == expected
+    assert chain.classify_batch(frames).tolist() == expected
+
+
+def test_mask_table_takes_new_rules():
+    table = MaskTableClassifier({**MaskTableClassifier.DEFAULT_RULES, 0b01110: 'three'})
+    assert table.classify(hand_landmarks((0, 1, 1, 1, 0))) == 'three'
+
+
+def test_template_classifier_matches_the_nearest_template():
+    templates = np.stack([hand_landmarks((0, 1, 0, 0, 0)), hand_landmarks((1, 1, 1, 1, 1))])
+    classifier = TemplateClassifier(templates, ['point', 'open_hand'], max_distance=0.3)
+    
+    # Matching is translation invariant
+    assert classifier.classify(hand_landmarks((0, 1, 0, 0, 0), center=(0.3, 0.6))) == 'point'
+    frames = np.stack([hand_landmarks((1, 1, 1, 1, 1)), np.full((21, 3), np.nan, dtype=np.float32)])
+    assert classifier.classify_batch(frames).tolist() == ['open_hand', 'none']
+
+
+def test_template_classifier_falls_back_when_nothing_is_close(tmp_path):
+    templates = np.stack([hand_landmarks((0, 1, 0, 0, 0))])
+    fist = hand_landmarks((0, 0, 0, 0, 0))
+    assert TemplateClassifier(templates, ['point'], max_distance=0.1).classify(fist) == 'unknown'
+    
+    path = tmp_path / 'templates.npz'
+    TemplateClassifier(templates, ['point'], max_distance=0.1).save(path)
+    classifier = create_classifier('template', str(path))
+    assert classifier.classify(hand_landmarks((0, 1, 0, 0, 0))) == 'point'
+    assert classifier.classify(fist) == 'fist'  # Mask table fallback
@@ -0,0 +1,46 @@
+import pytest
+
+from gesture_control import CURSOR_FILTERS, ExponentialFilter, OneEuroFilter, create_cursor_filter
+
+
+@pytest.mark.parametrize('name', sorted(CURSOR_FILTERS))
+def test_filter_starts_at_the_first_sample_and_settles_on_a_step(name):
+    cursor_filter = CURSOR_FILTERS[name]()
+    assert cursor_filter(100.0, 200.0, 0.0) == (100.0, 200.0)
+    
+    positions = [cursor_filter(300.0, 200.0, (i + 1) / 30.0)[0] for i in range(90)]
+    assert all(100.0 < x for x in positions)
+    assert positions[-1] == pytest.approx(300.0, abs=2.0)
+
+
+@pytest.mark.parametrize('name', sorted(CURSOR_FILTERS))
+def test_filter_reset_forgets_the_old_position(name):
+    cursor_filter = CURSOR_FILTERS[name]()
+    cursor_filter(0.0, 0.0, 0.0)
+    cursor_filter.reset()
+    assert cursor_filter(500.0, 500.0, 1.0) == (500.0, 500.0)
+
+
+def test_exponential_smoothing_does_not_depend_on_the_frame_rate():
+    at_30 = ExponentialFilter()
+    at_60 = ExponentialFilter()
+    at_30(0.0, 0.0, 0.0)
+    at_60(0.0, 0.0, 0.0)
+    at_60(100.0, 0.0, 1 / 60)
+    assert at_60(100.0, 0.0, 2 / 60)[0] == pytest.approx(at_30(100.0, 0.0, 1 / 30)[0])
+
+
+def test_one_euro_lags_less_when_moving_fast():
+    def lag(speed):
+        cursor_filter = OneEuroFilter()
+        for i in range(60):
+            x, _ = cursor_filter(speed * i / 60, 0.0, i / 60)
+        return speed * 59 / 60 - x
+    
+    slow, fast = lag(100.0), lag(3000.0)
+    assert fast / 3000.0 < slow / 100.0  # Relative lag shrinks as the cutoff opens
+
+
+def test_create_cursor_filter_takes_parameters():
+    cursor_filter = create_cursor_filter('one_euro', ['min_cutoff=2.5', 'beta=0.1'])
+    assert (cursor_filter.min_cutoff, cursor_filter.beta) == (2.5, 0.1)
@@ -0,0 +1,106 @@
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from gesture_control import (EVENT_CURSOR, EventClient, EventServer, EventSubscriber, HandState,
+                             GestureStateMachine, create_cursor_filter)
+
+
+@pytest.fixture
+def address(tmp_path):
+    return f"unix:{tmp_path / 'events.sock'}"
+
+
+def tracked_hand():
+    return HandState((1, 3), GestureStateMachine(), create_cursor_filter(), handedness='Left')
+
+
+def wait_for_subscriber(server):
+    for _ in range(200):
+        if server.subscribers:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("client never subscribed")
+
+
+def test_published_events_reach_a_client(address):
+    server = EventServer(address)
+    client = EventClient(address)
+    try:
+        wait_for_subscriber(server)
+        points = np.arange(63, dtype=np.float32).reshape(21, 3)
+        server.publish_hand(tracked_hand(), 1.5, points, 'point', 'peace', 0.75, 10.0, 20.0)
+        server.flush()
+        
+        _, events = client.read_batch()
+        assert [event.kind for event in events] == ['landmarks', 'gesture', 'cursor']
+        assert all(event[1:5] == (1, 'Left', 3, 1.5) for event in events)
+        assert np.array_equal(events[0].data, points)
+        assert events[1].data == ('point', 'peace', 0.75)
+        assert events[2].data == (10.0, 20.0)
+    finally:
+        client.close()
+        server.close()
+
+
+def test_clients_only_get_the_types_they_asked_for(address):
+    server = EventServer(address)
+    client = EventClient(address, types=('cursor',))
+    try:
+        wait_for_subscriber(server)
+        server.publish_hand(tracked_hand(), 0.0, np.zeros((21, 3)), 'none', 'none', 1.0, 1.0, 2.0)
+        server.flush()
+        _, events = client.read_batch()
+        assert [event.kind for event in events] == ['cursor']
+    finally:
+        client.close()
+        server.close()
+
+
+def test_slow_subscriber_loses_the_oldest_batches():
+    ours, theirs = socket.socketpair()
+    subscriber = EventSubscriber(ours, 1 << EVENT_CURSOR, max_batches=4)
+    total = 0
+    for i in range(2000):
+        subscriber.put(b'x' * 1024, 10, float(i))  # Nobody reads: the socket buffer fills
+        total += 10
+    assert subscriber.dropped > 0
+    theirs.close()
+    subscriber.close()
+    subscriber.thread.join(1.0)
+    assert subscriber.sent + subscriber.dropped == total
+
+
+def test_socket_of_a_running_server_is_not_taken_over(address):
+    server = EventServer(address)
+    try:
+        with pytest.raises(ValueError, match='in use'):
+            EventServer(address)
+    finally:
+        server.close()
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    path = str(tmp_path / 'events.sock')
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()  # Left behind by a run that crashed
+    EventServer(path).close()
+
+
+def test_close_leaves_a_newer_socket_alone(tmp_path):
+    path = tmp_path / 'events.sock'
+    server = EventServer(str(path))
+    path.unlink()
+    replacement = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    replacement.bind(str(path))
+    server.close()
+    assert path.exists()
+    replacement.close()
+
+
+def test_non_loopback_address_needs_allow_remote():
+    with pytest.raises(ValueError, match='loopback'):
+        EventServer('192.0.2.1:0')
@@ -0,0 +1,37 @@
+import threading
+
+import numpy as np
+
+from gesture_control import LatestFrameBuffer
+
+
+def frame(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+def test_newest_frame_wins_and_overwritten_frames_are_counted():
+    buffer = LatestFrameBuffer()
+    for i in range(3):
+        buffer.put(frame(i), timestamp=float(i))
+    
+    got, timestamp, frame_id = buffer.get(timeout=0.1)
+    assert got[0, 0, 0] == 2 and timestamp == 2.0 and frame_id == 3
+    assert buffer.captured_frames == 3
+    assert buffer.dropped_frames == 2
+
+
+def test_get_waits_for_a_newer_frame():
+    buffer = LatestFrameBuffer()
+    buffer.put(frame(1), 1.0)
+    assert buffer.get(timeout=0.1) is not None
+    assert buffer.get(timeout=0.01) is None  # Already consumed
+    
+    threading.Timer(0.05, buffer.put, (frame(2), 2.0)).start()
+    assert buffer.get(timeout=1.0)[1] == 2.0
+
+
+def test_close_wakes_the_consumer():
+    buffer = LatestFrameBuffer()
+    threading.Timer(0.05, buffer.close).start()
+    assert buffer.get(timeout=5.0) is None
+    assert buffer.closed
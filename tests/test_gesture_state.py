@@ -0,0 +1,53 @@
+import pytest
+
+from gesture_control import GestureStateMachine, parse_gesture_repeat
+
+
+def feed(machine, gestures, start=0.0, fps=30.0):
+    """Feed one classification per frame; returns the confirmed gesture after each"""
+    return [machine.update(gesture, start + i / fps) for i, gesture in enumerate(gestures)]
+
+
+def test_gesture_is_confirmed_after_enough_consistent_votes():
+    machine = GestureStateMachine()
+    confirmed = feed(machine, ['point'] * 6)
+    assert confirmed[:3] == ['none'] * 3
+    assert confirmed[3] == 'point'  # min_votes frames
+    assert machine.delay == pytest.approx(3 / 30)
+
+
+def test_single_misclassified_frame_neither_fires_nor_cancels():
+    machine = GestureStateMachine()
+    assert feed(machine, ['none'] * 5 + ['peace'] + ['none'] * 5)[-1] == 'none'
+    
+    machine = GestureStateMachine()
+    confirmed = feed(machine, ['point'] * 8 + ['fist'] + ['point'] * 3)
+    assert confirmed[8:] == ['point'] * 4
+
+
+def test_gesture_is_dropped_when_it_loses_the_vote():
+    machine = GestureStateMachine()
+    confirmed = feed(machine, ['point'] * 8 + ['none'] * 8)
+    assert confirmed[-1] == 'none'
+
+
+def test_low_confidence_frames_carry_less_weight():
+    machine = GestureStateMachine()
+    for i in range(8):
+        machine.update('point', i / 30)
+    for i in range(8, 12):
+        machine.update('fist', i / 30, weight=0.1)
+    assert machine.active == 'point'
+
+
+def test_repeat_table_decides_when_actions_fire():
+    machine = GestureStateMachine(repeat=parse_gesture_repeat(['thumbs_up=0.5', 'peace=once']))
+    feed(machine, ['thumbs_up'] * 4)
+    assert machine.due(0.1) and not machine.due(0.3) and machine.due(0.7)
+    
+    feed(machine, ['peace'] * 8, start=1.0)
+    assert machine.active == 'peace'
+    assert machine.due(1.3) and not machine.due(5.0)
+    
+    with pytest.raises(ValueError):
+        parse_gesture_repeat(['wave=1'])
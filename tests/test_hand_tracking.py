@@ -0,0 +1,74 @@
+import pytest
+
+from gesture_control import ActionArbiter, HandDetection, HandGestureCursorController, RecordingActionSink
+from conftest import hand_landmarks
+
+
+@pytest.fixture
+def controller():
+    controller = HandGestureCursorController(headless=True, action_sink=RecordingActionSink(),
+                                             async_actions=False)
+    controller.detector_options['max_num_hands'] = 2
+    return controller
+
+
+def hand(x, label='Right'):
+    return HandDetection(hand_landmarks(center=(x, 0.5)), label, 0.9)
+
+
+def test_hands_keep_their_state_as_they_move(controller):
+    left, right = controller.track_hands(0, [hand(0.2, 'Left'), hand(0.8)])
+    # Reported in the other order and slightly moved
+    hands = controller.track_hands(0, [hand(0.82), hand(0.22, 'Left')])
+    assert hands == [right, left]
+    assert left.key != right.key
+
+
+def test_flickering_label_keeps_a_single_hand(controller):
+    controller.detector_options['max_num_hands'] = 1
+    first, = controller.track_hands(0, [hand(0.5)])
+    second, = controller.track_hands(0, [hand(0.51, 'Left')])
+    assert second is first
+    assert second.handedness == 'Left'
+
+
+def test_sources_track_their_hands_separately(controller):
+    first, = controller.track_hands(0, [hand(0.5)])
+    other, = controller.track_hands(1, [hand(0.5)])
+    assert other is not first
+    assert other.key[0] == 1
+
+
+def test_hand_is_dropped_after_the_grace_frames(controller):
+    tracked, = controller.track_hands(0, [hand(0.5)])
+    for _ in range(controller.hand_grace):
+        controller.track_hands(0, [])
+    assert tracked.key in controller.hand_states
+    controller.track_hands(0, [])
+    assert tracked.key not in controller.hand_states
+    assert controller.track_hands(0, [hand(0.5)])[0] is not tracked
+
+
+def test_a_channel_belongs_to_one_hand_until_handoff():
+    arbiter = ActionArbiter(handoff=0.5)
+    assert arbiter.request('a', 'cursor', 0.0)
+    assert not arbiter.request('b', 'cursor', 0.2)
+    assert arbiter.request('b', 'click', 0.2)  # Other channels are free
+    assert arbiter.request('b', 'cursor', 0.6)
+    assert arbiter.conflicts['cursor'] == 1
+
+
+def test_held_channel_waits_for_release():
+    arbiter = ActionArbiter(handoff=0.5)
+    arbiter.request('a', 'cursor', 0.0, hold=True)
+    assert not arbiter.request('b', 'cursor', 5.0)
+    arbiter.release('a')
+    assert arbiter.request('b', 'cursor', 5.0)
+
+
+def test_clicks_of_another_hand_land_at_the_cursor():
+    arbiter = ActionArbiter()
+    arbiter.request('a', 'cursor', 0.0)
+    arbiter.cursor = (100, 200)
+    assert arbiter.target('b', (5, 5), 0.1) == (100, 200)
+    assert arbiter.target('a', (5, 5), 0.1) == (5, 5)
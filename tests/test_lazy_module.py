@@ -0,0 +1,48 @@
+import sys
+import types
+
+import pytest
+
+from gesture_control import LazyModule
+
+
+@pytest.fixture
+def fake_module(monkeypatch):
+    """A module that records being imported"""
+    imported = []
+    
+    def import_module(name):
+        imported.append(name)
+        module = types.ModuleType(name)
+        module.PAUSE = 0.1
+        module.answer = lambda: 42
+        return module
+    
+    monkeypatch.setattr(sys.modules['gesture_control'].importlib, 'import_module', import_module)
+    return imported
+
+
+def test_nothing_is_imported_until_first_use(fake_module):
+    module = LazyModule('heavy_backend')
+    assert fake_module == []
+    assert module.answer() == 42
+    assert fake_module == ['heavy_backend']
+
+
+def test_module_is_imported_once(fake_module):
+    module = LazyModule('heavy_backend')
+    module.answer()
+    module.PAUSE
+    assert fake_module == ['heavy_backend']
+
+
+def test_settings_are_forwarded_to_the_module(fake_module):
+    module = LazyModule('heavy_backend')
+    module.PAUSE = 0
+    assert module.load().PAUSE == 0
+    assert module.PAUSE == 0
+
+
+def test_missing_attributes_raise(fake_module):
+    with pytest.raises(AttributeError):
+        LazyModule('heavy_backend').missing
@@ -0,0 +1,33 @@
+import pytest
+
+from gesture_control import LatencyStats, RollingHistogram
+
+
+def test_rolling_histogram_percentiles_cover_the_samples():
+    histogram = RollingHistogram(window=100)
+    for ms in range(1, 101):
+        histogram.add(float(ms))
+    assert histogram.mean == pytest.approx(50.5)
+    # Percentiles are bin upper edges: at most one bin (~10%) above the sample
+    assert 50.0 <= histogram.percentile(50) <= 55.0
+    assert 95.0 <= histogram.percentile(95) <= 105.0
+
+
+def test_rolling_histogram_forgets_samples_outside_the_window():
+    histogram = RollingHistogram(window=10)
+    for _ in range(10):
+        histogram.add(1000.0)
+    for _ in range(10):
+        histogram.add(1.0)
+    assert histogram.mean == pytest.approx(1.0)
+    assert 1.0 <= histogram.percentile(99) <= 1.1
+
+
+def test_latency_stats_summary_per_stage():
+    stats = LatencyStats()
+    for ms in (1.0, 2.0, 3.0, 4.0):
+        stats.add('inference', ms / 1000.0)
+    row = stats.summary()['inference']
+    assert row['count'] == 4
+    assert row['mean_ms'] == pytest.approx(2.5)
+    assert row['p50_ms'] == pytest.approx(2.5)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from gesture_control import MotionGate
+
+
+def frame(value=0, shape=(480, 640, 3)):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+def test_first_frame_is_only_a_reference():
+    assert MotionGate().update(frame()) is False
+
+
+def test_still_frames_are_not_motion():
+    gate = MotionGate()
+    gate.update(frame(40))
+    assert gate.update(frame(40)) is False
+    assert gate.update(frame(45)) is False  # Sensor noise, under the threshold
+
+
+def test_a_large_change_is_motion():
+    gate = MotionGate()
+    gate.update(frame(40))
+    moved = frame(40)
+    moved[100:300, 200:400] = 200  # A hand entering the view
+    assert gate.update(moved)
+
+
+def test_small_changed_area_is_ignored():
+    gate = MotionGate(min_fraction=0.05)
+    gate.update(frame(40))
+    moved = frame(40)
+    moved[:20, :20] = 200
+    assert not gate.update(moved)
+
+
+def test_resolution_change_starts_over():
+    gate = MotionGate()
+    gate.update(frame(40))
+    assert gate.update(frame(200, shape=(240, 320, 3))) is False
+    assert gate.update(frame(200, shape=(240, 320, 3))) is False
@@ -0,0 +1,35 @@
+import pytest
+
+from gesture_control import MotionPredictor
+
+
+def track(predictor, speed, frames=10, fps=60.0, latency=0.05):
+    """Feed a constant-speed horizontal move; returns the last (raw x, predicted x)"""
+    for i in range(frames):
+        x = speed * i / fps
+        predicted = predictor(x, 0.0, i / fps, latency)[0]
+    return x, predicted
+
+
+def test_no_lead_when_the_hand_is_slow():
+    x, predicted = track(MotionPredictor(), speed=20.0)
+    assert predicted == x
+
+
+def test_lead_follows_the_motion_by_the_latency():
+    x, predicted = track(MotionPredictor(), speed=400.0)
+    assert predicted - x == pytest.approx(400.0 * 0.05, rel=0.1)
+
+
+def test_lead_is_capped():
+    predictor = MotionPredictor(max_lead=30.0)
+    x, predicted = track(predictor, speed=4000.0, latency=0.5)
+    assert predicted - x == pytest.approx(30.0)
+
+
+def test_no_lead_against_the_motion_when_stopping():
+    predictor = MotionPredictor()
+    track(predictor, speed=1000.0)
+    # Hard stop: deceleration outweighs the remaining velocity
+    x, _ = predictor(1000.0 * 9 / 60 + 1.0, 0.0, 10 / 60, 0.15)
+    assert predictor(x, 0.0, 11 / 60, 0.15)[0] == x
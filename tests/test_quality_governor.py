@@ -0,0 +1,44 @@
+import pytest
+
+from gesture_control import QUALITY_LEVELS, QualityGovernor
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    monkeypatch.setattr(QualityGovernor, 'system_load', staticmethod(lambda: None))
+    return QualityGovernor(budget_ms=20.0, level=1, window=10, hold=1.0, upgrade_wait=2.0)
+
+
+def observe(governor, ms, start, frames=10, fps=30.0):
+    """Feed frames of a fixed processing time; returns the changes made"""
+    changes = []
+    for i in range(frames):
+        change = governor.observe(ms / 1000.0, start + i / fps)
+        if change is not None:
+            changes.append(change[0])
+    return changes
+
+
+def test_quality_drops_when_frames_exceed_the_budget(governor):
+    assert observe(governor, 30.0, start=0.0, frames=40) == [2]
+    assert governor.level == 2
+
+
+def test_quality_waits_for_a_full_window_and_the_hold_time(governor):
+    assert observe(governor, 30.0, start=0.0, frames=9) == []  # Window not yet full
+    assert observe(governor, 30.0, start=0.5, frames=1) == []  # Within the hold time
+    assert observe(governor, 30.0, start=1.0, frames=1) == [2]
+
+
+def test_quality_rises_only_with_headroom_after_the_upgrade_wait(governor):
+    assert observe(governor, 15.0, start=0.0, frames=90) == []  # Under budget, but not by enough
+    assert observe(governor, 5.0, start=3.0, frames=90) == [0]
+    assert governor.level == 0
+
+
+def test_level_left_right_after_an_upgrade_waits_longer(governor):
+    observe(governor, 5.0, start=0.0, frames=90)      # Up to level 0 at t=2
+    observe(governor, 30.0, start=3.0, frames=30)     # Straight back down
+    assert governor.level == 1
+    assert governor.upgrade_wait[0] == 4.0
+    assert governor.level + 1 < len(QUALITY_LEVELS)
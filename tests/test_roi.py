@@ -0,0 +1,31 @@
+from gesture_control import RoiTracker
+
+
+def test_first_region_is_the_whole_frame():
+    assert RoiTracker().region(640, 480) == (0, 0, 640, 480)
+
+
+def test_box_fits_the_hand_and_holds_while_it_stays_inside(make_hand):
+    tracker = RoiTracker()
+    tracker.update(make_hand(center=(0.5, 0.5)), 640, 480)
+    box = tracker.region(640, 480)
+    x0, y0, x1, y1 = box
+    assert x0 <= 0.4 * 640 and x1 >= 0.6 * 640 and y0 <= 0.4 * 480 and y1 >= 0.7 * 480
+    assert x1 - x0 == y1 - y0  # Square crop
+    
+    # A small move inside the box keeps the crop stable for MediaPipe's tracker
+    tracker.update(make_hand(center=(0.51, 0.5)), 640, 480)
+    assert tracker.region(640, 480) == box
+
+
+def test_box_recenters_and_stays_in_the_frame(make_hand):
+    tracker = RoiTracker()
+    tracker.update(make_hand(center=(0.5, 0.5)), 640, 480)
+    first = tracker.region(640, 480)
+    tracker.update(make_hand(center=(0.9, 0.5)), 640, 480)
+    x0, y0, x1, y1 = tracker.region(640, 480)
+    assert (x0, y0, x1, y1) != first
+    assert 0 <= x0 and x1 <= 640 and 0 <= y0 and y1 <= 480
+    
+    tracker.reset()
+    assert tracker.region(640, 480) == (0, 0, 640, 480)
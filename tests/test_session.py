@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from gesture_control import (HandDetection, HandGestureCursorController, PipelineBenchmark,
+                             RecordingActionSink, SESSION_RECORD, SessionRecorder, load_session)
+from conftest import hand_landmarks
+
+
+def test_recorded_session_reads_back_record_for_record(tmp_path):
+    path = str(tmp_path / 'session.gsr')
+    recorder = SessionRecorder(path, batch_size=4)  # Several full batches and a partial one
+    points = [hand_landmarks(center=(0.1 * i, 0.5)) for i in range(10)]
+    for i, hand in enumerate(points):
+        if i % 3 == 0:
+            recorder.note_action('click')
+        recorder.add(i / 30, hand, 'Right', 0.9, 'peace', 'point', hands=1, frame=i)
+    recorder.add(10 / 30, frame=10)  # A frame without a hand
+    recorder.close()
+    
+    records = load_session(path)
+    assert len(records) == recorder.records == 11
+    assert np.allclose(records['landmarks'][:10], np.stack(points))
+    assert np.isnan(records['landmarks'][10]).all()
+    assert records['frame'].tolist() == list(range(11))
+    assert records['timestamp'][3] == pytest.approx(0.1)
+    assert records['action'].tolist()[:4] == [2, 0, 0, 2]  # SESSION_ACTIONS 'click'
+    assert (records['handedness'][:10] == 2).all()
+
+
+def test_truncated_recording_drops_the_partial_record(tmp_path):
+    path = tmp_path / 'session.gsr'
+    recorder = SessionRecorder(str(path))
+    for i in range(3):
+        recorder.add(float(i), hand_landmarks(), frame=i)
+    recorder.close()
+    
+    with open(path, 'ab') as f:
+        f.write(b'\0' * (SESSION_RECORD.itemsize // 2))  # Crash mid-write
+    assert len(load_session(str(path))) == 3
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / 'session.gsr'
+    path.write_bytes(b'not a session at all')
+    with pytest.raises(ValueError):
+        load_session(str(path))
+
+
+def test_recorded_run_replays_with_the_same_actions(tmp_path):
+    path = str(tmp_path / 'session.gsr')
+    frames = [hand_landmarks((0, 1, 0, 0, 0))] * 15 + [hand_landmarks((0, 1, 1, 0, 0))] * 15
+    
+    controller = HandGestureCursorController(headless=True, action_sink=RecordingActionSink(),
+                                             async_actions=False)
+    controller.start_recording(path)
+    bench = PipelineBenchmark(controller)
+    for i, points in enumerate(frames + [None] * 15):
+        bench.process_frame([HandDetection(points, 'Right', 0.9)] if points is not None else [], i / 30, 0.0)
+    controller.stop_recording()
+    
+    replay = PipelineBenchmark(HandGestureCursorController(headless=True, action_sink=RecordingActionSink(),
+                                                           async_actions=False))
+    replay.run(path)
+    assert replay.report()['actions'] == bench.report()['actions']
+    assert replay.report()['actions']['click'] == 1
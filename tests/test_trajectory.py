@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+
+from gesture_control import TrajectoryRecognizer
+from conftest import hand_landmarks
+
+
+def run(recognizer, positions, start=0.0, fps=60.0):
+    """Feed palm positions (raw camera x, y); returns (frame, event) for every event"""
+    events = []
+    for i, (x, y) in enumerate(positions):
+        event = recognizer.update(hand_landmarks(center=(x, y)), start + i / fps)
+        if event is not None:
+            events.append((i, event))
+    return events
+
+
+def swipe(x0, x1, frames=18, y=0.5):
+    return [(x0 + (x1 - x0) * i / (frames - 1), y) for i in range(frames)]
+
+
+def test_one_swipe_fires_once_however_far_it_travels():
+    recognizer = TrajectoryRecognizer()
+    # Palm moves right to left in the camera image, left to right on screen
+    events = run(recognizer, swipe(0.9, 0.1))
+    assert [event[0] for _, event in events] == ['swipe_right']
+
+
+def test_next_swipe_fires_once_the_palm_was_still():
+    recognizer = TrajectoryRecognizer()
+    positions = swipe(0.8, 0.2) + [(0.2, 0.5)] * 30 + swipe(0.2, 0.8)
+    events = run(recognizer, positions)
+    assert [event[0] for _, event in events] == ['swipe_right', 'swipe_left']
+
+
+def test_vertical_swipes_and_slow_drift():
+    downwards = [(0.5, 0.2 + 0.6 * i / 17) for i in range(18)]
+    assert [event[0] for _, event in run(TrajectoryRecognizer(), downwards)] == ['swipe_down']
+    # The same distance over two seconds is outside the window
+    assert run(TrajectoryRecognizer(), swipe(0.8, 0.2, frames=120)) == []
+
+
+def test_circling_reports_turns_in_screen_direction():
+    recognizer = TrajectoryRecognizer()
+    # Counter-clockwise in the camera image is clockwise on the mirrored screen
+    positions = [(0.5 + 0.1 * math.cos(a), 0.5 - 0.1 * math.sin(a))
+                 for a in np.linspace(0, 4 * math.pi, 60)]
+    events = [event for _, event in run(recognizer, positions, fps=30.0)]
+    turns = [angle for name, angle in events if name == 'circle']
+    assert turns and all(angle > 0 for angle in turns)
+    assert not any(name.startswith('swipe') for name, _ in events)